@@ -0,0 +1,58 @@
+"""Add StopAndSearch Indexes
+
+Revision ID: 6fd17d42b2f7
+Revises: fb1ef6ecc640
+Create Date: 2026-10-19 06:22:54.191397
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6fd17d42b2f7"
+down_revision: str | Sequence[str] | None = "fb1ef6ecc640"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY does not block writes to the table while the index
+    # builds but cannot be run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "IX_StopAndSearch_ForceId_Datetime",
+            "StopAndSearch",
+            ["ForceId", "Datetime"],
+            unique=False,
+            schema="bronze",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "IX_StopAndSearch_Datetime_Brin",
+            "StopAndSearch",
+            ["Datetime"],
+            unique=False,
+            schema="bronze",
+            postgresql_using="brin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "IX_StopAndSearch_Datetime_Brin",
+            table_name="StopAndSearch",
+            schema="bronze",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "IX_StopAndSearch_ForceId_Datetime",
+            table_name="StopAndSearch",
+            schema="bronze",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,42 @@
+"""Add StopAndSearch Datetime Id Index
+
+Revision ID: 7c580cf9f437
+Revises: 6fd17d42b2f7
+Create Date: 2026-10-19 06:39:10.230619
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c580cf9f437"
+down_revision: str | Sequence[str] | None = "6fd17d42b2f7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Supports keyset pagination on (Datetime, Id) when reading StopAndSearches
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "IX_StopAndSearch_Datetime_Id",
+            "StopAndSearch",
+            ["Datetime", "Id"],
+            unique=False,
+            schema="bronze",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "IX_StopAndSearch_Datetime_Id",
+            table_name="StopAndSearch",
+            schema="bronze",
+            postgresql_concurrently=True,
+        )
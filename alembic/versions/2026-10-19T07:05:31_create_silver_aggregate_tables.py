@@ -0,0 +1,63 @@
+"""Create Silver Aggregate Tables
+
+Revision ID: 5df1d6b423bc
+Revises: 7c580cf9f437
+Create Date: 2026-10-19 07:05:31.418206
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5df1d6b423bc"
+down_revision: str | Sequence[str] | None = "7c580cf9f437"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+DIMENSIONS = {
+    "StopAndSearchCountByOutcome": [
+        sa.Column("OutcomeId", sa.String(), nullable=False),
+        sa.Column("OutcomeName", sa.String(), nullable=False),
+    ],
+    "StopAndSearchCountByEthnicity": [
+        sa.Column("SelfDefinedEthnicity", sa.String(), nullable=True),
+        sa.Column("OfficerDefinedEthnicity", sa.String(), nullable=True),
+    ],
+    "StopAndSearchCountByLegislation": [
+        sa.Column("Legislation", sa.String(), nullable=True),
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SCHEMA silver")
+    for table_name, dimensions in DIMENSIONS.items():
+        op.create_table(
+            table_name,
+            sa.Column("Id", sa.INTEGER(), nullable=False),
+            sa.Column("ForceId", sa.String(length=20), nullable=False),
+            sa.Column("YearMonth", sa.String(length=7), nullable=False),
+            *dimensions,
+            sa.Column("Count", sa.INTEGER(), nullable=False),
+            sa.PrimaryKeyConstraint("Id"),
+            schema="silver",
+        )
+        op.create_index(
+            f"IX_{table_name}_ForceId_YearMonth",
+            table_name,
+            ["ForceId", "YearMonth"],
+            unique=False,
+            schema="silver",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in DIMENSIONS:
+        op.drop_table(table_name, schema="silver")
+    op.execute("DROP SCHEMA silver")
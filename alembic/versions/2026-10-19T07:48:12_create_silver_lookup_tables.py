@@ -0,0 +1,107 @@
+"""Create Silver Lookup Tables
+
+Revision ID: 92f0f0a1e0c2
+Revises: 5df1d6b423bc
+Create Date: 2026-10-19 07:48:12.602954
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "92f0f0a1e0c2"
+down_revision: str | Sequence[str] | None = "5df1d6b423bc"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LOOKUPS = [
+    "SearchType",
+    "Legislation",
+    "ObjectOfSearch",
+    "Gender",
+    "AgeRange",
+    "Ethnicity",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in LOOKUPS:
+        op.create_table(
+            table_name,
+            sa.Column("Id", sa.SMALLINT(), sa.Identity(), nullable=False),
+            sa.Column("Name", sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint("Id"),
+            sa.UniqueConstraint("Name"),
+            schema="silver",
+        )
+    op.create_table(
+        "Outcome",
+        sa.Column("Id", sa.SMALLINT(), sa.Identity(), nullable=False),
+        sa.Column("Code", sa.String(), nullable=False),
+        sa.Column("Name", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("Id"),
+        sa.UniqueConstraint("Code", "Name"),
+        schema="silver",
+    )
+    op.create_table(
+        "StopAndSearch",
+        sa.Column("Id", sa.INTEGER(), nullable=False),
+        sa.Column("ForceId", sa.String(length=20), nullable=False),
+        sa.Column("TypeId", sa.SMALLINT(), nullable=False),
+        sa.Column("InvolvedPerson", sa.BOOLEAN(), nullable=False),
+        sa.Column("Datetime", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("Operation", sa.BOOLEAN(), nullable=True),
+        sa.Column("OperationName", sa.String(), nullable=True),
+        sa.Column("Latitude", sa.DECIMAL(precision=9, scale=6), nullable=True),
+        sa.Column("Longitude", sa.DECIMAL(precision=9, scale=6), nullable=True),
+        sa.Column("StreetId", sa.INTEGER(), nullable=True),
+        sa.Column("StreetName", sa.String(), nullable=True),
+        sa.Column("GenderId", sa.SMALLINT(), nullable=True),
+        sa.Column("AgeRangeId", sa.SMALLINT(), nullable=True),
+        sa.Column("SelfDefinedEthnicityId", sa.SMALLINT(), nullable=True),
+        sa.Column("OfficerDefinedEthnicityId", sa.SMALLINT(), nullable=True),
+        sa.Column("LegislationId", sa.SMALLINT(), nullable=True),
+        sa.Column("ObjectOfSearchId", sa.SMALLINT(), nullable=True),
+        sa.Column("OutcomeId", sa.SMALLINT(), nullable=False),
+        sa.Column("OutcomeLinkedToObjectOfSearch", sa.BOOLEAN(), nullable=True),
+        sa.Column("RemovalOfMoreThanOuterClothing", sa.BOOLEAN(), nullable=True),
+        sa.ForeignKeyConstraint(["ForceId"], ["bronze.Force.Id"]),
+        sa.ForeignKeyConstraint(["TypeId"], ["silver.SearchType.Id"]),
+        sa.ForeignKeyConstraint(["GenderId"], ["silver.Gender.Id"]),
+        sa.ForeignKeyConstraint(["AgeRangeId"], ["silver.AgeRange.Id"]),
+        sa.ForeignKeyConstraint(["SelfDefinedEthnicityId"], ["silver.Ethnicity.Id"]),
+        sa.ForeignKeyConstraint(["OfficerDefinedEthnicityId"], ["silver.Ethnicity.Id"]),
+        sa.ForeignKeyConstraint(["LegislationId"], ["silver.Legislation.Id"]),
+        sa.ForeignKeyConstraint(["ObjectOfSearchId"], ["silver.ObjectOfSearch.Id"]),
+        sa.ForeignKeyConstraint(["OutcomeId"], ["silver.Outcome.Id"]),
+        sa.PrimaryKeyConstraint("Id"),
+        schema="silver",
+    )
+    op.create_index(
+        "IX_SilverStopAndSearch_ForceId_Datetime",
+        "StopAndSearch",
+        ["ForceId", "Datetime"],
+        unique=False,
+        schema="silver",
+    )
+    op.create_index(
+        "IX_SilverStopAndSearch_Datetime_Brin",
+        "StopAndSearch",
+        ["Datetime"],
+        unique=False,
+        schema="silver",
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("StopAndSearch", schema="silver")
+    op.drop_table("Outcome", schema="silver")
+    for table_name in LOOKUPS:
+        op.drop_table(table_name, schema="silver")
@@ -0,0 +1,215 @@
+"""Store Coordinates As Microdegrees
+
+Revision ID: 3b8e6f1d2c47
+Revises: 92f0f0a1e0c2
+Create Date: 2026-10-19 08:31:40.218365
+
+"""
+
+from collections.abc import Iterator, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b8e6f1d2c47"
+down_revision: str | Sequence[str] | None = "92f0f0a1e0c2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEXES = {
+    "bronze": "IX_StopAndSearch_Geohash",
+    "silver": "IX_SilverStopAndSearch_Geohash",
+}
+# The rows are updated in ranges of Ids that are each committed on their own, so no
+# row is locked for longer than its batch takes
+BATCH_IDS = 50_000
+LATITUDE = 'round("Latitude" * 1000000)::integer'
+LONGITUDE = 'round("Longitude" * 1000000)::integer'
+# A frozen copy of the geohash encoder when this revision was written, so a later
+# change to police_api_ingester.geo cannot change what the migration writes
+MICRODEGREES = 1_000_000
+GEOHASH_PRECISION = 7
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PAIRS = [
+    first + second for first in GEOHASH_ALPHABET for second in GEOHASH_ALPHABET
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for schema in INDEXES:
+        op.add_column(
+            "StopAndSearch",
+            sa.Column("LatitudeMicrodegrees", sa.INTEGER(), nullable=True),
+            schema=schema,
+        )
+        op.add_column(
+            "StopAndSearch",
+            sa.Column("LongitudeMicrodegrees", sa.INTEGER(), nullable=True),
+            schema=schema,
+        )
+        op.add_column(
+            "StopAndSearch",
+            sa.Column("Geohash", sa.String(length=7), nullable=True),
+            schema=schema,
+        )
+    # CREATE INDEX CONCURRENTLY does not block writes to the table while the index
+    # builds but cannot be run inside a transaction.
+    with op.get_context().autocommit_block():
+        for schema, index_name in INDEXES.items():
+            for first_id, last_id in get_id_batches(schema):
+                update_coordinates(schema, first_id, last_id)
+            op.create_index(
+                index_name,
+                "StopAndSearch",
+                ["Geohash"],
+                unique=False,
+                schema=schema,
+                postgresql_ops={"Geohash": "varchar_pattern_ops"},
+                postgresql_concurrently=True,
+            )
+    for schema in INDEXES:
+        op.drop_column("StopAndSearch", "Latitude", schema=schema)
+        op.drop_column("StopAndSearch", "Longitude", schema=schema)
+
+
+def get_id_batches(schema: str) -> Iterator[tuple[int, int]]:
+    """Yields the inclusive ranges of Ids the rows of the table are updated in."""
+    first_id, last_id = (
+        op.get_bind()
+        .execute(sa.text(f'SELECT min("Id"), max("Id") FROM {schema}."StopAndSearch"'))
+        .one()
+    )
+    if first_id is None:
+        return
+    for batch_start in range(first_id, last_id + 1, BATCH_IDS):
+        yield batch_start, min(batch_start + BATCH_IDS - 1, last_id)
+
+
+def update_coordinates(schema: str, first_id: int, last_id: int) -> None:
+    """Sets the microdegrees and geohash of the rows in the range of Ids in a single
+    update. The geohash is encoded once per distinct point as the Police API snaps
+    locations to a limited set of streets."""
+    connection = op.get_bind()
+    ids = {"first_id": first_id, "last_id": last_id}
+    points = connection.execute(
+        sa.text(
+            f"SELECT DISTINCT {LATITUDE}, {LONGITUDE} "
+            f'FROM {schema}."StopAndSearch" '
+            'WHERE "Id" BETWEEN :first_id AND :last_id '
+            'AND "Latitude" IS NOT NULL AND "Longitude" IS NOT NULL'
+        ),
+        ids,
+    ).all()
+    if not points:
+        return
+    connection.execute(
+        sa.text(
+            f'UPDATE {schema}."StopAndSearch" '
+            'SET "LatitudeMicrodegrees" = p.latitude, '
+            '"LongitudeMicrodegrees" = p.longitude, "Geohash" = p.geohash '
+            "FROM unnest(:latitudes, :longitudes, :geohashes) "
+            "AS p (latitude, longitude, geohash) "
+            'WHERE "Id" BETWEEN :first_id AND :last_id '
+            f"AND {LATITUDE} = p.latitude AND {LONGITUDE} = p.longitude"
+        ).bindparams(
+            sa.bindparam("latitudes", type_=postgresql.ARRAY(sa.INTEGER())),
+            sa.bindparam("longitudes", type_=postgresql.ARRAY(sa.INTEGER())),
+            sa.bindparam("geohashes", type_=postgresql.ARRAY(sa.String())),
+        ),
+        {
+            **ids,
+            "latitudes": [latitude for latitude, _ in points],
+            "longitudes": [longitude for _, longitude in points],
+            "geohashes": [
+                encode_geohash(latitude, longitude) for latitude, longitude in points
+            ],
+        },
+    )
+
+
+def encode_geohash(
+    latitude: int, longitude: int, precision: int = GEOHASH_PRECISION
+) -> str:
+    """Returns the geohash of a point given in microdegrees, for a precision of up to
+    12 characters. The cell of each axis is found with integer division, which gives
+    the same cells as bisecting the range one bit at a time."""
+    bit_count = precision * 5
+    # Geohashes start with a longitude bit, so longitude has the extra odd bit
+    latitude_bits = bit_count // 2
+    longitude_bits = bit_count - latitude_bits
+    latitude_cell = spread_bits(get_cell(latitude, 90 * MICRODEGREES, latitude_bits))
+    longitude_cell = spread_bits(
+        get_cell(longitude, 180 * MICRODEGREES, longitude_bits)
+    )
+    if longitude_bits > latitude_bits:
+        bits = longitude_cell | latitude_cell << 1
+    else:
+        bits = longitude_cell << 1 | latitude_cell
+    characters = []
+    while bit_count >= 10:
+        bit_count -= 10
+        characters.append(GEOHASH_PAIRS[bits >> bit_count & 1023])
+    if bit_count:
+        characters.append(GEOHASH_ALPHABET[bits & 31])
+    return "".join(characters)
+
+
+def get_cell(coordinate: int, limit: int, bits: int) -> int:
+    """Returns which of the 2 ** bits equal cells between -limit and limit the
+    coordinate is in."""
+    cell = ((coordinate + limit) << bits) // (2 * limit)
+    return min(max(cell, 0), (1 << bits) - 1)
+
+
+def spread_bits(value: int) -> int:
+    """Returns the 32 bit value with a zero bit inserted before each of its bits, so
+    two spread values can be interleaved with a shift and an or."""
+    value = (value | value << 16) & 0x0000FFFF0000FFFF
+    value = (value | value << 8) & 0x00FF00FF00FF00FF
+    value = (value | value << 4) & 0x0F0F0F0F0F0F0F0F
+    value = (value | value << 2) & 0x3333333333333333
+    return (value | value << 1) & 0x5555555555555555
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for schema, index_name in INDEXES.items():
+            op.drop_index(
+                index_name,
+                table_name="StopAndSearch",
+                schema=schema,
+                postgresql_concurrently=True,
+            )
+    for schema in INDEXES:
+        op.add_column(
+            "StopAndSearch",
+            sa.Column("Latitude", sa.DECIMAL(precision=9, scale=6), nullable=True),
+            schema=schema,
+        )
+        op.add_column(
+            "StopAndSearch",
+            sa.Column("Longitude", sa.DECIMAL(precision=9, scale=6), nullable=True),
+            schema=schema,
+        )
+    with op.get_context().autocommit_block():
+        for schema in INDEXES:
+            for first_id, last_id in get_id_batches(schema):
+                op.get_bind().execute(
+                    sa.text(
+                        f'UPDATE {schema}."StopAndSearch" '
+                        'SET "Latitude" = "LatitudeMicrodegrees" / 1000000.0, '
+                        '"Longitude" = "LongitudeMicrodegrees" / 1000000.0 '
+                        'WHERE "Id" BETWEEN :first_id AND :last_id '
+                        'AND "LatitudeMicrodegrees" IS NOT NULL'
+                    ),
+                    {"first_id": first_id, "last_id": last_id},
+                )
+    for schema in INDEXES:
+        op.drop_column("StopAndSearch", "Geohash", schema=schema)
+        op.drop_column("StopAndSearch", "LongitudeMicrodegrees", schema=schema)
+        op.drop_column("StopAndSearch", "LatitudeMicrodegrees", schema=schema)
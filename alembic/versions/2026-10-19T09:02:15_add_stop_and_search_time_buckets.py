@@ -0,0 +1,82 @@
+"""Add Stop And Search Time Buckets
+
+Revision ID: c41a9d7e5b80
+Revises: 3b8e6f1d2c47
+Create Date: 2026-10-19 09:02:15.804126
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41a9d7e5b80"
+down_revision: str | Sequence[str] | None = "3b8e6f1d2c47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+UTC_DATETIME = """"Datetime" AT TIME ZONE 'UTC'"""
+COLUMNS = {
+    "YearMonth": (
+        "VARCHAR(7)",
+        (
+            f"extract(year FROM {UTC_DATETIME})::integer::text || '-' || "
+            f"lpad(extract(month FROM {UTC_DATETIME})::integer::text, 2, '0')"
+        ),
+    ),
+    "IsoWeek": (
+        "VARCHAR(8)",
+        (
+            f"extract(isoyear FROM {UTC_DATETIME})::integer::text || '-W' || "
+            f"lpad(extract(week FROM {UTC_DATETIME})::integer::text, 2, '0')"
+        ),
+    ),
+    "Weekday": ("SMALLINT", f"extract(isodow FROM {UTC_DATETIME})::smallint"),
+    "Hour": ("SMALLINT", f"extract(hour FROM {UTC_DATETIME})::smallint"),
+}
+INDEXES = {
+    "IX_StopAndSearch_YearMonth_Weekday_Hour": ["YearMonth", "Weekday", "Hour"],
+    "IX_StopAndSearch_IsoWeek": ["IsoWeek"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a generated column rewrites the table, so they are added in a single
+    # statement to rewrite it once
+    op.execute(
+        'ALTER TABLE bronze."StopAndSearch" '
+        + ", ".join(
+            f'ADD COLUMN "{column_name}" {column_type} '
+            f"GENERATED ALWAYS AS ({expression}) STORED NOT NULL"
+            for column_name, (column_type, expression) in COLUMNS.items()
+        )
+    )
+    # CREATE INDEX CONCURRENTLY does not block writes to the table while the index
+    # builds but cannot be run inside a transaction, so the columns are committed
+    # first.
+    with op.get_context().autocommit_block():
+        for index_name, columns in INDEXES.items():
+            op.create_index(
+                index_name,
+                "StopAndSearch",
+                columns,
+                unique=False,
+                schema="bronze",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name in INDEXES:
+            op.drop_index(
+                index_name,
+                table_name="StopAndSearch",
+                schema="bronze",
+                postgresql_concurrently=True,
+            )
+    for column_name in COLUMNS:
+        op.drop_column("StopAndSearch", column_name, schema="bronze")
@@ -0,0 +1,56 @@
+"""Create Ops Run Report Table
+
+Revision ID: d8a3f52c9b16
+Revises: c41a9d7e5b80
+Create Date: 2026-10-19 09:40:27.604113
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8a3f52c9b16"
+down_revision: str | Sequence[str] | None = "c41a9d7e5b80"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SCHEMA ops")
+    op.create_table(
+        "RunReport",
+        sa.Column("Id", sa.INTEGER(), nullable=False),
+        sa.Column("Command", sa.String(), nullable=False),
+        sa.Column("Arguments", postgresql.JSONB(), nullable=False),
+        sa.Column("StartedAt", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("EndedAt", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("Error", sa.String(), nullable=True),
+        sa.Column("RequestsByStatus", postgresql.JSONB(), nullable=False),
+        sa.Column("Retries", sa.INTEGER(), nullable=False),
+        sa.Column("LimiterWaitSeconds", postgresql.DOUBLE_PRECISION(), nullable=False),
+        sa.Column("RowsParsed", sa.INTEGER(), nullable=False),
+        sa.Column("RowsRejected", sa.INTEGER(), nullable=False),
+        sa.Column("RowsWritten", postgresql.JSONB(), nullable=False),
+        sa.Column("StageSeconds", postgresql.JSONB(), nullable=False),
+        sa.PrimaryKeyConstraint("Id"),
+        schema="ops",
+    )
+    op.create_index(
+        "IX_RunReport_Command_StartedAt",
+        "RunReport",
+        ["Command", "StartedAt"],
+        unique=False,
+        schema="ops",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("RunReport", schema="ops")
+    op.execute("DROP SCHEMA ops")
@@ -0,0 +1,49 @@
+"""Create Stop And Search Quarantine Table
+
+Revision ID: 4e7b09c2a1f3
+Revises: d8a3f52c9b16
+Create Date: 2026-10-19 10:12:48.215390
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4e7b09c2a1f3"
+down_revision: str | Sequence[str] | None = "d8a3f52c9b16"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "StopAndSearchQuarantine",
+        sa.Column("Id", sa.INTEGER(), nullable=False),
+        sa.Column("ForceId", sa.String(length=20), nullable=False),
+        sa.Column("YearMonth", sa.String(length=7), nullable=False),
+        sa.Column("WithLocation", sa.BOOLEAN(), nullable=False),
+        sa.Column("Payload", postgresql.JSONB(), nullable=False),
+        sa.Column("Errors", postgresql.JSONB(), nullable=False),
+        sa.Column("QuarantinedAt", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["ForceId"], ["bronze.Force.Id"]),
+        sa.PrimaryKeyConstraint("Id"),
+        schema="bronze",
+    )
+    op.create_index(
+        "IX_StopAndSearchQuarantine_ForceId_YearMonth",
+        "StopAndSearchQuarantine",
+        ["ForceId", "YearMonth"],
+        unique=False,
+        schema="bronze",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("StopAndSearchQuarantine", schema="bronze")
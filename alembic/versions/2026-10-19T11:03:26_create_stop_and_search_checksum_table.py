@@ -0,0 +1,38 @@
+"""Create Stop And Search Checksum Table
+
+Revision ID: 9c61d3e7f2a8
+Revises: 4e7b09c2a1f3
+Create Date: 2026-10-19 11:03:26.548103
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c61d3e7f2a8"
+down_revision: str | Sequence[str] | None = "4e7b09c2a1f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "StopAndSearchChecksum",
+        sa.Column("ForceId", sa.String(length=20), nullable=False),
+        sa.Column("YearMonth", sa.String(length=7), nullable=False),
+        sa.Column("Checksum", sa.LargeBinary(), nullable=False),
+        sa.Column("StoredAt", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["ForceId"], ["bronze.Force.Id"]),
+        sa.PrimaryKeyConstraint("ForceId", "YearMonth"),
+        schema="bronze",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("StopAndSearchChecksum", schema="bronze")
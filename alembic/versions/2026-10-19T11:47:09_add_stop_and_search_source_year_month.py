@@ -0,0 +1,108 @@
+"""Add Stop And Search Source Year Month
+
+Revision ID: 5a2c8e1f7b93
+Revises: 9c61d3e7f2a8
+Create Date: 2026-10-19 11:47:09.362815
+
+"""
+
+from collections.abc import Iterator, Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a2c8e1f7b93"
+down_revision: str | Sequence[str] | None = "9c61d3e7f2a8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The month the existing rows were requested for is not known, so they are given
+# the UTC month of their Datetime, which it is for all but the rows at the edges of
+# a month
+SOURCE_YEAR_MONTHS = {
+    "bronze": '"YearMonth"',
+    "silver": """to_char("Datetime" AT TIME ZONE 'UTC', 'YYYY-MM')""",
+}
+INDEXES = {
+    "bronze": "IX_StopAndSearch_ForceId_SourceYearMonth",
+    "silver": "IX_SilverStopAndSearch_ForceId_SourceYearMonth",
+}
+# The rows are updated in ranges of Ids that are each committed on their own, so no
+# row is locked for longer than its batch takes
+BATCH_IDS = 50_000
+CONSTRAINT = "CK_StopAndSearch_SourceYearMonth_NotNull"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for schema in INDEXES:
+        op.add_column(
+            "StopAndSearch",
+            sa.Column("SourceYearMonth", sa.String(length=7), nullable=True),
+            schema=schema,
+        )
+    # CREATE INDEX CONCURRENTLY does not block writes to the table while the index
+    # builds but cannot be run inside a transaction.
+    with op.get_context().autocommit_block():
+        for schema, index_name in INDEXES.items():
+            for first_id, last_id in get_id_batches(schema):
+                op.get_bind().execute(
+                    sa.text(
+                        f'UPDATE {schema}."StopAndSearch" '
+                        f'SET "SourceYearMonth" = {SOURCE_YEAR_MONTHS[schema]} '
+                        'WHERE "Id" BETWEEN :first_id AND :last_id'
+                    ),
+                    {"first_id": first_id, "last_id": last_id},
+                )
+            # SET NOT NULL skips its scan of the table when a validated check
+            # constraint already proves it, and validating the constraint does not
+            # block writes
+            op.execute(
+                f'ALTER TABLE {schema}."StopAndSearch" ADD CONSTRAINT "{CONSTRAINT}" '
+                'CHECK ("SourceYearMonth" IS NOT NULL) NOT VALID'
+            )
+            op.execute(
+                f'ALTER TABLE {schema}."StopAndSearch" '
+                f'VALIDATE CONSTRAINT "{CONSTRAINT}"'
+            )
+            op.alter_column(
+                "StopAndSearch", "SourceYearMonth", nullable=False, schema=schema
+            )
+            op.drop_constraint(CONSTRAINT, "StopAndSearch", schema=schema)
+            op.create_index(
+                index_name,
+                "StopAndSearch",
+                ["ForceId", "SourceYearMonth"],
+                unique=False,
+                schema=schema,
+                postgresql_concurrently=True,
+            )
+
+
+def get_id_batches(schema: str) -> Iterator[tuple[int, int]]:
+    """Yields the inclusive ranges of Ids the rows of the table are updated in."""
+    first_id, last_id = (
+        op.get_bind()
+        .execute(sa.text(f'SELECT min("Id"), max("Id") FROM {schema}."StopAndSearch"'))
+        .one()
+    )
+    if first_id is None:
+        return
+    for batch_start in range(first_id, last_id + 1, BATCH_IDS):
+        yield batch_start, min(batch_start + BATCH_IDS - 1, last_id)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for schema, index_name in INDEXES.items():
+            op.drop_index(
+                index_name,
+                table_name="StopAndSearch",
+                schema=schema,
+                postgresql_concurrently=True,
+            )
+    for schema in INDEXES:
+        op.drop_column("StopAndSearch", "SourceYearMonth", schema=schema)
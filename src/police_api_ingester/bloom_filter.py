@@ -0,0 +1,102 @@
+import mmap
+from math import ceil, log
+from pathlib import Path
+from struct import Struct
+
+DEFAULT_FALSE_POSITIVE_RATE = 1e-6
+MAGIC = b"PASBLM01"
+# The magic, the number of bits and hashes, the number of rows the filter was sized
+# for and the number of rows added
+HEADER = Struct("<8sQQQQ")
+POSITION_HASHES = Struct("<QQ")
+
+
+class BloomFilter:
+    """A Bloom filter of content hashes stored in a memory mapped file, so it
+    persists between runs and only the pages that are touched are read into memory.
+
+    A hash that was added is always found, a hash that was not added is found with
+    the false positive rate the filter was sized for, which rises once it holds
+    more rows than it was sized for. The first 16 bytes of each hash are used to
+    place its bits, so the hashes should be uniformly distributed."""
+
+    def __init__(
+        self,
+        path: Path,
+        expected_rows: int,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ):
+        self.path = path
+        if not path.exists():
+            bit_count, hash_count = get_size(expected_rows, false_positive_rate)
+            with path.open("wb") as file:
+                file.write(HEADER.pack(MAGIC, bit_count, hash_count, expected_rows, 0))
+                # Extending the file leaves a sparse run of zero bytes
+                file.truncate(HEADER.size + bit_count // 8)
+        self.file = path.open("r+b")
+        header = self.file.read(HEADER.size)
+        if len(header) < HEADER.size or not header.startswith(MAGIC):
+            self.file.close()
+            raise ValueError(f"'{path}' is not a Bloom filter.")
+        _, self.bit_count, self.hash_count, self.capacity, self.row_count = (
+            HEADER.unpack(header)
+        )
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+
+    def __contains__(self, content_hash: bytes) -> bool:
+        # The positions are computed one at a time, as most new rows are ruled out
+        # by their first few bits
+        bits, bit_count = self.mmap, self.bit_count
+        first, second = get_hashes(content_hash)
+        for index in range(self.hash_count):
+            position = (first + index * second) % bit_count
+            if not bits[HEADER.size + (position >> 3)] & 1 << (position & 7):
+                return False
+        return True
+
+    def add(self, content_hash: bytes) -> None:
+        bits, bit_count = self.mmap, self.bit_count
+        first, second = get_hashes(content_hash)
+        for index in range(self.hash_count):
+            position = (first + index * second) % bit_count
+            bits[HEADER.size + (position >> 3)] |= 1 << (position & 7)
+        self.row_count += 1
+
+    @property
+    def is_full(self) -> bool:
+        return self.row_count > self.capacity
+
+    def flush(self) -> None:
+        HEADER.pack_into(
+            self.mmap,
+            0,
+            MAGIC,
+            self.bit_count,
+            self.hash_count,
+            self.capacity,
+            self.row_count,
+        )
+        self.mmap.flush()
+
+    def close(self) -> None:
+        if not self.mmap.closed:
+            self.flush()
+            self.mmap.close()
+        self.file.close()
+
+
+def get_size(expected_rows: int, false_positive_rate: float) -> tuple[int, int]:
+    """Returns the number of bits, rounded up to whole bytes, and hashes that give
+    the false positive rate once the expected rows are added."""
+    bit_count = ceil(-expected_rows * log(false_positive_rate) / log(2) ** 2)
+    bit_count = max(8, ceil(bit_count / 8) * 8)
+    hash_count = max(1, round(bit_count / max(expected_rows, 1) * log(2)))
+    return bit_count, hash_count
+
+
+def get_hashes(content_hash: bytes) -> tuple[int, int]:
+    """Returns the two hashes the bits are placed with using double hashing, which
+    is as accurate as using independent hash functions. The second is made odd so it
+    is never zero, which would put every bit in the same place."""
+    first, second = POSITION_HASHES.unpack_from(content_hash)
+    return first, second | 1
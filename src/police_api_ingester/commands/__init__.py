@@ -1,2 +1,4 @@
+from police_api_ingester.commands.export import export as export_commands
+from police_api_ingester.commands.fake_api import fake_api as fake_api_commands
 from police_api_ingester.commands.ingest import ingest as ingest_commands
 from police_api_ingester.commands.schedule import schedule as schedule_commands
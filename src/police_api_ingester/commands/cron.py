@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+# A dataclass rather than a pydantic model so the CLI can be built without
+# importing pydantic, see the import time benchmark.
+@dataclass(frozen=True)
+class Cron:
+    minute: str | None = None
+    hour: str | None = None
+    day_of_month: str | None = None
+    month: str | None = None
+    day_of_week: str | None = None
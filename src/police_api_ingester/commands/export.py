@@ -0,0 +1,42 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated
+
+from typer import Typer, echo
+
+from police_api_ingester.commands.options import (
+    DATABASE_URL,
+    EXPORT_OUTPUT_FILE,
+    FORCE_IDS,
+    FROM_DATE,
+    TO_DATE,
+)
+
+export = Typer()
+
+
+@export.command(
+    "stop-and-searches",
+    help="Exports the stop and searches from the bronze database to a CSV file, streamed with COPY TO STDOUT. The file is compressed when it ends in '.gz', '.bz2' or '.xz'.",
+)
+def export_stop_and_searches(
+    database_url: Annotated[str, DATABASE_URL],
+    from_datetime: Annotated[datetime, FROM_DATE],
+    to_datetime: Annotated[datetime, TO_DATE],
+    output_file: Annotated[Path, EXPORT_OUTPUT_FILE],
+    force_ids: str | None = FORCE_IDS,
+) -> None:
+    from sqlalchemy import create_engine
+
+    from police_api_ingester import exports
+
+    force_ids_list = force_ids.split(",") if force_ids else None
+    rows = exports.export_stop_and_searches(
+        create_engine(database_url),
+        output_file,
+        from_datetime,
+        to_datetime,
+        force_ids_list,
+    )
+    # Written to stderr so exports to stdout are not mixed with the summary
+    echo(f"Exported '{rows}' stop and searches to '{output_file}'.", err=True)
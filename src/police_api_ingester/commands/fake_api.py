@@ -0,0 +1,95 @@
+from pathlib import Path
+from typing import Annotated
+
+from typer import Typer, echo
+
+from police_api_ingester.commands.options import (
+    FAKE_API_BURST,
+    FAKE_API_FORCE_COUNT,
+    FAKE_API_HOST,
+    FAKE_API_LAST_MONTH,
+    FAKE_API_LATENCY_MEDIAN_SECONDS,
+    FAKE_API_LATENCY_SIGMA,
+    FAKE_API_MAX_REQUESTS_PER_SECOND,
+    FAKE_API_MONTH_COUNT,
+    FAKE_API_OUTPUT_DIRECTORY,
+    FAKE_API_PORT,
+    FAKE_API_RECORDS_PER_MONTH,
+    FAKE_API_RESPONSE_CACHE_SIZE,
+    FAKE_API_RETRY_AFTER_SECONDS,
+    FAKE_API_SEED,
+    FAKE_API_TIMEOUT_PROBABILITY,
+    FAKE_API_TIMEOUT_SECONDS,
+    LOG_LEVEL,
+    LOGGING_CONF_FILE_PATH,
+)
+
+fake_api = Typer()
+
+
+@fake_api.command(
+    "generate",
+    help="Generates synthetic Police API payloads for load testing, written in the same layout as the Police API routes.",
+)
+def generate_synthetic_data(
+    output_directory: Annotated[Path, FAKE_API_OUTPUT_DIRECTORY],
+    force_count: int = FAKE_API_FORCE_COUNT,
+    month_count: int = FAKE_API_MONTH_COUNT,
+    records_per_month: int = FAKE_API_RECORDS_PER_MONTH,
+    seed: int = FAKE_API_SEED,
+    last_month: str = FAKE_API_LAST_MONTH,
+) -> None:
+    from police_api_ingester.fake_api.generator import SyntheticDataGenerator
+
+    generator = SyntheticDataGenerator(
+        force_count, month_count, records_per_month, seed, last_month
+    )
+    records = generator.write(output_directory)
+    echo(f"Generated '{records}' stop and searches in '{output_directory}'.")
+
+
+@fake_api.command(
+    "serve",
+    help="Serves synthetic data on the Police API routes used by the ingester, with injected latency, 429 responses and timeouts.",
+)
+def serve_fake_api(
+    host: str = FAKE_API_HOST,
+    port: int = FAKE_API_PORT,
+    force_count: int = FAKE_API_FORCE_COUNT,
+    month_count: int = FAKE_API_MONTH_COUNT,
+    records_per_month: int = FAKE_API_RECORDS_PER_MONTH,
+    seed: int = FAKE_API_SEED,
+    last_month: str = FAKE_API_LAST_MONTH,
+    latency_median_seconds: float = FAKE_API_LATENCY_MEDIAN_SECONDS,
+    latency_sigma: float = FAKE_API_LATENCY_SIGMA,
+    max_requests_per_second: float = FAKE_API_MAX_REQUESTS_PER_SECOND,
+    burst: int = FAKE_API_BURST,
+    retry_after_seconds: int = FAKE_API_RETRY_AFTER_SECONDS,
+    timeout_probability: float = FAKE_API_TIMEOUT_PROBABILITY,
+    timeout_seconds: float = FAKE_API_TIMEOUT_SECONDS,
+    response_cache_size: int = FAKE_API_RESPONSE_CACHE_SIZE,
+    log_level: int = LOG_LEVEL,
+    logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
+) -> None:
+    from police_api_ingester.factories import get_logger
+    from police_api_ingester.fake_api.generator import SyntheticDataGenerator
+    from police_api_ingester.fake_api.server import FakeApiConfig, FakePoliceApi
+
+    logger = get_logger(logging_conf_file_path, log_level)
+    generator = SyntheticDataGenerator(
+        force_count, month_count, records_per_month, seed, last_month
+    )
+    config = FakeApiConfig(
+        latency_median_seconds=latency_median_seconds,
+        latency_sigma=latency_sigma,
+        max_requests_per_second=max_requests_per_second,
+        burst=burst,
+        retry_after_seconds=retry_after_seconds,
+        timeout_probability=timeout_probability,
+        timeout_seconds=timeout_seconds,
+        seed=seed,
+        response_cache_size=response_cache_size,
+    )
+    server = FakePoliceApi((host, port), generator, config, logger)
+    logger.info(f"Serving the fake Police API on 'http://{host}:{port}/api/'.")
+    server.serve_forever()
@@ -1,32 +1,34 @@
 from asyncio import run
 from datetime import datetime
+from pathlib import Path
 from typing import Annotated
 
 from typer import Typer
 
 from police_api_ingester.commands.options import (
+    BLOOM_FILTER_EXPECTED_ROWS,
+    BLOOM_FILTER_FILE,
+    BLOOM_FILTER_PATH,
     DATABASE_URL,
     FORCE_IDS,
     FROM_DATE,
     INGEST_AVAILABLE_DATES,
+    INGEST_SILVER,
     LOG_LEVEL,
     LOGGING_CONF_FILE_PATH,
+    PARQUET_DIRECTORY,
     POLICE_CLIENT_BASE_URL,
     POLICE_CLIENT_MAX_REQUEST_RETRIES,
     POLICE_CLIENT_MAX_REQUESTS_PER_SECONDS,
     POLICE_CLIENT_TIMEOUT,
+    REPLACE_MONTHS,
+    SKIP_UNCHANGED_MONTHS,
     TO_DATE,
 )
-from police_api_ingester.factories import (
-    create_repository,
-)
-from police_api_ingester.repositories.available_date_repository import (
-    AvailableDateRepository,
-)
-from police_api_ingester.repositories.force_repository import ForceRepository
-from police_api_ingester.repositories.stop_and_search_repository import (
-    StopAndSearchRepository,
-)
+from police_api_ingester.commands.report import report_run
+
+# The factories and repositories import sqlmodel, SQLAlchemy, pydantic, httpx and
+# aiolimiter, they are imported inside the commands to keep the CLI startup fast.
 
 ingest = Typer()
 
@@ -35,6 +37,7 @@ ingest = Typer()
     "forces",
     help="Ingests the Police Forces into the bronze database using the Police API",
 )
+@report_run("ingest forces")
 def ingest_forces(
     database_url: Annotated[str, DATABASE_URL],
     force_ids: str | None = FORCE_IDS,
@@ -45,6 +48,9 @@ def ingest_forces(
     log_level: int = LOG_LEVEL,
     logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
 ) -> None:
+    from police_api_ingester.factories import create_repository
+    from police_api_ingester.repositories.force_repository import ForceRepository
+
     force_repository = create_repository(
         ForceRepository,
         log_level,
@@ -63,6 +69,7 @@ def ingest_forces(
     "available-dates",
     help="Ingests the dates that have available stop and searches into the bronze database using the Police API. This will ingest the forces first.",
 )
+@report_run("ingest available-dates")
 def ingest_available_dates(
     database_url: Annotated[str, DATABASE_URL],
     from_datetime: Annotated[datetime, FROM_DATE],
@@ -75,6 +82,11 @@ def ingest_available_dates(
     log_level: int = LOG_LEVEL,
     logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
 ) -> None:
+    from police_api_ingester.factories import create_repository
+    from police_api_ingester.repositories.available_date_repository import (
+        AvailableDateRepository,
+    )
+
     available_date_repository = create_repository(
         AvailableDateRepository,
         log_level,
@@ -97,6 +109,7 @@ def ingest_available_dates(
     "stop-and-searches",
     help="Ingests the stop and searches into the bronze database using the Police API. By default this will ingest the available dates and forces into the database.",
 )
+@report_run("ingest stop-and-searches")
 def ingest_stop_and_searches(
     database_url: Annotated[str, DATABASE_URL],
     from_datetime: Annotated[datetime, FROM_DATE],
@@ -107,9 +120,20 @@ def ingest_stop_and_searches(
     police_client_max_request_retries: int = POLICE_CLIENT_MAX_REQUEST_RETRIES,
     police_client_timeout: int = POLICE_CLIENT_TIMEOUT,
     ingest_available_dates: bool = INGEST_AVAILABLE_DATES,
+    parquet_directory: Path | None = PARQUET_DIRECTORY,
+    ingest_silver: bool = INGEST_SILVER,
+    bloom_filter_path: Path | None = BLOOM_FILTER_PATH,
+    bloom_filter_expected_rows: int = BLOOM_FILTER_EXPECTED_ROWS,
+    skip_unchanged_months: bool = SKIP_UNCHANGED_MONTHS,
+    replace_months: bool = REPLACE_MONTHS,
     log_level: int = LOG_LEVEL,
     logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
 ) -> None:
+    from police_api_ingester.factories import create_repository, get_sinks
+    from police_api_ingester.repositories.stop_and_search_repository import (
+        StopAndSearchRepository,
+    )
+
     stop_and_search_repository = create_repository(
         StopAndSearchRepository,
         log_level,
@@ -120,12 +144,164 @@ def ingest_stop_and_searches(
         police_client_max_request_retries,
         police_client_timeout,
     )
+    stop_and_search_repository.sinks = get_sinks(
+        stop_and_search_repository.engine,
+        stop_and_search_repository.logger,
+        ingest_silver,
+        parquet_directory,
+    )
+    if bloom_filter_path is not None:
+        from police_api_ingester.bloom_filter import BloomFilter
+
+        stop_and_search_repository.bloom_filter = BloomFilter(
+            bloom_filter_path, bloom_filter_expected_rows
+        )
+    if skip_unchanged_months:
+        from police_api_ingester.repositories.stop_and_search_checksum_repository import (
+            StopAndSearchChecksumRepository,
+        )
+
+        stop_and_search_repository.checksum_repository = (
+            StopAndSearchChecksumRepository(
+                stop_and_search_repository.engine,
+                stop_and_search_repository.police_client,
+                stop_and_search_repository.logger,
+            )
+        )
+    stop_and_search_repository.replace_months = replace_months
     force_ids_list = force_ids.split(",") if force_ids is not None else None
-    run(
-        stop_and_search_repository.store_stop_and_searches(
-            from_datetime,
-            to_datetime,
-            store_available_dates=ingest_available_dates,
-            force_ids=force_ids_list,
+    try:
+        run(
+            stop_and_search_repository.store_stop_and_searches(
+                from_datetime,
+                to_datetime,
+                store_available_dates=ingest_available_dates,
+                force_ids=force_ids_list,
+            )
         )
+    finally:
+        if stop_and_search_repository.bloom_filter is not None:
+            stop_and_search_repository.bloom_filter.close()
+
+
+@ingest.command(
+    "aggregates",
+    help="Refreshes the silver aggregates of the stop and searches already in the bronze database, for every force and month with available stop and searches. Ingesting stop and searches refreshes the months it ingests, so this is only needed to backfill.",
+)
+@report_run("ingest aggregates")
+def ingest_aggregates(
+    database_url: Annotated[str, DATABASE_URL],
+    from_datetime: Annotated[datetime, FROM_DATE],
+    to_datetime: Annotated[datetime, TO_DATE],
+    log_level: int = LOG_LEVEL,
+    logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
+) -> None:
+    from police_api_ingester.factories import create_repository
+    from police_api_ingester.repositories.aggregate_repository import (
+        AggregateRepository,
     )
+
+    # The aggregates are built from the bronze database so the Police API options
+    # are left at their defaults.
+    aggregate_repository = create_repository(
+        AggregateRepository,
+        log_level,
+        logging_conf_file_path,
+        database_url,
+        POLICE_CLIENT_BASE_URL.default,
+        POLICE_CLIENT_MAX_REQUESTS_PER_SECONDS.default,
+        POLICE_CLIENT_MAX_REQUEST_RETRIES.default,
+        POLICE_CLIENT_TIMEOUT.default,
+    )
+    run(aggregate_repository.refresh_aggregates_between(from_datetime, to_datetime))
+
+
+@ingest.command(
+    "bloom-filter",
+    help="Rebuilds the Bloom filter of the stop and searches already ingested from the bronze database, sized for the expected number of rows.",
+)
+@report_run("ingest bloom-filter")
+def ingest_bloom_filter(
+    database_url: Annotated[str, DATABASE_URL],
+    bloom_filter_path: Annotated[Path, BLOOM_FILTER_FILE],
+    bloom_filter_expected_rows: int = BLOOM_FILTER_EXPECTED_ROWS,
+    log_level: int = LOG_LEVEL,
+    logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
+) -> None:
+    from police_api_ingester.factories import create_repository
+    from police_api_ingester.repositories.stop_and_search_repository import (
+        StopAndSearchRepository,
+    )
+
+    # The Bloom filter is built from the bronze database so the Police API options
+    # are left at their defaults.
+    stop_and_search_repository = create_repository(
+        StopAndSearchRepository,
+        log_level,
+        logging_conf_file_path,
+        database_url,
+        POLICE_CLIENT_BASE_URL.default,
+        POLICE_CLIENT_MAX_REQUESTS_PER_SECONDS.default,
+        POLICE_CLIENT_MAX_REQUEST_RETRIES.default,
+        POLICE_CLIENT_TIMEOUT.default,
+    )
+    try:
+        run(
+            stop_and_search_repository.rebuild_bloom_filter(
+                bloom_filter_path, bloom_filter_expected_rows
+            )
+        )
+    finally:
+        if stop_and_search_repository.bloom_filter is not None:
+            stop_and_search_repository.bloom_filter.close()
+
+
+@ingest.command(
+    "reprocess-quarantine",
+    help="Validates the stop and searches in the bronze quarantine again, after a fix to the model, and stores the ones that are now valid without fetching their months from the Police API again. The ones still rejected stay in the quarantine.",
+)
+@report_run("ingest reprocess-quarantine")
+def ingest_reprocess_quarantine(
+    database_url: Annotated[str, DATABASE_URL],
+    force_ids: str | None = FORCE_IDS,
+    ingest_silver: bool = INGEST_SILVER,
+    bloom_filter_path: Path | None = BLOOM_FILTER_PATH,
+    bloom_filter_expected_rows: int = BLOOM_FILTER_EXPECTED_ROWS,
+    log_level: int = LOG_LEVEL,
+    logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
+) -> None:
+    from police_api_ingester.factories import create_repository, get_sinks
+    from police_api_ingester.repositories.stop_and_search_repository import (
+        StopAndSearchRepository,
+    )
+
+    # The quarantine is reprocessed from the bronze database so the Police API
+    # options are left at their defaults. The Parquet sink is not offered, as it
+    # would replace each month's file with only the reprocessed stop and searches.
+    stop_and_search_repository = create_repository(
+        StopAndSearchRepository,
+        log_level,
+        logging_conf_file_path,
+        database_url,
+        POLICE_CLIENT_BASE_URL.default,
+        POLICE_CLIENT_MAX_REQUESTS_PER_SECONDS.default,
+        POLICE_CLIENT_MAX_REQUEST_RETRIES.default,
+        POLICE_CLIENT_TIMEOUT.default,
+    )
+    stop_and_search_repository.sinks = get_sinks(
+        stop_and_search_repository.engine,
+        stop_and_search_repository.logger,
+        ingest_silver,
+    )
+    if bloom_filter_path is not None:
+        from police_api_ingester.bloom_filter import BloomFilter
+
+        stop_and_search_repository.bloom_filter = BloomFilter(
+            bloom_filter_path, bloom_filter_expected_rows
+        )
+    force_ids_list = force_ids.split(",") if force_ids is not None else None
+    try:
+        run(stop_and_search_repository.reprocess_quarantine(force_ids_list))
+    finally:
+        if stop_and_search_repository.bloom_filter is not None:
+            stop_and_search_repository.bloom_filter.close()
@@ -1,15 +1,16 @@
 from datetime import datetime
+from pathlib import Path
 
 from typer import Option
 
+from police_api_ingester.commands.cron import Cron
 from police_api_ingester.commands.parsers import (
     CRON_EXAMPLE,
     default_timezone_to_utc,
     parse_cron,
     parse_log_level,
 )
-from police_api_ingester.models.cron import Cron
-from police_api_ingester.police_client import BASE_URL
+from police_api_ingester.constants import BASE_URL
 
 FROM_DATE: datetime = Option(
     ...,
@@ -79,3 +80,156 @@ FORCE_IDS: str | None = Option(
     help="A comma seperated list of force id's that will filter that forces will be ingested. The ids for a force can be seen here: https://data.police.uk/api/forces",
     envvar="FORCE_IDS",
 )
+PARQUET_DIRECTORY: Path | None = Option(
+    None,
+    "--parquet-directory",
+    help="When set, the stop and searches are also written to Parquet files in this directory, partitioned by force and month. Needs the 'parquet' extra installed.",
+    envvar="PARQUET_DIRECTORY",
+    file_okay=False,
+)
+INGEST_SILVER: bool = Option(
+    False,
+    help="Also write the stop and searches to silver.StopAndSearch, with the repeated strings stored as keys of the silver lookup tables, in the same transaction as bronze. Off by default as it adds a second copy of every row.",
+    envvar="INGEST_SILVER",
+)
+BLOOM_FILTER_PATH: Path | None = Option(
+    None,
+    "--bloom-filter-path",
+    help="When set, the stop and searches already ingested are skipped using a Bloom filter of their content hashes stored in this file, which is created when it does not exist. Rebuild it with 'ingest bloom-filter' after rows are written or deleted by anything else.",
+    envvar="BLOOM_FILTER_PATH",
+    dir_okay=False,
+)
+BLOOM_FILTER_FILE: Path = Option(
+    ...,
+    "--bloom-filter-path",
+    help="The Bloom filter file to rebuild, it is only replaced once the rebuild succeeds.",
+    envvar="BLOOM_FILTER_PATH",
+    dir_okay=False,
+)
+BLOOM_FILTER_EXPECTED_ROWS: int = Option(
+    10_000_000,
+    help="The number of stop and searches the Bloom filter is sized for when it is created or rebuilt. It takes about 3.6 bytes a row, and more than this many rows raises its false positive rate above one in a million.",
+    envvar="BLOOM_FILTER_EXPECTED_ROWS",
+    min=1,
+)
+SKIP_UNCHANGED_MONTHS: bool = Option(
+    False,
+    help="Skip parsing and writing a force and month when a checksum of its Police API responses matches the one stored in bronze.StopAndSearchChecksum the last time it was written in full. A skipped month is not written to any sink, so turn this off to backfill a new sink.",
+    envvar="SKIP_UNCHANGED_MONTHS",
+)
+REPLACE_MONTHS: bool = Option(
+    False,
+    help="Replace the stop and searches stored for each force and month in the same transaction they are written in, so corrections made to the Police API apply exactly, instead of adding them to the ones already stored. Only the part of a month between the from and to datetimes is replaced, and the WAL and lock time of each month is logged.",
+    envvar="REPLACE_MONTHS",
+)
+EXPORT_OUTPUT_FILE: Path = Option(
+    ...,
+    "--output-file",
+    help="The file to export to, compressed when it ends in '.gz', '.bz2' or '.xz'. Use '-' to write to stdout.",
+    dir_okay=False,
+)
+PROFILE: bool = Option(
+    False,
+    "--profile",
+    help="Profiles the command with cProfile, or each run of a schedule, and writes a .pstats file named by the command and start time to the profile directory.",
+    envvar="PROFILE",
+)
+PROFILE_MEMORY: bool = Option(
+    False,
+    "--profile-memory",
+    help="When profiling, also traces memory allocations with tracemalloc and writes the peak and top allocations next to the .pstats file. Tracing slows the command down.",
+    envvar="PROFILE_MEMORY",
+)
+PROFILE_DIRECTORY: Path = Option(
+    Path("profiles"),
+    "--profile-directory",
+    help="The directory the profiles are written to.",
+    envvar="PROFILE_DIRECTORY",
+    file_okay=False,
+)
+TRACE_FILE: Path | None = Option(
+    None,
+    "--trace-file",
+    help="When set, traces the command, or each run of a schedule, and appends a JSON line for every span to this file, nested from each force and month down to the requests, validation and commits.",
+    envvar="TRACE_FILE",
+    dir_okay=False,
+)
+METRICS_PORT: int | None = Option(
+    None,
+    "--metrics-port",
+    help="When set, exposes Prometheus metrics over HTTP on this port while the schedule is running.",
+    envvar="METRICS_PORT",
+)
+FAKE_API_OUTPUT_DIRECTORY: Path = Option(
+    ...,
+    "--output-directory",
+    help="The directory the synthetic Police API payloads are written to.",
+    file_okay=False,
+)
+FAKE_API_FORCE_COUNT: int = Option(
+    43,
+    "--forces",
+    help="The number of forces to generate, forces past the 43 real forces are given synthetic ids.",
+)
+FAKE_API_MONTH_COUNT: int = Option(
+    12, "--months", help="The number of months to generate."
+)
+FAKE_API_RECORDS_PER_MONTH: int = Option(
+    1000,
+    "--records-per-month",
+    help="The number of stop and searches to generate for each force and month.",
+)
+FAKE_API_SEED: int = Option(
+    0, "--seed", help="The seed, the same seed always generates the same data."
+)
+FAKE_API_LAST_MONTH: str = Option(
+    "2024-12",
+    "--last-month",
+    help="The last month in the format 'YYYY-MM' that data is generated for.",
+)
+FAKE_API_HOST: str = Option(
+    "127.0.0.1", "--host", help="The host the fake Police API listens on."
+)
+FAKE_API_PORT: int = Option(
+    8000, "--port", help="The port the fake Police API listens on."
+)
+FAKE_API_LATENCY_MEDIAN_SECONDS: float = Option(
+    0.05,
+    "--latency-median-seconds",
+    help="The median latency of a response, latencies follow a log-normal distribution.",
+)
+FAKE_API_LATENCY_SIGMA: float = Option(
+    0.5,
+    "--latency-sigma",
+    help="The sigma of the log-normal latency distribution, 0 gives a constant latency.",
+)
+FAKE_API_MAX_REQUESTS_PER_SECOND: float = Option(
+    15,
+    "--max-requests-per-second",
+    help="The rate requests are allowed at before a 429 is returned.",
+)
+FAKE_API_BURST: int = Option(
+    30,
+    "--burst",
+    help="The number of requests allowed in a burst before a 429 is returned.",
+)
+FAKE_API_RETRY_AFTER_SECONDS: int = Option(
+    1,
+    "--retry-after-seconds",
+    help="The value of the Retry-After header returned with a 429.",
+)
+FAKE_API_TIMEOUT_PROBABILITY: float = Option(
+    0.0,
+    "--timeout-probability",
+    help="The probability a request stalls long enough for the client to time out.",
+)
+FAKE_API_TIMEOUT_SECONDS: float = Option(
+    30,
+    "--timeout-seconds",
+    help="How long a stalled request waits before responding, this should exceed the client timeout.",
+)
+FAKE_API_RESPONSE_CACHE_SIZE: int = Option(
+    0,
+    "--response-cache-size",
+    help="The number of stop and search responses kept in memory, each holds a force and month of JSON. Off by default.",
+)
@@ -4,10 +4,9 @@ from logging import (
     getLogger,
 )
 
-from croniter import croniter
 from typer import BadParameter
 
-from police_api_ingester.models.cron import Cron
+from police_api_ingester.commands.cron import Cron
 
 CRON_EXAMPLE = (
     "For example: '*/5 0 1,15 * 1-5'. "
@@ -21,6 +20,8 @@ logger = getLogger()
 
 
 def parse_cron(cron_str: str) -> Cron:
+    from croniter import croniter
+
     if croniter.is_valid(cron_str):
         minute, hour, day, day_of_month, day_of_week = cron_str.split()
         return Cron(
@@ -0,0 +1,84 @@
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import wraps
+from inspect import signature
+from typing import Any, TypeVar
+
+from police_api_ingester.commands.options import (
+    POLICE_CLIENT_BASE_URL,
+    POLICE_CLIENT_MAX_REQUEST_RETRIES,
+    POLICE_CLIENT_MAX_REQUESTS_PER_SECONDS,
+    POLICE_CLIENT_TIMEOUT,
+)
+from police_api_ingester.run_stats import RUN_STATS, RunStats
+
+# The database url holds the password, so it is left out of the stored arguments.
+SECRET_ARGUMENTS = {"database_url"}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def report_run(command: str) -> Callable[[F], F]:
+    """Stores a RunReport in the database at the end of every run of the command,
+    including the runs fired by a schedule. The command must take the database url
+    and the logging options."""
+
+    def decorator(func: F) -> F:
+        parameters = signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            arguments = parameters.bind(*args, **kwargs).arguments
+            run_stats = RunStats(
+                command,
+                {
+                    name: to_json_value(value)
+                    for name, value in arguments.items()
+                    if name not in SECRET_ARGUMENTS
+                },
+            )
+            token = RUN_STATS.set(run_stats)
+            try:
+                return func(*args, **kwargs)
+            except Exception as error:
+                run_stats.error = f"{type(error).__name__}: {error}"
+                raise
+            finally:
+                RUN_STATS.reset(token)
+                run_stats.ended_at = datetime.now(UTC)
+                store_run_report(run_stats, arguments)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def store_run_report(run_stats: RunStats, arguments: dict[str, Any]) -> None:
+    from asyncio import run
+
+    from police_api_ingester.factories import create_repository
+    from police_api_ingester.repositories.run_report_repository import (
+        RunReportRepository,
+    )
+
+    # The report is only written to the database so the Police API options are left
+    # at their defaults.
+    run_report_repository = create_repository(
+        RunReportRepository,
+        arguments["log_level"],
+        arguments["logging_conf_file_path"],
+        arguments["database_url"],
+        POLICE_CLIENT_BASE_URL.default,
+        POLICE_CLIENT_MAX_REQUESTS_PER_SECONDS.default,
+        POLICE_CLIENT_MAX_REQUEST_RETRIES.default,
+        POLICE_CLIENT_TIMEOUT.default,
+    )
+    run(run_report_repository.store_run_report(run_stats))
+
+
+def to_json_value(value: Any) -> Any:
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
@@ -1,37 +1,53 @@
 from datetime import datetime
+from functools import wraps
+from pathlib import Path
 from typing import Annotated, Callable
 
-from apscheduler.schedulers.blocking import BlockingScheduler
 from typer import Typer
 
+from police_api_ingester.commands.cron import Cron
 from police_api_ingester.commands.ingest import (
     ingest_available_dates,
     ingest_forces,
     ingest_stop_and_searches,
 )
 from police_api_ingester.commands.options import (
+    BLOOM_FILTER_EXPECTED_ROWS,
+    BLOOM_FILTER_PATH,
     CRON,
     DATABASE_URL,
     FORCE_IDS,
     FROM_DATE,
     INGEST_AVAILABLE_DATES,
+    INGEST_SILVER,
     LOG_LEVEL,
     LOGGING_CONF_FILE_PATH,
+    METRICS_PORT,
+    PARQUET_DIRECTORY,
     POLICE_CLIENT_BASE_URL,
     POLICE_CLIENT_MAX_REQUEST_RETRIES,
     POLICE_CLIENT_MAX_REQUESTS_PER_SECONDS,
     POLICE_CLIENT_TIMEOUT,
+    REPLACE_MONTHS,
+    SKIP_UNCHANGED_MONTHS,
     TO_DATE,
 )
-from police_api_ingester.models import Cron
 
 schedule = Typer()
 
 
-def schedule_function(cron: Cron, func: Callable, **kwargs) -> None:
+def schedule_function(
+    cron: Cron, func: Callable, metrics_port: int | None = None, **kwargs
+) -> None:
+    from apscheduler.schedulers.blocking import BlockingScheduler
+
+    if metrics_port is not None:
+        from police_api_ingester.metrics import start_metrics_server
+
+        start_metrics_server(metrics_port)
     scheduler = BlockingScheduler()
     scheduler.add_job(
-        func,
+        timed_job(func),
         "cron",
         kwargs=kwargs,
         minute=cron.minute,
@@ -44,6 +60,25 @@ def schedule_function(cron: Cron, func: Callable, **kwargs) -> None:
     scheduler.start()
 
 
+def timed_job(func: Callable) -> Callable:
+    from police_api_ingester.metrics import JOB_DURATION
+    from police_api_ingester.profiling import get_profiler
+    from police_api_ingester.tracing import span
+
+    profiler = get_profiler()
+    name = func.__name__.replace("_", "-")
+
+    @wraps(func)
+    def wrapper(**kwargs):
+        with JOB_DURATION.labels(func.__name__).time(), span(name):
+            if profiler is None:
+                return func(**kwargs)
+            with profiler.profile(name):
+                return func(**kwargs)
+
+    return wrapper
+
+
 @schedule.command(
     "forces",
     help="Schedules the ingest of Police Forces into the bronze database using the Police API",
@@ -58,10 +93,12 @@ def schedule_ingest_forces(
     police_client_timeout: int = POLICE_CLIENT_TIMEOUT,
     log_level: int = LOG_LEVEL,
     logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
+    metrics_port: int | None = METRICS_PORT,
 ) -> None:
     schedule_function(
         cron,
         ingest_forces,
+        metrics_port=metrics_port,
         database_url=database_url,
         police_client_base_url=police_client_base_url,
         police_client_max_requests_per_seconds=police_client_max_requests_per_seconds,
@@ -89,10 +126,12 @@ def schedule_ingest_available_dates(
     police_client_timeout: int = POLICE_CLIENT_TIMEOUT,
     log_level: int = LOG_LEVEL,
     logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
+    metrics_port: int | None = METRICS_PORT,
 ) -> None:
     schedule_function(
         cron,
         ingest_available_dates,
+        metrics_port=metrics_port,
         from_datetime=from_datetime,
         to_datetime=to_datetime,
         database_url=database_url,
@@ -121,12 +160,20 @@ def schedule_ingest_stop_and_searches(
     police_client_max_request_retries: int = POLICE_CLIENT_MAX_REQUEST_RETRIES,
     police_client_timeout: int = POLICE_CLIENT_TIMEOUT,
     ingest_available_dates: bool = INGEST_AVAILABLE_DATES,
+    parquet_directory: Path | None = PARQUET_DIRECTORY,
+    ingest_silver: bool = INGEST_SILVER,
+    bloom_filter_path: Path | None = BLOOM_FILTER_PATH,
+    bloom_filter_expected_rows: int = BLOOM_FILTER_EXPECTED_ROWS,
+    skip_unchanged_months: bool = SKIP_UNCHANGED_MONTHS,
+    replace_months: bool = REPLACE_MONTHS,
     log_level: int = LOG_LEVEL,
     logging_conf_file_path: str = LOGGING_CONF_FILE_PATH,
+    metrics_port: int | None = METRICS_PORT,
 ) -> None:
     schedule_function(
         cron,
         ingest_stop_and_searches,
+        metrics_port=metrics_port,
         from_datetime=from_datetime,
         to_datetime=to_datetime,
         database_url=database_url,
@@ -134,6 +181,12 @@ def schedule_ingest_stop_and_searches(
         police_client_max_requests_per_seconds=police_client_max_requests_per_seconds,
         police_client_max_request_retries=police_client_max_request_retries,
         ingest_available_dates=ingest_available_dates,
+        parquet_directory=parquet_directory,
+        ingest_silver=ingest_silver,
+        bloom_filter_path=bloom_filter_path,
+        bloom_filter_expected_rows=bloom_filter_expected_rows,
+        skip_unchanged_months=skip_unchanged_months,
+        replace_months=replace_months,
         police_client_timeout=police_client_timeout,
         log_level=log_level,
         logging_conf_file_path=logging_conf_file_path,
@@ -0,0 +1 @@
+BASE_URL = "https://data.police.uk/api/"
@@ -0,0 +1,78 @@
+import bz2
+import gzip
+import lzma
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO
+
+from sqlalchemy import Engine, Select, and_, select
+
+from police_api_ingester.models import StopAndSearch
+
+COMPRESSORS: dict[str, Callable[..., IO]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+STANDARD_OUTPUT = Path("-")
+
+
+def get_stop_and_searches_query(
+    from_datetime: datetime, to_datetime: datetime, force_ids: list[str] | None = None
+) -> Select:
+    stop_and_search = StopAndSearch.__table__  # type: ignore[attr-defined]
+    conditions = [
+        from_datetime <= stop_and_search.c.Datetime,
+        stop_and_search.c.Datetime <= to_datetime,
+    ]
+    if force_ids:
+        conditions.append(stop_and_search.c.ForceId.in_(force_ids))
+    # Ordered to match the (ForceId, Datetime) index so Postgres does not sort
+    return (
+        select(stop_and_search)
+        .where(and_(*conditions))
+        .order_by(stop_and_search.c.ForceId, stop_and_search.c.Datetime)
+    )
+
+
+@contextmanager
+def open_export_file(path: Path) -> Iterator[IO[bytes]]:
+    """Opens the file to export to, compressing it when the suffix is '.gz', '.bz2'
+    or '.xz', and closes it when the export ends or fails. A path of '-' writes to
+    stdout."""
+    if path == STANDARD_OUTPUT:
+        with open(sys.stdout.fileno(), "wb", closefd=False) as file:
+            yield file
+        return
+    with COMPRESSORS.get(path.suffix, open)(path, "wb") as file:
+        yield file
+
+
+def export_stop_and_searches(
+    engine: Engine,
+    path: Path,
+    from_datetime: datetime,
+    to_datetime: datetime,
+    force_ids: list[str] | None = None,
+) -> int:
+    """Streams the stop and searches to a CSV file with COPY TO STDOUT, so rows are
+    written as Postgres sends them and are never held in memory. Returns the number
+    of rows exported."""
+    query = get_stop_and_searches_query(from_datetime, to_datetime, force_ids)
+    compiled = query.compile(
+        dialect=engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor, open_export_file(path) as file:
+            # COPY does not take parameters so they are bound client side first
+            bound_query = cursor.mogrify(str(compiled), compiled.params).decode()
+            cursor.copy_expert(
+                f"COPY ({bound_query}) TO STDOUT WITH (FORMAT csv, HEADER)", file
+            )
+            return cursor.rowcount
+    finally:
+        connection.close()
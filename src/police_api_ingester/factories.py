@@ -1,13 +1,15 @@
 import sys
 from logging import Logger, getLogger
 from logging.config import fileConfig
+from pathlib import Path
 from typing import TypeVar
 
 from httpx import Timeout
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
 
 from police_api_ingester.police_client import PoliceClient
 from police_api_ingester.repositories.repository import Repository
+from police_api_ingester.sinks import ParquetSink, PostgresSink, SilverSink, Sink
 
 
 def get_logger(log_file_path: str, log_level: int):
@@ -58,3 +60,18 @@ def create_repository(
         police_client_timeout,
     )
     return repository(engine, police_client, logger)
+
+
+def get_sinks(
+    engine: Engine,
+    logger: Logger,
+    ingest_silver: bool,
+    parquet_directory: Path | None = None,
+) -> list[Sink]:
+    """Returns the sinks the stop and searches are written to. Silver is written in
+    the bronze transaction, so a month is stored in both or neither."""
+    silver_sink = SilverSink(engine, logger=logger) if ingest_silver else None
+    sinks: list[Sink] = [PostgresSink(engine, logger, silver_sink=silver_sink)]
+    if parquet_directory is not None:
+        sinks.append(ParquetSink(parquet_directory, logger=logger))
+    return sinks
@@ -0,0 +1,340 @@
+import json
+from bisect import bisect
+from calendar import monthrange
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from pathlib import Path
+from random import Random
+from typing import Any
+
+FORCE_IDS = [
+    "avon-and-somerset",
+    "bedfordshire",
+    "btp",
+    "cambridgeshire",
+    "cheshire",
+    "city-of-london",
+    "cleveland",
+    "cumbria",
+    "derbyshire",
+    "devon-and-cornwall",
+    "dorset",
+    "durham",
+    "dyfed-powys",
+    "essex",
+    "gloucestershire",
+    "gwent",
+    "hampshire",
+    "hertfordshire",
+    "humberside",
+    "kent",
+    "lancashire",
+    "leicestershire",
+    "lincolnshire",
+    "merseyside",
+    "metropolitan",
+    "norfolk",
+    "north-wales",
+    "north-yorkshire",
+    "northamptonshire",
+    "northumbria",
+    "nottinghamshire",
+    "south-wales",
+    "south-yorkshire",
+    "staffordshire",
+    "suffolk",
+    "surrey",
+    "sussex",
+    "thames-valley",
+    "warwickshire",
+    "west-mercia",
+    "west-midlands",
+    "west-yorkshire",
+    "wiltshire",
+]
+
+# Bounding box of Great Britain used to place the centre of each force.
+MIN_LATITUDE, MAX_LATITUDE = 50.2, 55.8
+MIN_LONGITUDE, MAX_LONGITUDE = -4.5, 1.5
+FORCE_RADIUS_DEGREES = 0.3
+
+STREET_NAMES = [
+    "High Street",
+    "Station Road",
+    "Church Street",
+    "Park Road",
+    "London Road",
+    "Victoria Road",
+    "Green Lane",
+    "Manor Road",
+    "Church Lane",
+    "Park Avenue",
+    "Queen Street",
+    "Mill Lane",
+    "Kings Road",
+    "New Road",
+    "Shopping Area",
+    "Parking Area",
+    "Supermarket",
+    "Nightclub",
+    "Petrol Station",
+    "Sports/Recreation Area",
+]
+
+
+class WeightedChoice:
+    """Picks values with the frequencies observed in the real Police API data."""
+
+    def __init__(self, weighted_values: dict[Any, int]):
+        self.values = list(weighted_values)
+        self.cumulative_weights = list(accumulate(weighted_values.values()))
+        self.total = self.cumulative_weights[-1]
+
+    def __call__(self, random: Random) -> Any:
+        return self.values[
+            bisect(self.cumulative_weights, random.random() * self.total)
+        ]
+
+
+# Frequencies are taken from the stop and searches in the integration test data.
+SEARCH_TYPE = WeightedChoice(
+    {"Person search": 580, "Person and Vehicle search": 170, "Vehicle search": 10}
+)
+GENDER = WeightedChoice({"Male": 656, "Female": 92, "Other": 5, None: 1})
+AGE_RANGE = WeightedChoice(
+    {
+        "under 10": 1,
+        "10-17": 111,
+        "18-24": 221,
+        "25-34": 161,
+        "over 34": 170,
+        None: 91,
+    }
+)
+SELF_DEFINED_ETHNICITY = WeightedChoice(
+    {
+        "White - English/Welsh/Scottish/Northern Irish/British": 331,
+        "Other ethnic group - Not stated": 181,
+        "Asian/Asian British - Indian": 51,
+        "White - Any other White background": 35,
+        "Black/African/Caribbean/Black British - African": 33,
+        "Asian/Asian British - Any other Asian background": 25,
+        "Black/African/Caribbean/Black British - Caribbean": 22,
+        "Black/African/Caribbean/Black British - Any other Black/African/Caribbean background": 17,
+        "Asian/Asian British - Pakistani": 16,
+        "Mixed/Multiple ethnic groups - White and Black Caribbean": 13,
+        "Mixed/Multiple ethnic groups - Any other Mixed/Multiple ethnic background": 6,
+        "Mixed/Multiple ethnic groups - White and Asian": 5,
+        None: 19,
+    }
+)
+OFFICER_DEFINED_ETHNICITY = WeightedChoice(
+    {"White": 432, "Asian": 157, "Black": 122, "Other": 18, None: 25}
+)
+LEGISLATION = WeightedChoice(
+    {
+        "Misuse of Drugs Act 1971 (section 23)": 483,
+        "Police and Criminal Evidence Act 1984 (section 1)": 217,
+        "Firearms Act 1968 (section 47)": 5,
+        "Criminal Justice and Public Order Act 1994 (section 60)": 3,
+        "Psychoactive Substances Act 2016 (s36(2))": 1,
+        "Criminal Justice Act 1988 (section 139B)": 1,
+        None: 47,
+    }
+)
+OBJECT_OF_SEARCH = WeightedChoice(
+    {
+        "Controlled drugs": 522,
+        "Offensive weapons": 98,
+        "Article for use in theft": 64,
+        "Stolen goods": 37,
+        "Anything to threaten or harm anyone": 8,
+        "Articles for use in criminal damage": 7,
+        "Firearms": 6,
+        "Psychoactive substances": 2,
+        "Evidence of offences under the Act": 2,
+        "Goods on which duty has not been paid etc.": 1,
+        None: 7,
+    }
+)
+OUTCOME = WeightedChoice(
+    {
+        ("bu-no-further-action", "A no further action disposal"): 534,
+        ("bu-arrest", "Arrest"): 126,
+        ("bu-community-resolution", "Community resolution"): 71,
+        ("", ""): 14,
+        ("bu-khat-or-cannabis-warning", "Khat or Cannabis warning"): 4,
+        ("bu-summons", "Summons / charged by post"): 3,
+        ("bu-caution", "Caution (simple or conditional)"): 2,
+        ("bu-penalty-notice", "Penalty Notice for Disorder"): 1,
+    }
+)
+OUTCOME_LINKED_TO_OBJECT_OF_SEARCH = WeightedChoice({None: 467, True: 182, False: 105})
+REMOVAL_OF_MORE_THAN_OUTER_CLOTHING = WeightedChoice({False: 734, True: 20})
+OPERATION = WeightedChoice({None: 713, False: 34, True: 7})
+
+
+class SyntheticDataGenerator:
+    """Generates deterministic Police API payloads for a number of forces, months
+    and records per month.
+
+    Every payload is seeded from the seed and its route parameters, so any
+    (force, month) can be generated independently and in any order.
+    """
+
+    def __init__(
+        self,
+        force_count: int,
+        month_count: int,
+        records_per_month: int,
+        seed: int = 0,
+        last_month: str = "2024-12",
+        location_ratio: float = 0.84,
+    ):
+        self.force_count = force_count
+        self.month_count = month_count
+        self.records_per_month = records_per_month
+        self.seed = seed
+        self.last_month = last_month
+        self.location_ratio = location_ratio
+        self.force_ids = get_force_ids(force_count)
+        self.months = get_months(last_month, month_count)
+        self._force_id_set = set(self.force_ids)
+        self._month_set = set(self.months)
+
+    def forces(self) -> list[dict[str, Any]]:
+        return [
+            {"id": force_id, "name": f"{force_id.replace('-', ' ').title()} Police"}
+            for force_id in self.force_ids
+        ]
+
+    def available_dates(self) -> list[dict[str, Any]]:
+        return [
+            {"date": month, "stop-and-search": list(self.force_ids)}
+            for month in reversed(self.months)
+        ]
+
+    def record_count(self, with_location: bool) -> int:
+        with_location_count = round(self.records_per_month * self.location_ratio)
+        if with_location:
+            return with_location_count
+        return self.records_per_month - with_location_count
+
+    def stop_and_searches(
+        self, force_id: str, date: str, with_location: bool
+    ) -> list[dict[str, Any]]:
+        if force_id not in self._force_id_set or date not in self._month_set:
+            return []
+        random = Random(f"{self.seed}:{force_id}:{date}:{with_location}")
+        centre = get_force_centre(self.seed, force_id)
+        year, month = (int(part) for part in date.split("-"))
+        month_start = datetime(year, month, 1, tzinfo=timezone.utc)
+        month_minutes = monthrange(year, month)[1] * 24 * 60
+        return [
+            generate_stop_and_search(
+                random,
+                month_start + timedelta(minutes=random.randrange(month_minutes)),
+                centre if with_location else None,
+            )
+            for _ in range(self.record_count(with_location))
+        ]
+
+    def write(self, directory: Path) -> int:
+        """Writes the payloads in the same layout as the Police API routes and
+        returns the number of stop and searches written."""
+        write_json(directory / "forces.json", self.forces())
+        write_json(directory / "crimes-street-dates.json", self.available_dates())
+        records = 0
+        for route, with_location in (
+            ("stops-force", True),
+            ("stops-no-location", False),
+        ):
+            for force_id in self.force_ids:
+                for month in self.months:
+                    stop_and_searches = self.stop_and_searches(
+                        force_id, month, with_location
+                    )
+                    write_json(
+                        directory / route / force_id / f"{month}.json",
+                        stop_and_searches,
+                    )
+                    records += len(stop_and_searches)
+        return records
+
+
+def generate_stop_and_search(
+    random: Random, occurred_at: datetime, centre: tuple[float, float] | None
+) -> dict[str, Any]:
+    search_type = SEARCH_TYPE(random)
+    involved_person = search_type != "Vehicle search"
+    outcome_id, outcome_name = OUTCOME(random)
+    operation = OPERATION(random)
+    return {
+        "age_range": AGE_RANGE(random) if involved_person else None,
+        "outcome": outcome_name,
+        "involved_person": involved_person,
+        "self_defined_ethnicity": SELF_DEFINED_ETHNICITY(random)
+        if involved_person
+        else None,
+        "gender": GENDER(random) if involved_person else None,
+        "legislation": LEGISLATION(random),
+        "outcome_linked_to_object_of_search": OUTCOME_LINKED_TO_OBJECT_OF_SEARCH(
+            random
+        ),
+        "datetime": occurred_at.isoformat(),
+        "removal_of_more_than_outer_clothing": REMOVAL_OF_MORE_THAN_OUTER_CLOTHING(
+            random
+        ),
+        "outcome_object": {"id": outcome_id, "name": outcome_name},
+        "location": generate_location(random, centre) if centre else None,
+        "operation": operation,
+        "officer_defined_ethnicity": OFFICER_DEFINED_ETHNICITY(random)
+        if involved_person
+        else None,
+        "type": search_type,
+        "operation_name": "Synthetic Operation" if operation else None,
+        "object_of_search": OBJECT_OF_SEARCH(random),
+    }
+
+
+def generate_location(random: Random, centre: tuple[float, float]) -> dict[str, Any]:
+    latitude, longitude = centre
+    return {
+        "latitude": f"{latitude + random.uniform(-1, 1) * FORCE_RADIUS_DEGREES:.6f}",
+        "street": {
+            "id": random.randrange(500_000, 2_500_000),
+            "name": f"On or near {random.choice(STREET_NAMES)}",
+        },
+        "longitude": f"{longitude + random.uniform(-1, 1) * FORCE_RADIUS_DEGREES:.6f}",
+    }
+
+
+def get_force_ids(force_count: int) -> list[str]:
+    return FORCE_IDS[:force_count] + [
+        f"synthetic-force-{index}" for index in range(len(FORCE_IDS), force_count)
+    ]
+
+
+def get_force_centre(seed: int, force_id: str) -> tuple[float, float]:
+    random = Random(f"{seed}:{force_id}")
+    return (
+        random.uniform(MIN_LATITUDE, MAX_LATITUDE),
+        random.uniform(MIN_LONGITUDE, MAX_LONGITUDE),
+    )
+
+
+def get_months(last_month: str, month_count: int) -> list[str]:
+    """Returns the months in the format '%Y-%m' in ascending order up to and
+    including the last month."""
+    year, month = (int(part) for part in last_month.split("-"))
+    months = []
+    for _ in range(month_count):
+        months.append(f"{year:04}-{month:02}")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return list(reversed(months))
+
+
+def write_json(path: Path, data: list[dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w") as file:
+        json.dump(data, file)
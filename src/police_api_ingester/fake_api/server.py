@@ -0,0 +1,155 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import Logger, getLogger
+from random import Random
+from threading import Lock
+from time import monotonic, sleep
+from urllib.parse import parse_qs, urlsplit
+
+from police_api_ingester.fake_api.generator import SyntheticDataGenerator
+
+
+@dataclass
+class FakeApiConfig:
+    latency_median_seconds: float = 0.05
+    latency_sigma: float = 0.5
+    max_requests_per_second: float = 15
+    burst: int = 30
+    retry_after_seconds: int = 1
+    timeout_probability: float = 0.0
+    timeout_seconds: float = 30
+    seed: int = 0
+    # Each stop and search response holds a force and month of JSON, which at
+    # national scale adds up to gigabytes, so they are generated per request by default
+    response_cache_size: int = 0
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = monotonic()
+        self.lock = Lock()
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class FakePoliceApi(ThreadingHTTPServer):
+    """A stand in for the Police API serving synthetic data on the routes used by
+    the PoliceClient, with injected latency, rate limiting and timeouts."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        generator: SyntheticDataGenerator,
+        config: FakeApiConfig,
+        logger: Logger | None = None,
+    ):
+        super().__init__(address, FakePoliceApiRequestHandler)
+        self.generator = generator
+        self.config = config
+        self.logger = logger or getLogger("FakePoliceApi")
+        self.token_bucket = TokenBucket(config.max_requests_per_second, config.burst)
+        self.random = Random(config.seed)
+        self.random_lock = Lock()
+        # The forces and available dates are small and requested before every run
+        self.get_listing_body = lru_cache(maxsize=None)(self._get_listing_body)
+        self.get_stop_and_searches_body = lru_cache(maxsize=config.response_cache_size)(
+            self._get_stop_and_searches_body
+        )
+
+    def get_latency(self) -> float:
+        with self.random_lock:
+            latency = self.random.lognormvariate(0, self.config.latency_sigma)
+        return self.config.latency_median_seconds * latency
+
+    def should_time_out(self) -> bool:
+        with self.random_lock:
+            return self.random.random() < self.config.timeout_probability
+
+    def get_body(self, route: str, force_id: str | None, date: str | None) -> bytes:
+        if route in ("forces", "crimes-street-dates"):
+            return self.get_listing_body(route)
+        if route in ("stops-force", "stops-no-location") and force_id and date:
+            return self.get_stop_and_searches_body(route, force_id, date)
+        raise KeyError(route)
+
+    def _get_listing_body(self, route: str) -> bytes:
+        data = (
+            self.generator.forces()
+            if route == "forces"
+            else self.generator.available_dates()
+        )
+        return json.dumps(data).encode()
+
+    def _get_stop_and_searches_body(
+        self, route: str, force_id: str, date: str
+    ) -> bytes:
+        data = self.generator.stop_and_searches(
+            force_id, date, with_location=route == "stops-force"
+        )
+        return json.dumps(data).encode()
+
+
+class FakePoliceApiRequestHandler(BaseHTTPRequestHandler):
+    server: FakePoliceApi
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        # Only the last segment is used so any base url path such as '/api/' works
+        route = url.path.rstrip("/").rsplit("/", 1)[-1]
+        query = parse_qs(url.query)
+
+        if not self.server.token_bucket.try_acquire():
+            self.send_response(HTTPStatus.TOO_MANY_REQUESTS)
+            self.send_header("Retry-After", str(self.server.config.retry_after_seconds))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.server.should_time_out():
+            sleep(self.server.config.timeout_seconds)
+        else:
+            sleep(self.server.get_latency())
+
+        try:
+            body = self.server.get_body(
+                route, get_parameter(query, "force"), get_parameter(query, "date")
+            )
+        except KeyError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, which is expected for injected timeouts
+            pass
+
+    def log_message(self, format: str, *args) -> None:
+        self.server.logger.debug(format, *args)
+
+
+def get_parameter(query: dict[str, list[str]], name: str) -> str | None:
+    values = query.get(name)
+    return values[0] if values else None
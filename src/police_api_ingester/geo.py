@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+MICRODEGREES = 1_000_000
+GEOHASH_PRECISION = 7
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Every pair of characters, so ten bits are encoded with a single lookup
+GEOHASH_PAIRS = [
+    first + second for first in GEOHASH_ALPHABET for second in GEOHASH_ALPHABET
+]
+
+
+def to_microdegrees(value: str | float | Decimal | None) -> int | None:
+    """Returns the coordinate in whole microdegrees. Most six decimal place values
+    the Police API returns have no exact double, but the error of the float is far
+    below half a microdegree, so rounding to the nearest microdegree recovers the
+    value that was returned."""
+    if value is None:
+        return None
+    return round(float(value) * MICRODEGREES)
+
+
+def encode_geohash(
+    latitude: int, longitude: int, precision: int = GEOHASH_PRECISION
+) -> str:
+    """Returns the geohash of a point given in microdegrees, for a precision of up to
+    12 characters. The cell of each axis is found with integer division, which gives
+    the same cells as bisecting the range one bit at a time."""
+    bit_count = precision * 5
+    # Geohashes start with a longitude bit, so longitude has the extra odd bit
+    latitude_bits = bit_count // 2
+    longitude_bits = bit_count - latitude_bits
+    latitude_cell = spread_bits(get_cell(latitude, 90 * MICRODEGREES, latitude_bits))
+    longitude_cell = spread_bits(
+        get_cell(longitude, 180 * MICRODEGREES, longitude_bits)
+    )
+    if longitude_bits > latitude_bits:
+        bits = longitude_cell | latitude_cell << 1
+    else:
+        bits = longitude_cell << 1 | latitude_cell
+    characters = []
+    while bit_count >= 10:
+        bit_count -= 10
+        characters.append(GEOHASH_PAIRS[bits >> bit_count & 1023])
+    if bit_count:
+        characters.append(GEOHASH_ALPHABET[bits & 31])
+    return "".join(characters)
+
+
+def get_cell(coordinate: int, limit: int, bits: int) -> int:
+    """Returns which of the 2 ** bits equal cells between -limit and limit the
+    coordinate is in."""
+    cell = ((coordinate + limit) << bits) // (2 * limit)
+    return min(max(cell, 0), (1 << bits) - 1)
+
+
+def spread_bits(value: int) -> int:
+    """Returns the 32 bit value with a zero bit inserted before each of its bits, so
+    two spread values can be interleaved with a shift and an or."""
+    value = (value | value << 16) & 0x0000FFFF0000FFFF
+    value = (value | value << 8) & 0x00FF00FF00FF00FF
+    value = (value | value << 4) & 0x0F0F0F0F0F0F0F0F
+    value = (value | value << 2) & 0x3333333333333333
+    return (value | value << 1) & 0x5555555555555555
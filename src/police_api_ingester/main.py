@@ -1,8 +1,79 @@
+from pathlib import Path
+
+from click import Command, Context
 from typer import Typer
+from typer.core import TyperGroup
+
+from police_api_ingester.commands import (
+    export_commands,
+    fake_api_commands,
+    ingest_commands,
+    schedule_commands,
+)
+from police_api_ingester.commands.options import (
+    PROFILE,
+    PROFILE_DIRECTORY,
+    PROFILE_MEMORY,
+    TRACE_FILE,
+)
+
+COMMAND_NAMES = "police_api_ingester.command_names"
+
+
+class App(TyperGroup):
+    def resolve_command(
+        self, ctx: Context, args: list[str]
+    ) -> tuple[str | None, Command | None, list[str]]:
+        # The app callback runs before the subcommand is resolved, so the names of
+        # the command being run are kept for naming its profile and trace.
+        name, command, remaining_args = super().resolve_command(ctx, args)
+        ctx.meta[COMMAND_NAMES] = [
+            name,
+            *[arg for arg in remaining_args[:1] if not arg.startswith("-")],
+        ]
+        return name, command, remaining_args
+
+
+app = Typer(cls=App)
 
-from police_api_ingester.commands import ingest_commands, schedule_commands
 
-app = Typer()
+@app.callback()
+def instrument_command(
+    ctx: Context,
+    profile: bool = PROFILE,
+    profile_memory: bool = PROFILE_MEMORY,
+    profile_directory: Path = PROFILE_DIRECTORY,
+    trace_file: Path | None = TRACE_FILE,
+) -> None:
+    if trace_file is not None:
+        trace_command(ctx, trace_file)
+    if profile:
+        profile_command(ctx, profile_memory, profile_directory)
+
+
+def trace_command(ctx: Context, trace_file: Path) -> None:
+    from police_api_ingester.tracing import JsonLinesExporter, set_exporter, span
+
+    exporter = JsonLinesExporter(trace_file)
+    set_exporter(exporter)
+    ctx.call_on_close(exporter.close)
+    ctx.call_on_close(lambda: set_exporter(None))
+    # A schedule is never done, so each of its runs is a trace of its own
+    if ctx.invoked_subcommand != "schedule":
+        ctx.with_resource(span("-".join(ctx.meta[COMMAND_NAMES])))
+
+
+def profile_command(
+    ctx: Context, profile_memory: bool, profile_directory: Path
+) -> None:
+    from police_api_ingester.profiling import Profiler, set_profiler
+
+    profiler = Profiler(profile_directory, profile_memory)
+    if ctx.invoked_subcommand == "schedule":
+        set_profiler(profiler)
+        return
+    ctx.with_resource(profiler.profile("-".join(ctx.meta[COMMAND_NAMES])))
+
 
 app.add_typer(
     ingest_commands,
@@ -14,3 +85,13 @@ app.add_typer(
     name="schedule",
     help="Schedules the ingest of data into the bronze database tables.",
 )
+app.add_typer(
+    export_commands,
+    name="export",
+    help="Commands to export data from the bronze database tables.",
+)
+app.add_typer(
+    fake_api_commands,
+    name="fake-api",
+    help="Commands to generate and serve synthetic Police API data for load testing.",
+)
@@ -0,0 +1,63 @@
+from prometheus_client import Counter, Histogram, start_http_server
+
+REQUEST_LATENCY = Histogram(
+    "police_api_request_duration_seconds",
+    "Latency of the requests made to the Police API, excluding rate limiter waits.",
+    ["endpoint"],
+)
+RATE_LIMITED_RESPONSES = Counter(
+    "police_api_rate_limited_responses_total",
+    "Number of 429 responses returned by the Police API.",
+    ["endpoint"],
+)
+REQUEST_TIMEOUTS = Counter(
+    "police_api_request_timeouts_total",
+    "Number of requests to the Police API that timed out.",
+    ["endpoint"],
+)
+REQUEST_RETRIES = Counter(
+    "police_api_request_retries_total",
+    "Number of requests to the Police API that were retried.",
+    ["endpoint"],
+)
+VALIDATION_FAILURES = Counter(
+    "police_api_validation_failures_total",
+    "Number of records returned from the Police API that failed validation.",
+    ["model"],
+)
+ROWS_WRITTEN = Counter(
+    "police_api_ingester_rows_written_total",
+    "Number of rows written to the database.",
+    ["table"],
+)
+COMMIT_LATENCY = Histogram(
+    "police_api_ingester_commit_duration_seconds",
+    "Time taken to commit a transaction to the database.",
+    ["table"],
+)
+REPLACE_WAL_BYTES = Histogram(
+    "police_api_ingester_replace_wal_bytes",
+    "WAL written by the transaction replacing the rows of a force and month.",
+    ["table"],
+    buckets=(2**10, 2**14, 2**17, 2**20, 2**23, 2**26, 2**29, 2**32),
+)
+REPLACE_LOCK_DURATION = Histogram(
+    "police_api_ingester_replace_lock_duration_seconds",
+    "Time the rows of a force and month are locked while they are replaced.",
+    ["table"],
+)
+JOB_DURATION = Histogram(
+    "police_api_ingester_job_duration_seconds",
+    "Time taken by a scheduled job to run.",
+    ["job"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200, 14400),
+)
+
+
+def get_endpoint(route: str) -> str:
+    """Strips the query string so the endpoint label has a bounded cardinality."""
+    return route.split("?", 1)[0]
+
+
+def start_metrics_server(port: int) -> None:
+    start_http_server(port)
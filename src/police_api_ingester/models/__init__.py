@@ -13,4 +13,27 @@ from police_api_ingester.models.bronze import (
 from police_api_ingester.models.bronze import (
     StopAndSearch as StopAndSearch,
 )
-from police_api_ingester.models.cron import Cron as Cron
+from police_api_ingester.models.bronze import (
+    StopAndSearchChecksum as StopAndSearchChecksum,
+)
+from police_api_ingester.models.bronze import (
+    StopAndSearchQuarantine as StopAndSearchQuarantine,
+)
+from police_api_ingester.models.ops import RunReport as RunReport
+from police_api_ingester.models.silver import AgeRange as AgeRange
+from police_api_ingester.models.silver import Ethnicity as Ethnicity
+from police_api_ingester.models.silver import Gender as Gender
+from police_api_ingester.models.silver import Legislation as Legislation
+from police_api_ingester.models.silver import ObjectOfSearch as ObjectOfSearch
+from police_api_ingester.models.silver import Outcome as Outcome
+from police_api_ingester.models.silver import SearchType as SearchType
+from police_api_ingester.models.silver import SilverStopAndSearch as SilverStopAndSearch
+from police_api_ingester.models.silver import (
+    StopAndSearchCountByEthnicity as StopAndSearchCountByEthnicity,
+)
+from police_api_ingester.models.silver import (
+    StopAndSearchCountByLegislation as StopAndSearchCountByLegislation,
+)
+from police_api_ingester.models.silver import (
+    StopAndSearchCountByOutcome as StopAndSearchCountByOutcome,
+)
@@ -11,3 +11,9 @@ from police_api_ingester.models.bronze.force import Force as Force
 from police_api_ingester.models.bronze.stop_and_search import (
     StopAndSearch as StopAndSearch,
 )
+from police_api_ingester.models.bronze.stop_and_search_checksum import (
+    StopAndSearchChecksum as StopAndSearchChecksum,
+)
+from police_api_ingester.models.bronze.stop_and_search_quarantine import (
+    StopAndSearchQuarantine as StopAndSearchQuarantine,
+)
@@ -1,27 +1,59 @@
 from datetime import datetime as datetime_type
-from decimal import Decimal
 from typing import Any
 
 from pydantic import model_validator
 from sqlmodel import (
     BOOLEAN,
-    DECIMAL,
     INTEGER,
+    SMALLINT,
     Column,
+    Computed,
     DateTime,
     Field,
     ForeignKey,
+    Index,
     Relationship,
     SQLModel,
     String,
 )
 
+from police_api_ingester.geo import encode_geohash, to_microdegrees
 from police_api_ingester.models.bronze.force import Force
 
+# Generated column expressions must be immutable, which to_char is not, so the
+# buckets are built from the fields of the UTC datetime.
+UTC_DATETIME = """"Datetime" AT TIME ZONE 'UTC'"""
+YEAR_MONTH = (
+    f"extract(year FROM {UTC_DATETIME})::integer::text || '-' || "
+    f"lpad(extract(month FROM {UTC_DATETIME})::integer::text, 2, '0')"
+)
+ISO_WEEK = (
+    f"extract(isoyear FROM {UTC_DATETIME})::integer::text || '-W' || "
+    f"lpad(extract(week FROM {UTC_DATETIME})::integer::text, 2, '0')"
+)
+WEEKDAY = f"extract(isodow FROM {UTC_DATETIME})::smallint"
+HOUR = f"extract(hour FROM {UTC_DATETIME})::smallint"
+
 
 class StopAndSearch(SQLModel, table=True):
     __tablename__ = "StopAndSearch"
-    __table_args__ = {"schema": "bronze"}
+    __table_args__ = (
+        Index("IX_StopAndSearch_ForceId_Datetime", "ForceId", "Datetime"),
+        Index("IX_StopAndSearch_ForceId_SourceYearMonth", "ForceId", "SourceYearMonth"),
+        Index("IX_StopAndSearch_Datetime_Brin", "Datetime", postgresql_using="brin"),
+        Index("IX_StopAndSearch_Datetime_Id", "Datetime", "Id"),
+        Index(
+            "IX_StopAndSearch_YearMonth_Weekday_Hour", "YearMonth", "Weekday", "Hour"
+        ),
+        Index("IX_StopAndSearch_IsoWeek", "IsoWeek"),
+        # The pattern ops let geohash prefixes be searched with LIKE 'gcpv%'
+        Index(
+            "IX_StopAndSearch_Geohash",
+            "Geohash",
+            postgresql_ops={"Geohash": "varchar_pattern_ops"},
+        ),
+        {"schema": "bronze"},
+    )
 
     id: int | None = Field(
         default=None,
@@ -45,17 +77,53 @@ class StopAndSearch(SQLModel, table=True):
     datetime: datetime_type = Field(
         sa_column=Column("Datetime", DateTime(timezone=True), nullable=False)
     )
+    # The month the Police API returned the stop and search for, which is not always
+    # the UTC month of its Datetime, set by the sinks from the month they write
+    source_year_month: str | None = Field(
+        default=None,
+        sa_column=Column("SourceYearMonth", String(7), nullable=False),
+    )
+    # Generated by Postgres from the Datetime, in UTC
+    year_month: str | None = Field(
+        default=None,
+        sa_column=Column(
+            "YearMonth", String(7), Computed(YEAR_MONTH, persisted=True), nullable=False
+        ),
+    )
+    iso_week: str | None = Field(
+        default=None,
+        sa_column=Column(
+            "IsoWeek", String(8), Computed(ISO_WEEK, persisted=True), nullable=False
+        ),
+    )
+    weekday: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "Weekday", SMALLINT, Computed(WEEKDAY, persisted=True), nullable=False
+        ),
+    )
+    hour: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "Hour", SMALLINT, Computed(HOUR, persisted=True), nullable=False
+        ),
+    )
     operation: bool | None = Field(
         default=None, sa_column=Column("Operation", BOOLEAN, nullable=True)
     )
     operation_name: str | None = Field(
         default=None, sa_column=Column("OperationName", String, nullable=True)
     )
-    latitude: Decimal | None = Field(
-        default=None, sa_column=Column("Latitude", DECIMAL(9, 6), nullable=True)
+    latitude_microdegrees: int | None = Field(
+        default=None,
+        sa_column=Column("LatitudeMicrodegrees", INTEGER, nullable=True),
+    )
+    longitude_microdegrees: int | None = Field(
+        default=None,
+        sa_column=Column("LongitudeMicrodegrees", INTEGER, nullable=True),
     )
-    longitude: Decimal | None = Field(
-        default=None, sa_column=Column("Longitude", DECIMAL(9, 6), nullable=True)
+    geohash: str | None = Field(
+        default=None, sa_column=Column("Geohash", String(7), nullable=True)
     )
     street_id: int | None = Field(
         default=None, sa_column=Column("StreetId", INTEGER, nullable=True)
@@ -107,8 +175,15 @@ class StopAndSearch(SQLModel, table=True):
         street = location.get("street") or {}
         outcome = values.get("outcome_object") or {}
 
-        values["latitude"] = location.get("latitude")
-        values["longitude"] = location.get("longitude")
+        latitude = to_microdegrees(location.get("latitude"))
+        longitude = to_microdegrees(location.get("longitude"))
+        values["latitude_microdegrees"] = latitude
+        values["longitude_microdegrees"] = longitude
+        values["geohash"] = (
+            encode_geohash(latitude, longitude)
+            if latitude is not None and longitude is not None
+            else None
+        )
         values["street_id"] = street.get("id")
         values["street_name"] = street.get("name")
 
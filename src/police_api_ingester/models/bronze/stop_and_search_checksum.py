@@ -0,0 +1,37 @@
+from datetime import UTC, datetime
+
+from sqlmodel import (
+    Column,
+    DateTime,
+    Field,
+    ForeignKey,
+    LargeBinary,
+    SQLModel,
+    String,
+)
+
+
+class StopAndSearchChecksum(SQLModel, table=True):
+    """The checksum of the Police API responses a force and month were last written
+    from, so a month that has not changed is not parsed or written again."""
+
+    __tablename__ = "StopAndSearchChecksum"
+    __table_args__ = {"schema": "bronze"}
+
+    force_id: str = Field(
+        sa_column=Column(
+            "ForceId",
+            String(20),
+            ForeignKey("bronze.Force.Id"),
+            primary_key=True,
+            nullable=False,
+        ),
+    )
+    year_month: str = Field(
+        sa_column=Column("YearMonth", String(7), primary_key=True, nullable=False)
+    )
+    checksum: bytes = Field(sa_column=Column("Checksum", LargeBinary, nullable=False))
+    stored_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column("StoredAt", DateTime(timezone=True), nullable=False),
+    )
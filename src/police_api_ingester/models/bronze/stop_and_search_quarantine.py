@@ -0,0 +1,46 @@
+from datetime import UTC, datetime
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import (
+    BOOLEAN,
+    INTEGER,
+    Column,
+    DateTime,
+    Field,
+    ForeignKey,
+    Index,
+    SQLModel,
+    String,
+)
+
+
+class StopAndSearchQuarantine(SQLModel, table=True):
+    """A stop and search returned by the Police API that failed validation, kept as
+    it was returned so it can be validated again once the model is fixed."""
+
+    __tablename__ = "StopAndSearchQuarantine"
+    __table_args__ = (
+        Index("IX_StopAndSearchQuarantine_ForceId_YearMonth", "ForceId", "YearMonth"),
+        {"schema": "bronze"},
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column("Id", INTEGER, primary_key=True, nullable=False),
+    )
+    force_id: str = Field(
+        sa_column=Column(
+            "ForceId", String(20), ForeignKey("bronze.Force.Id"), nullable=False
+        ),
+    )
+    year_month: str = Field(sa_column=Column("YearMonth", String(7), nullable=False))
+    with_location: bool = Field(
+        sa_column=Column("WithLocation", BOOLEAN, nullable=False)
+    )
+    payload: dict = Field(sa_column=Column("Payload", JSONB, nullable=False))
+    # The field, error type and message of each validation error
+    errors: list[dict] = Field(sa_column=Column("Errors", JSONB, nullable=False))
+    quarantined_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column("QuarantinedAt", DateTime(timezone=True), nullable=False),
+    )
@@ -0,0 +1 @@
+from police_api_ingester.models.ops.run_report import RunReport as RunReport
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, JSONB
+from sqlmodel import INTEGER, Column, DateTime, Field, Index, SQLModel, String
+
+
+class RunReport(SQLModel, table=True):
+    __tablename__ = "RunReport"
+    __table_args__ = (
+        Index("IX_RunReport_Command_StartedAt", "Command", "StartedAt"),
+        {"schema": "ops"},
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column("Id", INTEGER, primary_key=True, nullable=False),
+    )
+    command: str = Field(sa_column=Column("Command", String, nullable=False))
+    arguments: dict = Field(sa_column=Column("Arguments", JSONB, nullable=False))
+    started_at: datetime = Field(
+        sa_column=Column("StartedAt", DateTime(timezone=True), nullable=False)
+    )
+    ended_at: datetime = Field(
+        sa_column=Column("EndedAt", DateTime(timezone=True), nullable=False)
+    )
+    error: str | None = Field(default=None, sa_column=Column("Error", String))
+    requests_by_status: dict = Field(
+        sa_column=Column("RequestsByStatus", JSONB, nullable=False)
+    )
+    retries: int = Field(sa_column=Column("Retries", INTEGER, nullable=False))
+    limiter_wait_seconds: float = Field(
+        sa_column=Column("LimiterWaitSeconds", DOUBLE_PRECISION, nullable=False)
+    )
+    rows_parsed: int = Field(sa_column=Column("RowsParsed", INTEGER, nullable=False))
+    rows_rejected: int = Field(
+        sa_column=Column("RowsRejected", INTEGER, nullable=False)
+    )
+    rows_written: dict = Field(sa_column=Column("RowsWritten", JSONB, nullable=False))
+    stage_seconds: dict = Field(sa_column=Column("StageSeconds", JSONB, nullable=False))
@@ -0,0 +1,21 @@
+from police_api_ingester.models.silver.age_range import AgeRange as AgeRange
+from police_api_ingester.models.silver.ethnicity import Ethnicity as Ethnicity
+from police_api_ingester.models.silver.gender import Gender as Gender
+from police_api_ingester.models.silver.legislation import Legislation as Legislation
+from police_api_ingester.models.silver.object_of_search import (
+    ObjectOfSearch as ObjectOfSearch,
+)
+from police_api_ingester.models.silver.outcome import Outcome as Outcome
+from police_api_ingester.models.silver.search_type import SearchType as SearchType
+from police_api_ingester.models.silver.stop_and_search import (
+    SilverStopAndSearch as SilverStopAndSearch,
+)
+from police_api_ingester.models.silver.stop_and_search_count_by_ethnicity import (
+    StopAndSearchCountByEthnicity as StopAndSearchCountByEthnicity,
+)
+from police_api_ingester.models.silver.stop_and_search_count_by_legislation import (
+    StopAndSearchCountByLegislation as StopAndSearchCountByLegislation,
+)
+from police_api_ingester.models.silver.stop_and_search_count_by_outcome import (
+    StopAndSearchCountByOutcome as StopAndSearchCountByOutcome,
+)
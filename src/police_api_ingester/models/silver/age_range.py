@@ -0,0 +1,12 @@
+from sqlmodel import SMALLINT, Column, Field, Identity, SQLModel, String
+
+
+class AgeRange(SQLModel, table=True):
+    __tablename__ = "AgeRange"
+    __table_args__ = {"schema": "silver"}
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column("Id", SMALLINT, Identity(), primary_key=True, nullable=False),
+    )
+    name: str = Field(sa_column=Column("Name", String, unique=True, nullable=False))
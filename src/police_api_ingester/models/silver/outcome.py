@@ -0,0 +1,21 @@
+from sqlmodel import (
+    SMALLINT,
+    Column,
+    Field,
+    Identity,
+    SQLModel,
+    String,
+    UniqueConstraint,
+)
+
+
+class Outcome(SQLModel, table=True):
+    __tablename__ = "Outcome"
+    __table_args__ = (UniqueConstraint("Code", "Name"), {"schema": "silver"})
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column("Id", SMALLINT, Identity(), primary_key=True, nullable=False),
+    )
+    code: str = Field(sa_column=Column("Code", String, nullable=False))
+    name: str = Field(sa_column=Column("Name", String, nullable=False))
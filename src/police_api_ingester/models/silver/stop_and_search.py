@@ -0,0 +1,147 @@
+from datetime import datetime as datetime_type
+
+from sqlmodel import (
+    BOOLEAN,
+    INTEGER,
+    SMALLINT,
+    Column,
+    DateTime,
+    Field,
+    ForeignKey,
+    Index,
+    SQLModel,
+    String,
+)
+
+
+class SilverStopAndSearch(SQLModel, table=True):
+    """The bronze StopAndSearch with the repeated strings replaced by SMALLINT keys
+    of the silver lookup tables."""
+
+    __tablename__ = "StopAndSearch"
+    __table_args__ = (
+        Index("IX_SilverStopAndSearch_ForceId_Datetime", "ForceId", "Datetime"),
+        Index(
+            "IX_SilverStopAndSearch_ForceId_SourceYearMonth",
+            "ForceId",
+            "SourceYearMonth",
+        ),
+        Index(
+            "IX_SilverStopAndSearch_Datetime_Brin", "Datetime", postgresql_using="brin"
+        ),
+        # The pattern ops let geohash prefixes be searched with LIKE 'gcpv%'
+        Index(
+            "IX_SilverStopAndSearch_Geohash",
+            "Geohash",
+            postgresql_ops={"Geohash": "varchar_pattern_ops"},
+        ),
+        {"schema": "silver"},
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column("Id", INTEGER, primary_key=True, nullable=False),
+    )
+    force_id: str = Field(
+        sa_column=Column(
+            "ForceId", String(20), ForeignKey("bronze.Force.Id"), nullable=False
+        ),
+    )
+    type_id: int = Field(
+        sa_column=Column(
+            "TypeId", SMALLINT, ForeignKey("silver.SearchType.Id"), nullable=False
+        )
+    )
+    involved_person: bool = Field(
+        sa_column=Column("InvolvedPerson", BOOLEAN, nullable=False)
+    )
+    datetime: datetime_type = Field(
+        sa_column=Column("Datetime", DateTime(timezone=True), nullable=False)
+    )
+    source_year_month: str = Field(
+        sa_column=Column("SourceYearMonth", String(7), nullable=False)
+    )
+    operation: bool | None = Field(
+        default=None, sa_column=Column("Operation", BOOLEAN, nullable=True)
+    )
+    operation_name: str | None = Field(
+        default=None, sa_column=Column("OperationName", String, nullable=True)
+    )
+    latitude_microdegrees: int | None = Field(
+        default=None,
+        sa_column=Column("LatitudeMicrodegrees", INTEGER, nullable=True),
+    )
+    longitude_microdegrees: int | None = Field(
+        default=None,
+        sa_column=Column("LongitudeMicrodegrees", INTEGER, nullable=True),
+    )
+    geohash: str | None = Field(
+        default=None, sa_column=Column("Geohash", String(7), nullable=True)
+    )
+    street_id: int | None = Field(
+        default=None, sa_column=Column("StreetId", INTEGER, nullable=True)
+    )
+    street_name: str | None = Field(
+        default=None, sa_column=Column("StreetName", String, nullable=True)
+    )
+    gender_id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "GenderId", SMALLINT, ForeignKey("silver.Gender.Id"), nullable=True
+        ),
+    )
+    age_range_id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "AgeRangeId", SMALLINT, ForeignKey("silver.AgeRange.Id"), nullable=True
+        ),
+    )
+    self_defined_ethnicity_id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "SelfDefinedEthnicityId",
+            SMALLINT,
+            ForeignKey("silver.Ethnicity.Id"),
+            nullable=True,
+        ),
+    )
+    officer_defined_ethnicity_id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "OfficerDefinedEthnicityId",
+            SMALLINT,
+            ForeignKey("silver.Ethnicity.Id"),
+            nullable=True,
+        ),
+    )
+    legislation_id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "LegislationId",
+            SMALLINT,
+            ForeignKey("silver.Legislation.Id"),
+            nullable=True,
+        ),
+    )
+    object_of_search_id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            "ObjectOfSearchId",
+            SMALLINT,
+            ForeignKey("silver.ObjectOfSearch.Id"),
+            nullable=True,
+        ),
+    )
+    outcome_id: int = Field(
+        sa_column=Column(
+            "OutcomeId", SMALLINT, ForeignKey("silver.Outcome.Id"), nullable=False
+        ),
+    )
+    outcome_linked_to_object_of_search: bool | None = Field(
+        default=None,
+        sa_column=Column("OutcomeLinkedToObjectOfSearch", BOOLEAN, nullable=True),
+    )
+    removal_of_more_than_outer_clothing: bool | None = Field(
+        default=None,
+        sa_column=Column("RemovalOfMoreThanOuterClothing", BOOLEAN, nullable=True),
+    )
@@ -0,0 +1,24 @@
+from sqlmodel import INTEGER, Column, Field, Index, SQLModel, String
+
+
+class StopAndSearchCountByLegislation(SQLModel, table=True):
+    __tablename__ = "StopAndSearchCountByLegislation"
+    __table_args__ = (
+        Index(
+            "IX_StopAndSearchCountByLegislation_ForceId_YearMonth",
+            "ForceId",
+            "YearMonth",
+        ),
+        {"schema": "silver"},
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column("Id", INTEGER, primary_key=True, nullable=False),
+    )
+    force_id: str = Field(sa_column=Column("ForceId", String(20), nullable=False))
+    year_month: str = Field(sa_column=Column("YearMonth", String(7), nullable=False))
+    legislation: str | None = Field(
+        default=None, sa_column=Column("Legislation", String, nullable=True)
+    )
+    count: int = Field(sa_column=Column("Count", INTEGER, nullable=False))
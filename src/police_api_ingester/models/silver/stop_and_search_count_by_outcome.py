@@ -0,0 +1,21 @@
+from sqlmodel import INTEGER, Column, Field, Index, SQLModel, String
+
+
+class StopAndSearchCountByOutcome(SQLModel, table=True):
+    __tablename__ = "StopAndSearchCountByOutcome"
+    __table_args__ = (
+        Index(
+            "IX_StopAndSearchCountByOutcome_ForceId_YearMonth", "ForceId", "YearMonth"
+        ),
+        {"schema": "silver"},
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column("Id", INTEGER, primary_key=True, nullable=False),
+    )
+    force_id: str = Field(sa_column=Column("ForceId", String(20), nullable=False))
+    year_month: str = Field(sa_column=Column("YearMonth", String(7), nullable=False))
+    outcome_id: str = Field(sa_column=Column("OutcomeId", String, nullable=False))
+    outcome_name: str = Field(sa_column=Column("OutcomeName", String, nullable=False))
+    count: int = Field(sa_column=Column("Count", INTEGER, nullable=False))
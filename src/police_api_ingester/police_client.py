@@ -1,7 +1,9 @@
+from asyncio import Lock
 from datetime import datetime
 from http import HTTPStatus
 from logging import Logger, getLogger
-from typing import TypeVar
+from time import perf_counter
+from typing import Any, TypeVar
 
 from aiolimiter import AsyncLimiter
 from httpx import AsyncClient, HTTPStatusError, ReadTimeout, Response, Timeout
@@ -9,13 +11,29 @@ from httpx._client import DEFAULT_TIMEOUT_CONFIG
 from pydantic_core import ValidationError
 from sqlmodel import SQLModel
 
+from police_api_ingester.constants import BASE_URL
+from police_api_ingester.metrics import (
+    RATE_LIMITED_RESPONSES,
+    REQUEST_LATENCY,
+    REQUEST_RETRIES,
+    REQUEST_TIMEOUTS,
+    VALIDATION_FAILURES,
+    get_endpoint,
+)
 from police_api_ingester.models import (
     AvailableDateWithForceIds,
     Force,
     StopAndSearch,
+    StopAndSearchQuarantine,
 )
-
-BASE_URL = "https://data.police.uk/api/"
+from police_api_ingester.run_stats import (
+    record_limiter_wait,
+    record_request,
+    record_retry,
+    record_validation,
+)
+from police_api_ingester.tracing import span
+from police_api_ingester.validation_failures import ValidationFailures
 
 T = TypeVar("T", bound=SQLModel)
 
@@ -33,6 +51,10 @@ class PoliceClient(AsyncClient):
     ):
         self.logger = logger or getLogger("PoliceClient")
         self.limiter = AsyncLimiter(1, ONE_SECOND / max_requests_per_second)
+        # A woken waiter that loses capacity to a new request is queued again at the
+        # back of the limiter, so requests wait their turn on a lock, which is first
+        # in first out, and are sent in the order they were made
+        self.request_queue = Lock()
         self.max_request_retries = max_request_retries
         super().__init__(base_url=base_url, timeout=timeout)
 
@@ -71,6 +93,26 @@ class PoliceClient(AsyncClient):
     async def get_stop_and_searches(
         self, date: str, force_id: str, with_location: bool
     ) -> list[StopAndSearch]:
+        stop_and_searches, _ = await self.get_stop_and_searches_and_quarantine(
+            date, force_id, with_location
+        )
+        return stop_and_searches
+
+    async def get_stop_and_searches_and_quarantine(
+        self, date: str, force_id: str, with_location: bool
+    ) -> tuple[list[StopAndSearch], list[StopAndSearchQuarantine]]:
+        """Returns the stop and searches that are valid and the ones that failed
+        validation, as they were returned, to be quarantined."""
+        response = await self.get_stop_and_searches_response(
+            date, force_id, with_location
+        )
+        return self.parse_stop_and_searches(response, date, force_id, with_location)
+
+    async def get_stop_and_searches_response(
+        self, date: str, force_id: str, with_location: bool
+    ) -> Response:
+        """Returns the response without decoding it, so its content can be compared
+        with what was stored before it is parsed."""
         endpoint = (
             f"stops-force?force={force_id}&date={date}"
             if with_location
@@ -83,27 +125,68 @@ class PoliceClient(AsyncClient):
             else f"Failed to fetch stop and searches without "
             f"location from Police API for force with id '{force_id}' on date '{date}'"
         )
-        stop_and_searches = await self._get_response_body(endpoint, error_message)
-        for stop_and_search in stop_and_searches:
-            stop_and_search["force_id"] = force_id
-        return self._map_vailidate_models(StopAndSearch, stop_and_searches)
+        with span("get_stop_and_searches", with_location=with_location):
+            return await self._get_response(endpoint, error_message)
+
+    def parse_stop_and_searches(
+        self, response: Response, date: str, force_id: str, with_location: bool
+    ) -> tuple[list[StopAndSearch], list[StopAndSearchQuarantine]]:
+        with span("parse_stop_and_searches", with_location=with_location):
+            with span("decode"):
+                stop_and_searches = response.json()
+            models, failures = self._validate_models(
+                StopAndSearch,
+                stop_and_searches,
+                f"Police API for force with id '{force_id}' on date '{date}'",
+                {"force_id": force_id},
+            )
+        quarantine = [
+            StopAndSearchQuarantine(
+                force_id=force_id,
+                year_month=date,
+                with_location=with_location,
+                payload=payload,
+                errors=errors,
+            )
+            for payload, errors in failures.records
+        ]
+        return models, quarantine
 
     async def rate_limited_get(self, route: str) -> Response:
+        endpoint = get_endpoint(route)
         attempts = 0
         while attempts < self.max_request_retries:
             attempts += 1
-            async with self.limiter:
-                try:
+            if attempts > 1:
+                REQUEST_RETRIES.labels(endpoint).inc()
+                record_retry()
+            queued = perf_counter()
+            with span("limiter_wait"):
+                async with self.request_queue:
+                    await self.limiter.acquire()
+            start = perf_counter()
+            record_limiter_wait(start - queued)
+            status = "error"
+            try:
+                with span("network", attempt=attempts):
                     response = await self.get(route)
-                except ReadTimeout:
-                    self.logger.warning(
-                        "The API caused a read time out."
-                        f"Currently at attempt '{attempts}' of '{self.max_request_retries}'."
-                        " Retrying..."
-                    )
-                    continue
+                status = str(response.status_code)
+            except ReadTimeout:
+                status = "timeout"
+                REQUEST_TIMEOUTS.labels(endpoint).inc()
+                self.logger.warning(
+                    "The API caused a read time out."
+                    f"Currently at attempt '{attempts}' of '{self.max_request_retries}'."
+                    " Retrying..."
+                )
+                continue
+            finally:
+                latency = perf_counter() - start
+                REQUEST_LATENCY.labels(endpoint).observe(latency)
+                record_request(status, latency)
             if response.status_code != HTTPStatus.TOO_MANY_REQUESTS:
                 return response
+            RATE_LIMITED_RESPONSES.labels(endpoint).inc()
             self.logger.warning(
                 "The rate limit on the API has been exceeded. "
                 f"Currently at attempt '{attempts}' of '{self.max_request_retries}'."
@@ -117,23 +200,47 @@ class PoliceClient(AsyncClient):
         return response
 
     async def _get_response_body(self, route: str, error_message: str) -> list[dict]:
-        response = await self.rate_limited_get(route)
+        response = await self._get_response(route, error_message)
+        with span("decode"):
+            return response.json()
+
+    async def _get_response(self, route: str, error_message: str) -> Response:
+        with span("rate_limited_get", endpoint=get_endpoint(route)):
+            response = await self.rate_limited_get(route)
         try:
             response.raise_for_status()
         except HTTPStatusError as error:
             self.logger.exception(error_message)
             raise error
-        return response.json()
+        return response
 
-    def _map_vailidate_models(self, model: type[T], data: list[dict]) -> list[T]:
-        models = []
-        for index, dict in enumerate(data):
-            try:
-                models.append(model.model_validate(dict))
-            except ValidationError:
-                self.logger.exception(
-                    f"Failed to map '{model.__name__}' at index '{index}' "
-                    "returned from Police API"
-                )
-                continue
+    def _map_vailidate_models(
+        self, model: type[T], data: list[dict], source: str = "Police API"
+    ) -> list[T]:
+        models, _ = self._validate_models(model, data, source)
         return models
+
+    def _validate_models(
+        self,
+        model: type[T],
+        data: list[dict],
+        source: str,
+        fields: dict[str, Any] | None = None,
+    ) -> tuple[list[T], ValidationFailures]:
+        """Validates a copy of each record with the fields set on it, as the model
+        validators write to the dict, so the records that fail are kept as they were
+        returned."""
+        start = perf_counter()
+        models = []
+        failures = ValidationFailures(model.__name__)
+        with span("validate", model=model.__name__, rows=len(data)):
+            for index, record in enumerate(data):
+                try:
+                    models.append(model.model_validate({**record, **(fields or {})}))
+                except ValidationError as error:
+                    failures.add(index, record, error)
+        if failures.rejected:
+            VALIDATION_FAILURES.labels(model.__name__).inc(failures.rejected)
+            self.logger.error(failures.get_summary(len(data), source))
+        record_validation(len(models), failures.rejected, perf_counter() - start)
+        return models, failures
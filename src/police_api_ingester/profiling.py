@@ -0,0 +1,75 @@
+import cProfile
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+TOP_ALLOCATIONS = 50
+# The allocations made by tracemalloc itself and the import machinery are left out
+# of the top allocations
+ALLOCATION_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+class Profiler:
+    """Profiles runs of a command with cProfile, and tracemalloc when memory is
+    profiled, and writes the artefacts of each run to the directory named by the
+    command and the UTC time the run started. cProfile only profiles the thread the
+    run started on."""
+
+    def __init__(self, directory: Path, memory: bool = False):
+        self.directory = directory
+        self.memory = memory
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        started_at = datetime.now(UTC)
+        if self.memory:
+            tracemalloc.start()
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            # The snapshot is taken first so writing the profile is not in it
+            top_allocations = get_top_allocations() if self.memory else None
+            self.directory.mkdir(parents=True, exist_ok=True)
+            stem = self.directory / f"{name}-{started_at:%Y%m%dT%H%M%S%fZ}"
+            profile.dump_stats(stem.with_suffix(".pstats"))
+            if top_allocations is not None:
+                stem.with_suffix(".allocations.txt").write_text(top_allocations)
+
+
+def get_top_allocations() -> str:
+    """Returns the peak traced memory and the lines that hold the most memory, then
+    stops tracing."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    statistics = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+    lines = [
+        f"Peak traced memory: {peak} bytes",
+        f"Top {len(statistics)} allocations by line:",
+        *[str(statistic) for statistic in statistics],
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# A schedule runs until it is stopped, so its fires are profiled instead of the
+# command. The fires run on the scheduler's worker threads, which do not copy the
+# context, so the profiler is held here.
+_profiler: Profiler | None = None
+
+
+def set_profiler(profiler: Profiler | None) -> None:
+    global _profiler
+    _profiler = profiler
+
+
+def get_profiler() -> Profiler | None:
+    return _profiler
@@ -1,3 +1,6 @@
+from police_api_ingester.repositories.aggregate_repository import (
+    AggregateRepository as AggregateRepository,
+)
 from police_api_ingester.repositories.available_date_repository import (
     AvailableDateRepository as AvailableDateRepository,
 )
@@ -5,6 +8,12 @@ from police_api_ingester.repositories.force_repository import (
     ForceRepository as ForceRepository,
 )
 from police_api_ingester.repositories.repository import Repository as Repository
+from police_api_ingester.repositories.run_report_repository import (
+    RunReportRepository as RunReportRepository,
+)
+from police_api_ingester.repositories.stop_and_search_checksum_repository import (
+    StopAndSearchChecksumRepository as StopAndSearchChecksumRepository,
+)
 from police_api_ingester.repositories.stop_and_search_repository import (
     StopAndSearchRepository as StopAndSearchRepository,
 )
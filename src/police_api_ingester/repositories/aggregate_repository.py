@@ -0,0 +1,159 @@
+from datetime import datetime
+from logging import Logger
+
+from sqlalchemy import (
+    Engine,
+    String,
+    and_,
+    delete,
+    func,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from police_api_ingester.metrics import COMMIT_LATENCY, ROWS_WRITTEN
+from police_api_ingester.models import (
+    StopAndSearch,
+    StopAndSearchCountByEthnicity,
+    StopAndSearchCountByLegislation,
+    StopAndSearchCountByOutcome,
+)
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories.available_date_repository import (
+    AvailableDateRepository,
+)
+from police_api_ingester.repositories.repository import Repository, unnest
+from police_api_ingester.run_stats import record_rows_written, stage
+from police_api_ingester.tracing import span
+
+# The StopAndSearch columns each silver table counts by, the silver tables use the
+# same column names as bronze.
+AGGREGATES = {
+    StopAndSearchCountByOutcome: ("OutcomeId", "OutcomeName"),
+    StopAndSearchCountByEthnicity: ("SelfDefinedEthnicity", "OfficerDefinedEthnicity"),
+    StopAndSearchCountByLegislation: ("Legislation",),
+}
+
+
+class AggregateRepository(Repository):
+    def __init__(
+        self, engine: Engine, police_client: PoliceClient, logger: Logger | None = None
+    ):
+        super().__init__(engine, police_client, logger)
+        self.available_date_repository = AvailableDateRepository(engine, police_client)
+
+    async def refresh_aggregates(self, slices: list[tuple[str, str]]) -> bool:
+        """Recounts the silver aggregates for the (year_month, force_id) slices.
+
+        Each slice is deleted and recounted from the StopAndSearches the Police API
+        returned for its month, through the (ForceId, SourceYearMonth) index, as
+        some of them fall outside the UTC month. Only the slices that changed are
+        scanned and the whole refresh is a single transaction."""
+        if not slices:
+            return True
+
+        slice_table = select(
+            unnest([force_id for _, force_id in slices], String(20)).label("ForceId"),
+            unnest([year_month for year_month, _ in slices], String(7)).label(
+                "YearMonth"
+            ),
+        ).subquery("Slice")
+        stop_and_search = StopAndSearch.__table__  # type: ignore[attr-defined]
+
+        rows_written = {}
+        with (
+            Session(self.engine) as session,
+            stage("aggregates"),
+            span("refresh_aggregates", slices=len(slices)),
+        ):
+            try:
+                for aggregate, dimensions in AGGREGATES.items():
+                    table = aggregate.__table__  # type: ignore[attr-defined]
+                    session.exec(
+                        delete(table).where(
+                            tuple_(table.c.ForceId, table.c.YearMonth).in_(
+                                select(slice_table.c.ForceId, slice_table.c.YearMonth)
+                            )
+                        )
+                    )
+                    # LATERAL counts each slice with its own index range scan, a
+                    # plain join is planned as a merge join on ForceId alone.
+                    slice_counts = (
+                        select(
+                            *[stop_and_search.c[dimension] for dimension in dimensions],
+                            func.count().label("Count"),
+                        )
+                        .where(
+                            and_(
+                                stop_and_search.c.ForceId == slice_table.c.ForceId,
+                                stop_and_search.c.SourceYearMonth
+                                == slice_table.c.YearMonth,
+                            )
+                        )
+                        .group_by(
+                            *[stop_and_search.c[dimension] for dimension in dimensions]
+                        )
+                        .lateral("SliceCount")
+                    )
+                    counts = select(
+                        slice_table.c.ForceId,
+                        slice_table.c.YearMonth,
+                        *[slice_counts.c[dimension] for dimension in dimensions],
+                        slice_counts.c.Count,
+                    ).join_from(slice_table, slice_counts, true())
+                    result = session.exec(
+                        insert(table).from_select(
+                            ["ForceId", "YearMonth", *dimensions, "Count"], counts
+                        )
+                    )
+                    rows_written[table.name] = result.rowcount
+                with (
+                    COMMIT_LATENCY.labels("Aggregates").time(),
+                    span("commit", table="Aggregates"),
+                ):
+                    session.commit()
+            except SQLAlchemyError as error:
+                self.logger.warning(
+                    f"Cannot refresh the aggregates in the database for {len(slices)} force and month slices.",
+                    exc_info=error,
+                )
+                return False
+        for table_name, rows in rows_written.items():
+            ROWS_WRITTEN.labels(table_name).inc(rows)
+            record_rows_written(table_name, rows)
+        return True
+
+    async def get_row_counts(self) -> dict[tuple[str, str], int] | None:
+        """Returns the number of StopAndSearches in each (year_month, force_id) slice
+        that has been counted in the silver aggregates, which is far cheaper than
+        counting bronze."""
+        table = StopAndSearchCountByOutcome.__table__  # type: ignore[attr-defined]
+        query = select(
+            table.c.YearMonth, table.c.ForceId, func.sum(table.c.Count)
+        ).group_by(table.c.YearMonth, table.c.ForceId)
+        try:
+            with self.engine.connect() as connection:
+                return {
+                    (year_month, force_id): int(count)
+                    for year_month, force_id, count in connection.execute(query)
+                }
+        except SQLAlchemyError as error:
+            self.logger.warning(
+                "Cannot get the StopAndSearch row counts from the aggregates in the database.",
+                exc_info=error,
+            )
+            return None
+
+    async def refresh_aggregates_between(
+        self, from_date: datetime, to_date: datetime
+    ) -> bool:
+        slices = await self.available_date_repository.get_available_date_force_ids(
+            from_date, to_date
+        )
+        if slices is None:
+            return False
+        return await self.refresh_aggregates(slices)
@@ -3,20 +3,22 @@ from datetime import datetime
 from logging import Logger
 
 from httpx import HTTPStatusError
-from sqlalchemy import Engine
+from sqlalchemy import INTEGER, Engine, String
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 from sqlmodel import Session, and_, select
 
+from police_api_ingester.metrics import COMMIT_LATENCY, ROWS_WRITTEN
 from police_api_ingester.models import (
     AvailableDate,
     AvailableDateForceMapping,
-    AvailableDateWithForceIds,
     Force,
 )
 from police_api_ingester.police_client import PoliceClient
 from police_api_ingester.repositories.force_repository import ForceRepository
-from police_api_ingester.repositories.repository import Repository
+from police_api_ingester.repositories.repository import Repository, unnest
+from police_api_ingester.run_stats import record_rows_written, stage
 
 
 class AvailableDateRepository(Repository):
@@ -30,91 +32,94 @@ class AvailableDateRepository(Repository):
         self, from_date: datetime, to_date: datetime, force_ids: list[str] | None = None
     ) -> bool:
         try:
-            forces, available_dates, existing_available_dates = await gather(
+            forces, available_dates = await gather(
                 self.force_repository.store_forces(force_ids),
                 self.police_client.get_available_dates(from_date, to_date, force_ids),
-                self.get_available_dates(from_date, to_date, with_forces=True),
             )
         except HTTPStatusError:
             return False
 
-        if forces is None or existing_available_dates is None:
+        if forces is None:
             return False
 
-        missing_forces = set(
-            [
-                Force(id=force_id)
-                for available_date in available_dates
-                for force_id in available_date.force_ids
-                if force_id not in forces
-            ]
-        )
-        if missing_forces:
-            with Session(self.engine) as session:
+        stored_force_ids = {force.id for force in forces}
+        force_ids_by_year_month = {
+            available_date.year_month: set(available_date.force_ids)
+            for available_date in available_dates
+        }
+        missing_force_ids = {
+            force_id
+            for date_force_ids in force_ids_by_year_month.values()
+            for force_id in date_force_ids
+        } - stored_force_ids
+
+        # Each statement unnests arrays so the number of parameters, and the
+        # round trips, stay the same however many dates are refreshed.
+        with Session(self.engine) as session, stage("write"):
+            if missing_force_ids:
                 try:
-                    session.add_all(missing_forces)
-                    session.commit()
+                    session.exec(
+                        insert(Force)
+                        .from_select(
+                            [Force.id], select(unnest(missing_force_ids, String(20)))
+                        )
+                        .on_conflict_do_nothing()
+                    )
                 except SQLAlchemyError:
                     self.logger.exception(
                         "Cannot store missing Forces in the database."
                     )
                     return False
 
-        results = await gather(
-            *[
-                self.store_available_date(available_date, existing_available_dates)
-                for available_date in available_dates
-            ]
-        )
-        return all(results)
-
-    async def store_available_date(
-        self,
-        available_date_with_force_ids: AvailableDateWithForceIds,
-        existing_available_dates: list[AvailableDate],
-    ) -> bool:
-        existing_available_date = next(
-            (
-                date
-                for date in existing_available_dates
-                if date.year_month == available_date_with_force_ids.year_month
-            ),
-            None,
-        )
-        with Session(self.engine) as session:
-            if existing_available_date is None:
-                available_date = AvailableDate(
-                    id=None, year_month=available_date_with_force_ids.year_month
-                )
-                try:
-                    session.add(available_date)
-                    session.flush()
-                except SQLAlchemyError as error:
-                    self.logger.warning(
-                        "Cannot flush AvailableDate "
-                        f"to the database for date '{available_date}'.",
-                        exc_info=error,
-                    )
-                    return False
-            else:
-                available_date = existing_available_date
+            if not force_ids_by_year_month:
+                return True
 
             try:
-                mappings = [
-                    AvailableDateForceMapping(
-                        available_date_id=available_date.id, force_id=force_id
-                    )
-                    for force_id in available_date_with_force_ids.force_ids
-                    if force_id not in available_date.force_ids
+                statement = insert(AvailableDate).from_select(
+                    [AvailableDate.year_month],
+                    select(unnest(force_ids_by_year_month, String(7))),
+                )
+                # The no-op update makes RETURNING include the dates that already
+                # exist, so every id is known without a second query.
+                available_date_ids = dict(
+                    session.exec(
+                        statement.on_conflict_do_update(
+                            index_elements=[AvailableDate.year_month],
+                            set_={"YearMonth": statement.excluded.YearMonth},
+                        ).returning(AvailableDate.year_month, AvailableDate.id)
+                    ).all()
+                )
+                mapping_keys = [
+                    (available_date_ids[year_month], force_id)
+                    for year_month, date_force_ids in force_ids_by_year_month.items()
+                    for force_id in date_force_ids
                 ]
-                session.add_all(mappings)
-                session.commit()
-            except SQLAlchemyError:
+                mappings = session.exec(
+                    insert(AvailableDateForceMapping)
+                    .from_select(
+                        [
+                            AvailableDateForceMapping.available_date_id,
+                            AvailableDateForceMapping.force_id,
+                        ],
+                        select(
+                            unnest([key[0] for key in mapping_keys], INTEGER),
+                            unnest([key[1] for key in mapping_keys], String(20)),
+                        ),
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(AvailableDateForceMapping.force_id)
+                ).all()
+                with COMMIT_LATENCY.labels("AvailableDateForceMapping").time():
+                    session.commit()
+            except SQLAlchemyError as error:
                 self.logger.warning(
-                    "Cannot store AvailableDate and AvailableDateForceMappings "
-                    f"in the database for date '{available_date}'."
+                    "Cannot store AvailableDates and AvailableDateForceMappings "
+                    f"in the database between '{from_date:%Y-%m}' and '{to_date:%Y-%m}'.",
+                    exc_info=error,
                 )
                 return False
+        ROWS_WRITTEN.labels("AvailableDateForceMapping").inc(len(mappings))
+        record_rows_written("AvailableDateForceMapping", len(mappings))
         return True
 
     async def get_available_dates(
@@ -139,3 +144,31 @@ class AvailableDateRepository(Repository):
                     f"database between '{from_year_month}' to '{to_year_month}'."
                 )
                 return None
+
+    async def get_available_date_force_ids(
+        self, from_date: datetime, to_date: datetime
+    ) -> list[tuple[str, str]] | None:
+        """Returns (year_month, force_id) pairs for the forces with stop and searches
+        in each month. Runs on a Connection so no ORM objects are built."""
+        from_year_month = from_date.strftime("%Y-%m")
+        to_year_month = to_date.strftime("%Y-%m")
+        query = (
+            select(AvailableDate.year_month, AvailableDateForceMapping.force_id)
+            .join_from(AvailableDateForceMapping, AvailableDate)
+            .where(
+                and_(
+                    from_year_month <= AvailableDate.year_month,
+                    AvailableDate.year_month <= to_year_month,
+                )
+            )
+            .order_by(AvailableDate.year_month, AvailableDateForceMapping.force_id)
+        )
+        try:
+            with self.engine.connect() as connection:
+                return list(connection.execute(query).tuples().all())
+        except SQLAlchemyError:
+            self.logger.exception(
+                "Could not retrieve AvailableDateForceMappings from the "
+                f"database between '{from_year_month}' to '{to_year_month}'."
+            )
+            return None
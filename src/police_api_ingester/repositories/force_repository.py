@@ -2,13 +2,16 @@ from asyncio import gather
 from logging import Logger
 
 from httpx import HTTPStatusError
-from sqlalchemy import Engine
+from sqlalchemy import Engine, String
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session, select
 
+from police_api_ingester.metrics import COMMIT_LATENCY, ROWS_WRITTEN
 from police_api_ingester.models import Force
 from police_api_ingester.police_client import PoliceClient
-from police_api_ingester.repositories.repository import Repository
+from police_api_ingester.repositories.repository import Repository, unnest
+from police_api_ingester.run_stats import record_rows_written, stage
 
 
 class ForceRepository(Repository):
@@ -30,22 +33,45 @@ class ForceRepository(Repository):
         if existing_forces is None:
             return None
 
-        with Session(self.engine) as session:
-            forces_to_add = [force for force in forces if force not in existing_forces]
+        # Force.__eq__ compares the name as well as the id, so renamed forces are
+        # upserted along with the new ones.
+        stored_forces = {force.id: force for force in existing_forces}
+        forces_to_store = {
+            force.id: force for force in forces if stored_forces.get(force.id) != force
+        }
+        if not forces_to_store:
+            return list(stored_forces.values())
+
+        statement = insert(Force).from_select(
+            [Force.id, Force.name],
+            select(
+                unnest(forces_to_store, String(20)),
+                unnest([force.name for force in forces_to_store.values()], String),
+            ),
+        )
+        with Session(self.engine) as session, stage("write"):
             try:
-                session.add_all(forces_to_add)
-                session.commit()
+                upserted_force_ids = (
+                    session.exec(
+                        statement.on_conflict_do_update(
+                            index_elements=[Force.id],
+                            set_={"Name": statement.excluded.Name},
+                        ).returning(Force.id)
+                    )
+                    .scalars()
+                    .all()
+                )
+                with COMMIT_LATENCY.labels("Force").time():
+                    session.commit()
             except SQLAlchemyError:
                 self.logger.exception("Could not store Forces in the database.")
                 return None
+        ROWS_WRITTEN.labels("Force").inc(len(upserted_force_ids))
+        record_rows_written("Force", len(upserted_force_ids))
 
-            try:
-                for force in forces_to_add:
-                    session.refresh(force)
-            except SQLAlchemyError:
-                self.logger.exception("Could not refresh Forces in the database.")
-                return None
-        return existing_forces + forces_to_add
+        for force_id in upserted_force_ids:
+            stored_forces[force_id] = forces_to_store[force_id]
+        return list(stored_forces.values())
 
     async def get_all_forces(self) -> list[Force] | None:
         try:
@@ -1,6 +1,10 @@
+from collections.abc import Iterable
 from logging import Logger, getLogger
+from typing import Any
 
-from sqlalchemy import Engine
+from sqlalchemy import ARRAY, Engine, func, literal
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeEngine
 
 from police_api_ingester.police_client import PoliceClient
 
@@ -12,3 +16,9 @@ class Repository:
         self.engine = engine
         self.police_client = police_client
         self.logger = logger or getLogger(self.__class__.__name__)
+
+
+def unnest(values: Iterable[Any], type_: TypeEngine) -> FunctionElement:
+    """Binds the values as a single array parameter so a statement selecting from
+    it has the same number of parameters however many rows it writes."""
+    return func.unnest(literal(list(values), ARRAY(type_)))
@@ -0,0 +1,45 @@
+from datetime import UTC, datetime
+from logging import Logger
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from police_api_ingester.models import RunReport
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories.repository import Repository
+from police_api_ingester.run_stats import RunStats
+
+
+class RunReportRepository(Repository):
+    def __init__(
+        self, engine: Engine, police_client: PoliceClient, logger: Logger | None = None
+    ):
+        super().__init__(engine, police_client, logger)
+
+    async def store_run_report(self, run_stats: RunStats) -> bool:
+        run_report = RunReport(
+            command=run_stats.command,
+            arguments=run_stats.arguments,
+            started_at=run_stats.started_at,
+            ended_at=run_stats.ended_at or datetime.now(UTC),
+            error=run_stats.error,
+            requests_by_status=dict(run_stats.requests_by_status),
+            retries=run_stats.retries,
+            limiter_wait_seconds=run_stats.limiter_wait_seconds,
+            rows_parsed=run_stats.rows_parsed,
+            rows_rejected=run_stats.rows_rejected,
+            rows_written=dict(run_stats.rows_written),
+            stage_seconds=dict(run_stats.stage_seconds),
+        )
+        with Session(self.engine) as session:
+            try:
+                session.add(run_report)
+                session.commit()
+            except SQLAlchemyError as error:
+                self.logger.warning(
+                    f"Cannot store the RunReport of '{run_stats.command}' in the database.",
+                    exc_info=error,
+                )
+                return False
+        return True
@@ -0,0 +1,62 @@
+from datetime import UTC, datetime
+from logging import Logger
+
+from sqlalchemy import Engine, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from police_api_ingester.models import StopAndSearchChecksum
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories.repository import Repository
+
+
+class StopAndSearchChecksumRepository(Repository):
+    def __init__(
+        self, engine: Engine, police_client: PoliceClient, logger: Logger | None = None
+    ):
+        super().__init__(engine, police_client, logger)
+
+    async def get_checksum(self, force_id: str, year_month: str) -> bytes | None:
+        """Returns the checksum the force and month were last written from, or None
+        when it has not been stored or cannot be read, so the month is written."""
+        table = StopAndSearchChecksum.__table__  # type: ignore[attr-defined]
+        query = select(table.c.Checksum).where(
+            table.c.ForceId == force_id, table.c.YearMonth == year_month
+        )
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(query).scalar_one_or_none()
+        except SQLAlchemyError as error:
+            self.logger.warning(
+                f"Cannot get the StopAndSearchChecksum for '{force_id}' on date '{year_month}' from the database.",
+                exc_info=error,
+            )
+            return None
+
+    async def store_checksum(
+        self, force_id: str, year_month: str, checksum: bytes
+    ) -> bool:
+        table = StopAndSearchChecksum.__table__  # type: ignore[attr-defined]
+        statement = insert(table).values(
+            ForceId=force_id,
+            YearMonth=year_month,
+            Checksum=checksum,
+            StoredAt=datetime.now(UTC),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.ForceId, table.c.YearMonth],
+            set_={
+                "Checksum": statement.excluded.Checksum,
+                "StoredAt": statement.excluded.StoredAt,
+            },
+        )
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(statement)
+        except SQLAlchemyError as error:
+            self.logger.warning(
+                f"Cannot store the StopAndSearchChecksum for '{force_id}' on date '{year_month}' in the database.",
+                exc_info=error,
+            )
+            return False
+        return True
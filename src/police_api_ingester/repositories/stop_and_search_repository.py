@@ -1,25 +1,73 @@
-from asyncio import gather
-from datetime import datetime
+from asyncio import gather, to_thread
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from datetime import UTC, datetime
+from hashlib import blake2b
 from logging import Logger
+from math import inf
+from pathlib import Path
+from typing import Any
 
 from httpx import HTTPStatusError
-from sqlalchemy import Engine
+from pydantic import ValidationError
+from sqlalchemy import Engine, Row, Select, and_, inspect, select, tuple_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
+from police_api_ingester.bloom_filter import BloomFilter
+from police_api_ingester.models import StopAndSearch, StopAndSearchQuarantine
 from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories.aggregate_repository import AggregateRepository
 from police_api_ingester.repositories.available_date_repository import (
     AvailableDateRepository,
 )
 from police_api_ingester.repositories.repository import Repository
+from police_api_ingester.repositories.stop_and_search_checksum_repository import (
+    StopAndSearchChecksumRepository,
+)
+from police_api_ingester.run_stats import stage
+from police_api_ingester.sinks.postgres_sink import PostgresSink
+from police_api_ingester.sinks.sink import Sink
+from police_api_ingester.tracing import span
+from police_api_ingester.validation_failures import get_errors
+
+# Maps the columns that make up the content of a stop and search to their model
+# attributes. The Id, the month it was returned for, which the sinks set, and the
+# columns Postgres generates are left out.
+CONTENT_COLUMNS = {
+    attribute.columns[0].name: attribute.key
+    for attribute in inspect(StopAndSearch).column_attrs
+    if attribute.columns[0].name not in ("Id", "SourceYearMonth")
+    and attribute.columns[0].computed is None
+}
+# The columns streamed by default, which leave out the buckets Postgres generates
+STREAMED_COLUMNS = ["Id", *CONTENT_COLUMNS, "SourceYearMonth"]
 
 
 class StopAndSearchRepository(Repository):
     def __init__(
-        self, engine: Engine, police_client: PoliceClient, logger: Logger | None = None
+        self,
+        engine: Engine,
+        police_client: PoliceClient,
+        logger: Logger | None = None,
+        sinks: list[Sink] | None = None,
+        bloom_filter: BloomFilter | None = None,
+        checksum_repository: StopAndSearchChecksumRepository | None = None,
+        replace_months: bool = False,
     ):
         super().__init__(engine, police_client, logger)
+        self.bloom_filter = bloom_filter
         self.available_date_repository = AvailableDateRepository(engine, police_client)
+        self.aggregate_repository = AggregateRepository(engine, police_client)
+        self.sinks = sinks if sinks is not None else [PostgresSink(engine, self.logger)]
+        self.checksum_repository = checksum_repository
+        self.replace_months = replace_months
+        # The slices skipped by the checksums in the current run, which have no rows
+        # to refresh the aggregates of
+        self.unchanged_slices: set[tuple[str, str]] = set()
+        # The checksums of the slices written in full in the current run, stored once
+        # their aggregates are refreshed so a failed refresh is retried next run
+        self.written_checksums: dict[tuple[str, str], bytes] = {}
 
     async def store_stop_and_searches(
         self,
@@ -28,60 +76,431 @@ class StopAndSearchRepository(Repository):
         store_available_dates: bool = False,
         force_ids: list[str] | None = None,
     ) -> bool:
+        self.unchanged_slices.clear()
+        self.written_checksums.clear()
         if store_available_dates:
             success = await self.available_date_repository.store_available_dates(
                 from_datetime, to_datetime, force_ids
             )
             if not success:
                 return False
-        available_dates = await self.available_date_repository.get_available_dates(
-            from_datetime, to_datetime, with_forces=True
+        available_date_force_ids = (
+            await self.available_date_repository.get_available_date_force_ids(
+                from_datetime, to_datetime
+            )
         )
 
-        if available_dates:
+        if available_date_force_ids:
+            # Without any row counts the slices are still interleaved across forces
+            row_counts = await self.aggregate_repository.get_row_counts() or {}
+            available_date_force_ids = order_by_expected_rows(
+                available_date_force_ids, row_counts
+            )
             results = await gather(
                 *[
                     self.store_stop_and_search(
-                        available_date.year_month, force.id, from_datetime, to_datetime
+                        year_month, force_id, from_datetime, to_datetime
                     )
-                    for available_date in available_dates
-                    for force in available_date.forces
-                    if force.id
+                    for year_month, force_id in available_date_force_ids
                 ]
             )
-            return all(results)
+            # Only the slices written in this run are recounted in the silver layer
+            stored_slices = [
+                available_date_force_id
+                for available_date_force_id, success in zip(
+                    available_date_force_ids, results
+                )
+                if success and available_date_force_id not in self.unchanged_slices
+            ]
+            refreshed = await self.aggregate_repository.refresh_aggregates(
+                stored_slices
+            )
+            if refreshed:
+                await self.store_checksums(stored_slices)
+            return all(results) and refreshed
         return False
 
     async def store_stop_and_search(
         self, date: str, force_id: str, from_datetime: datetime, to_datetime: datetime
     ) -> bool:
+        with span("store_stop_and_search", force_id=force_id, year_month=date):
+            checksum = None
+            try:
+                if self.checksum_repository is None:
+                    (
+                        (with_location, with_location_quarantine),
+                        (without_location, without_location_quarantine),
+                    ) = await gather(
+                        self.police_client.get_stop_and_searches_and_quarantine(
+                            date, force_id, with_location=True
+                        ),
+                        self.police_client.get_stop_and_searches_and_quarantine(
+                            date, force_id, with_location=False
+                        ),
+                    )
+                else:
+                    responses = await gather(
+                        self.police_client.get_stop_and_searches_response(
+                            date, force_id, with_location=True
+                        ),
+                        self.police_client.get_stop_and_searches_response(
+                            date, force_id, with_location=False
+                        ),
+                    )
+                    with span("checksum"):
+                        checksum = get_checksum(
+                            response.content for response in responses
+                        )
+                    if checksum == await self.checksum_repository.get_checksum(
+                        force_id, date
+                    ):
+                        self.logger.info(
+                            f"Skipping StopAndSearches for '{force_id}' on date '{date}' as they have not changed since they were written."
+                        )
+                        self.unchanged_slices.add((date, force_id))
+                        return True
+                    (
+                        (with_location, with_location_quarantine),
+                        (without_location, without_location_quarantine),
+                    ) = [
+                        self.police_client.parse_stop_and_searches(
+                            response, date, force_id, has_location
+                        )
+                        for response, has_location in zip(responses, [True, False])
+                    ]
+            except HTTPStatusError:
+                return False
+
+            with span("filter_datetime"):
+                filtered_stop_and_searches = [
+                    stop_and_search
+                    for stop_and_search in with_location + without_location
+                    if from_datetime <= stop_and_search.datetime
+                    and stop_and_search.datetime <= to_datetime
+                ]
+
+            success = await self.write_stop_and_searches(
+                date,
+                force_id,
+                filtered_stop_and_searches,
+                with_location_quarantine + without_location_quarantine,
+                (from_datetime, to_datetime) if self.replace_months else None,
+            )
+            # A month cut short by the datetimes is not stored in full, so it is
+            # written again the next time rather than skipped.
+            if (
+                success
+                and checksum is not None
+                and len(filtered_stop_and_searches)
+                == len(with_location) + len(without_location)
+            ):
+                self.written_checksums[(date, force_id)] = checksum
+            return success
+
+    async def store_checksums(self, stored_slices: list[tuple[str, str]]) -> None:
+        """Stores the checksums of the slices written in full, which are only skipped
+        by later runs once their aggregates have been refreshed."""
+        if self.checksum_repository is None:
+            return
+        await gather(
+            *[
+                self.checksum_repository.store_checksum(
+                    force_id, date, self.written_checksums[(date, force_id)]
+                )
+                for date, force_id in stored_slices
+                if (date, force_id) in self.written_checksums
+            ]
+        )
+
+    async def write_stop_and_searches(
+        self,
+        date: str,
+        force_id: str,
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine],
+        replace_window: tuple[datetime, datetime] | None = None,
+    ) -> bool:
+        """Writes the stop and searches to every sink, or replaces the ones stored
+        in the window when it is given."""
+        content_hashes: list[bytes] = []
+        if self.bloom_filter is not None:
+            stop_and_search_count = len(stop_and_searches)
+            with stage("deduplication"), span("deduplication"):
+                new_stop_and_searches, content_hashes = filter_ingested(
+                    self.bloom_filter, stop_and_searches
+                )
+            # The rows already ingested are deleted by a replace, so they are
+            # written again and only the hashes of the new ones are added
+            if replace_window is None:
+                stop_and_searches = new_stop_and_searches
+            skipped = stop_and_search_count - len(stop_and_searches)
+            if skipped:
+                self.logger.info(
+                    f"Skipping {skipped} StopAndSearches already ingested for '{force_id}' on date '{date}'."
+                )
+
+        with (
+            stage("write"),
+            span("write", rows=len(stop_and_searches), quarantined=len(quarantine)),
+        ):
+            results = await gather(
+                *[
+                    sink.write(force_id, date, stop_and_searches, quarantine)
+                    if replace_window is None
+                    else sink.replace(
+                        force_id, date, replace_window, stop_and_searches, quarantine
+                    )
+                    for sink in self.sinks
+                ]
+            )
+        # The hashes are only added once every sink has the rows, so a failed month
+        # is written again in full the next time it is ingested
+        if self.bloom_filter is not None and all(results):
+            for content_hash in content_hashes:
+                self.bloom_filter.add(content_hash)
+            self.bloom_filter.flush()
+            if self.bloom_filter.is_full:
+                self.logger.warning(
+                    f"The Bloom filter '{self.bloom_filter.path}' holds more than the {self.bloom_filter.capacity} rows it was sized for, rebuild it with a larger expected row count."
+                )
+        return all(results)
+
+    async def reprocess_quarantine(self, force_ids: list[str] | None = None) -> bool:
+        """Validates the quarantined stop and searches again, once the model has been
+        fixed, and writes each force and month to the sinks without fetching it from
+        the Police API. The records that are still rejected stay in the quarantine
+        with their new errors."""
+        table = StopAndSearchQuarantine.__table__  # type: ignore[attr-defined]
+        query = select(StopAndSearchQuarantine).order_by(
+            table.c.ForceId, table.c.YearMonth, table.c.Id
+        )
+        if force_ids:
+            query = query.where(table.c.ForceId.in_(force_ids))
         try:
-            with_location, without_location = await gather(
-                self.police_client.get_stop_and_searches(
-                    date, force_id, with_location=True
-                ),
-                self.police_client.get_stop_and_searches(
-                    date, force_id, with_location=False
-                ),
+            with Session(self.engine) as session:
+                quarantine = list(session.exec(query).scalars().all())
+        except SQLAlchemyError as error:
+            self.logger.warning(
+                "Cannot get the quarantined StopAndSearches from the database.",
+                exc_info=error,
             )
-        except HTTPStatusError:
             return False
 
-        filtered_stop_and_searches = [
-            stop_and_search
-            for stop_and_search in with_location + without_location
-            if from_datetime <= stop_and_search.datetime
-            and stop_and_search.datetime <= to_datetime
+        slices: dict[tuple[str, str], list[StopAndSearchQuarantine]] = defaultdict(list)
+        for record in quarantine:
+            slices[(record.year_month, record.force_id)].append(record)
+        results = await gather(
+            *[
+                self.reprocess_quarantined_slice(year_month, force_id, records)
+                for (year_month, force_id), records in slices.items()
+            ]
+        )
+        reprocessed_slices = [
+            slice for slice, success in zip(slices, results) if success
         ]
+        refreshed = await self.aggregate_repository.refresh_aggregates(
+            reprocessed_slices
+        )
+        return all(results) and refreshed
 
-        with Session(self.engine) as session:
+    async def reprocess_quarantined_slice(
+        self, date: str, force_id: str, quarantine: list[StopAndSearchQuarantine]
+    ) -> bool:
+        stop_and_searches: list[StopAndSearch] = []
+        still_quarantined: list[StopAndSearchQuarantine] = []
+        for record in quarantine:
             try:
-                session.add_all(filtered_stop_and_searches)
-                session.commit()
-            except SQLAlchemyError as error:
-                self.logger.warning(
-                    f"Cannot store StopAndSearches in the database for '{force_id}' on date '{date}'.",
-                    exc_info=error,
+                # The payload is the record the Police API returned, which the
+                # validators would otherwise write to
+                stop_and_searches.append(
+                    StopAndSearch.model_validate(
+                        {**record.payload, "force_id": force_id}
+                    )
                 )
-                return False
+            except ValidationError as error:
+                still_quarantined.append(
+                    StopAndSearchQuarantine(
+                        force_id=force_id,
+                        year_month=date,
+                        with_location=record.with_location,
+                        payload=record.payload,
+                        errors=get_errors(error),
+                        quarantined_at=record.quarantined_at,
+                    )
+                )
+        self.logger.info(
+            f"Reprocessed {len(quarantine)} quarantined StopAndSearches for '{force_id}' on date '{date}', {len(still_quarantined)} still fail validation."
+        )
+        return await self.write_stop_and_searches(
+            date, force_id, stop_and_searches, still_quarantined
+        )
+
+    async def rebuild_bloom_filter(
+        self, path: Path, expected_rows: int, batch_size: int = 10_000
+    ) -> bool:
+        """Replaces the Bloom filter at the path with one sized for the expected rows
+        that holds the content hashes of every stop and search in the database. The
+        new filter is built in a temporary file, so the old one is kept if the
+        rebuild fails."""
+        temporary_path = path.with_name(f".{path.name}.tmp")
+        temporary_path.unlink(missing_ok=True)
+        bloom_filter = BloomFilter(temporary_path, expected_rows)
+        stop_and_search = StopAndSearch.__table__  # type: ignore[attr-defined]
+        try:
+            with self.engine.connect().execution_options(
+                yield_per=batch_size
+            ) as connection:
+                result = connection.execute(
+                    select(*[stop_and_search.c[column] for column in CONTENT_COLUMNS])
+                )
+                for batch in result.partitions():
+                    for row in batch:
+                        bloom_filter.add(get_content_hash(row))
+        except SQLAlchemyError as error:
+            self.logger.warning(
+                f"Cannot rebuild the Bloom filter '{path}' from the database.",
+                exc_info=error,
+            )
+            bloom_filter.close()
+            temporary_path.unlink()
+            return False
+        bloom_filter.close()
+        if self.bloom_filter is not None:
+            self.bloom_filter.close()
+        temporary_path.replace(path)
+        self.bloom_filter = BloomFilter(path, expected_rows)
+        self.logger.info(
+            f"Rebuilt the Bloom filter '{path}' with {self.bloom_filter.row_count} StopAndSearches."
+        )
         return True
+
+    async def stream_stop_and_searches(
+        self,
+        from_datetime: datetime,
+        to_datetime: datetime,
+        force_ids: list[str] | None = None,
+        columns: Iterable[str] = STREAMED_COLUMNS,
+        batch_size: int = 10_000,
+    ) -> AsyncIterator[list[Row]]:
+        """Yields batches of StopAndSearch rows ordered by (Datetime, Id), holding the
+        Id, the Datetime and the given columns.
+
+        Each batch is read by its own query in a thread, so the event loop is not
+        blocked, and starts after the last (Datetime, Id) seen. No connection is held
+        while a batch is yielded, so neither memory nor the length of a transaction
+        grows with the number of rows and a consumer that stops early leaves nothing
+        open. Consumers that stop early should still close the generator, with
+        contextlib.aclosing, so it is not left to the garbage collector."""
+        stop_and_search = StopAndSearch.__table__  # type: ignore[attr-defined]
+        key = tuple_(stop_and_search.c.Datetime, stop_and_search.c.Id)
+        conditions = [
+            from_datetime <= stop_and_search.c.Datetime,
+            stop_and_search.c.Datetime <= to_datetime,
+        ]
+        if force_ids:
+            conditions.append(stop_and_search.c.ForceId.in_(force_ids))
+        query = (
+            select(
+                *[
+                    stop_and_search.c[column]
+                    for column in dict.fromkeys(["Id", "Datetime", *columns])
+                ]
+            )
+            .order_by(stop_and_search.c.Datetime, stop_and_search.c.Id)
+            .limit(batch_size)
+        )
+
+        last_key: tuple[datetime, int] | None = None
+        while True:
+            batch_conditions = (
+                conditions if last_key is None else conditions + [key > last_key]
+            )
+            try:
+                batch = await to_thread(
+                    self.read_rows, query.where(and_(*batch_conditions))
+                )
+            except SQLAlchemyError:
+                self.logger.exception(
+                    "Could not read StopAndSearches from the database between "
+                    f"'{from_datetime}' and '{to_datetime}'."
+                )
+                raise
+            if batch:
+                last_key = (batch[-1].Datetime, batch[-1].Id)
+                yield batch
+            if len(batch) < batch_size:
+                return
+
+    def read_rows(self, query: Select) -> list[Row]:
+        with self.engine.connect() as connection:
+            return list(connection.execute(query).all())
+
+
+def order_by_expected_rows(
+    slices: list[tuple[str, str]], row_counts: dict[tuple[str, str], int]
+) -> list[tuple[str, str]]:
+    """Orders the (year_month, force_id) slices largest first, so a large force and
+    month is requested early instead of stretching the end of the run.
+
+    A slice is expected to have the rows counted for it before, or else the average
+    month of its force. A force without any counts is put first as it could be the
+    largest. Slices expected to be the same size are interleaved across forces."""
+    force_counts: defaultdict[str, list[int]] = defaultdict(list)
+    for (_, force_id), count in row_counts.items():
+        force_counts[force_id].append(count)
+    force_averages = {
+        force_id: sum(counts) / len(counts) for force_id, counts in force_counts.items()
+    }
+    force_ranks: defaultdict[str, int] = defaultdict(int)
+    keys = []
+    for index, (year_month, force_id) in enumerate(slices):
+        expected_rows = row_counts.get(
+            (year_month, force_id), force_averages.get(force_id, inf)
+        )
+        keys.append((-expected_rows, force_ranks[force_id], index))
+        force_ranks[force_id] += 1
+    return [slices[index] for _, _, index in sorted(keys)]
+
+
+def filter_ingested(
+    bloom_filter: BloomFilter, stop_and_searches: list[StopAndSearch]
+) -> tuple[list[StopAndSearch], list[bytes]]:
+    """Returns the stop and searches that are not in the Bloom filter and their
+    content hashes. Identical stop and searches in the same month are all kept, as
+    they are only filtered out against the months ingested before."""
+    new_stop_and_searches = []
+    content_hashes = []
+    for stop_and_search in stop_and_searches:
+        content_hash = get_content_hash(
+            getattr(stop_and_search, key) for key in CONTENT_COLUMNS.values()
+        )
+        if content_hash not in bloom_filter:
+            new_stop_and_searches.append(stop_and_search)
+            content_hashes.append(content_hash)
+    return new_stop_and_searches, content_hashes
+
+
+def get_content_hash(values: Iterable[Any]) -> bytes:
+    """Returns a 16 byte hash of the values of a stop and search in CONTENT_COLUMNS
+    order. Datetimes are hashed in UTC, so a row read back from Postgres in another
+    time zone hashes the same as the model it was written from."""
+    content = "\x1f".join(
+        "\x00"
+        if value is None
+        else value.astimezone(UTC).isoformat()
+        if isinstance(value, datetime)
+        else str(value)
+        for value in values
+    )
+    return blake2b(content.encode(), digest_size=16).digest()
+
+
+def get_checksum(contents: Iterable[bytes]) -> bytes:
+    """Returns a 32 byte checksum of the response contents of a force and month, in
+    order. Each content is prefixed with its length, so moving bytes from one
+    response to the other changes the checksum."""
+    checksum = blake2b(digest_size=32)
+    for content in contents:
+        checksum.update(len(content).to_bytes(8))
+        checksum.update(content)
+    return checksum.digest()
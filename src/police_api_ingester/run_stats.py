@@ -0,0 +1,83 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from time import perf_counter
+from typing import Any
+
+# Only the standard library is imported here, the commands import this module when
+# the CLI is built.
+
+
+@dataclass
+class RunStats:
+    """How a single run of a command performed. Stage times are summed over the
+    tasks that run concurrently, so they can add up to more than the run took."""
+
+    command: str
+    arguments: dict[str, Any]
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    ended_at: datetime | None = None
+    error: str | None = None
+    requests_by_status: Counter[str] = field(default_factory=Counter)
+    retries: int = 0
+    limiter_wait_seconds: float = 0.0
+    rows_parsed: int = 0
+    rows_rejected: int = 0
+    rows_written: Counter[str] = field(default_factory=Counter)
+    stage_seconds: defaultdict[str, float] = field(
+        default_factory=lambda: defaultdict(float)
+    )
+
+
+# The tasks of a run copy the context they are created in, so they all record into
+# the RunStats of the run. Nothing is recorded outside of a run.
+RUN_STATS: ContextVar[RunStats | None] = ContextVar("RUN_STATS", default=None)
+
+
+def record_request(status: str, seconds: float) -> None:
+    """Records a request to the Police API by its status code, or 'timeout'."""
+    run_stats = RUN_STATS.get()
+    if run_stats is not None:
+        run_stats.requests_by_status[status] += 1
+        run_stats.stage_seconds["request"] += seconds
+
+
+def record_retry() -> None:
+    run_stats = RUN_STATS.get()
+    if run_stats is not None:
+        run_stats.retries += 1
+
+
+def record_limiter_wait(seconds: float) -> None:
+    run_stats = RUN_STATS.get()
+    if run_stats is not None:
+        run_stats.limiter_wait_seconds += seconds
+
+
+def record_validation(parsed: int, rejected: int, seconds: float) -> None:
+    run_stats = RUN_STATS.get()
+    if run_stats is not None:
+        run_stats.rows_parsed += parsed
+        run_stats.rows_rejected += rejected
+        run_stats.stage_seconds["validation"] += seconds
+
+
+def record_rows_written(table: str, rows: int) -> None:
+    run_stats = RUN_STATS.get()
+    if run_stats is not None:
+        run_stats.rows_written[table] += rows
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Adds the time taken by the block to the stage of the run."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        run_stats = RUN_STATS.get()
+        if run_stats is not None:
+            run_stats.stage_seconds[name] += perf_counter() - start
@@ -0,0 +1,5 @@
+from police_api_ingester.sinks.lookup_cache import LookupCache as LookupCache
+from police_api_ingester.sinks.parquet_sink import ParquetSink as ParquetSink
+from police_api_ingester.sinks.postgres_sink import PostgresSink as PostgresSink
+from police_api_ingester.sinks.silver_sink import SilverSink as SilverSink
+from police_api_ingester.sinks.sink import Sink as Sink
@@ -0,0 +1,77 @@
+from collections.abc import Iterable
+
+from sqlalchemy import Engine, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import SQLModel
+
+from police_api_ingester.repositories.repository import unnest
+
+
+class LookupCache:
+    """Interns the values of the silver lookup tables in process, so a value costs a
+    round trip the first time it is seen rather than once per row.
+
+    Every column of a lookup table other than Id is part of its value, and the
+    cache only holds ids that have been committed."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.ids: dict[type[SQLModel], dict[tuple, int]] = {}
+
+    def resolve(
+        self, lookup: type[SQLModel], values: Iterable[tuple]
+    ) -> dict[tuple, int]:
+        """Returns the ids of the lookup, including the values not seen before."""
+        ids = self.ids.setdefault(lookup, {})
+        missing = {value for value in values if value not in ids}
+        if missing:
+            ids.update(self.get_or_create(lookup, missing))
+        return ids
+
+    def get_or_create(
+        self, lookup: type[SQLModel], values: set[tuple]
+    ) -> dict[tuple, int]:
+        table = lookup.__table__  # type: ignore[attr-defined]
+        columns = [column for column in table.c if column.name != "Id"]
+        key = tuple_(*columns)
+        with self.engine.begin() as connection:
+            ids = {
+                tuple(row[1:]): row[0]
+                for row in connection.execute(
+                    select(table.c.Id, *columns).where(key.in_(list(values)))
+                )
+            }
+            new_values = list(values - ids.keys())
+            if new_values:
+                # Only values that do not exist are inserted, so the identity is not
+                # used up by conflicts unless another ingester inserts them first.
+                inserted = connection.execute(
+                    insert(table)
+                    .from_select(
+                        [column.name for column in columns],
+                        select(
+                            *[
+                                unnest(
+                                    [value[index] for value in new_values], column.type
+                                )
+                                for index, column in enumerate(columns)
+                            ]
+                        ),
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(table.c.Id, *columns)
+                )
+                ids.update({tuple(row[1:]): row[0] for row in inserted})
+            conflicted_values = values - ids.keys()
+            if conflicted_values:
+                ids.update(
+                    {
+                        tuple(row[1:]): row[0]
+                        for row in connection.execute(
+                            select(table.c.Id, *columns).where(
+                                key.in_(list(conflicted_values))
+                            )
+                        )
+                    }
+                )
+        return ids
@@ -0,0 +1,119 @@
+from logging import Logger
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Boolean, DateTime, Integer, SmallInteger, String, inspect
+from sqlalchemy.types import TypeEngine
+
+from police_api_ingester.metrics import ROWS_WRITTEN
+from police_api_ingester.models import StopAndSearch, StopAndSearchQuarantine
+from police_api_ingester.run_stats import record_rows_written
+from police_api_ingester.sinks.sink import Sink
+from police_api_ingester.tracing import span
+
+if TYPE_CHECKING:
+    from pyarrow import DataType
+
+# Maps the model attributes to their columns, the partition columns are encoded in
+# the directory names rather than the files. The columns Postgres generates from the
+# Datetime are left out, as YearMonth is already a partition, and so is the
+# SourceYearMonth, which is the month of the partition.
+COLUMNS = {
+    attribute.key: attribute.columns[0]
+    for attribute in inspect(StopAndSearch).column_attrs
+    if attribute.columns[0].name not in ("Id", "ForceId", "SourceYearMonth")
+    and attribute.columns[0].computed is None
+}
+
+
+class ParquetSink(Sink):
+    """Writes a Parquet file per force and month, partitioned as
+    `ForceId=<force_id>/YearMonth=<year_month>/` so the directory can be read as a
+    hive partitioned dataset."""
+
+    def __init__(
+        self,
+        directory: Path,
+        compression: str = "zstd",
+        logger: Logger | None = None,
+    ):
+        # pyarrow is an optional dependency and slow to import
+        try:
+            import pyarrow as pa
+        except ImportError as error:
+            raise ImportError(
+                "pyarrow is needed to write Parquet files, "
+                "install it with 'pip install police_api_ingester[parquet]'."
+            ) from error
+        super().__init__(logger)
+        self.directory = directory
+        self.compression = compression
+        self.schema = pa.schema(
+            [
+                pa.field(column.name, get_arrow_type(column.type), column.nullable)
+                for column in COLUMNS.values()
+            ]
+        )
+
+    async def write(
+        self,
+        force_id: str,
+        year_month: str,
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None = None,
+    ) -> bool:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        record_batch = pa.RecordBatch.from_pydict(
+            {
+                column.name: [
+                    getattr(stop_and_search, key)
+                    for stop_and_search in stop_and_searches
+                ]
+                for key, column in COLUMNS.items()
+            },
+            schema=self.schema,
+        )
+        partition = self.directory / f"ForceId={force_id}" / f"YearMonth={year_month}"
+        path = partition / "part-0.parquet"
+        # Written to a temporary file first so readers never see a partial month
+        temporary_path = partition / ".part-0.parquet.tmp"
+        try:
+            partition.mkdir(parents=True, exist_ok=True)
+            with (
+                span("write_parquet"),
+                pq.ParquetWriter(
+                    temporary_path, self.schema, compression=self.compression
+                ) as writer,
+            ):
+                writer.write_batch(record_batch)
+            temporary_path.replace(path)
+        except (OSError, pa.ArrowException) as error:
+            self.logger.warning(
+                f"Cannot write StopAndSearches to '{path}' for '{force_id}' on date '{year_month}'.",
+                exc_info=error,
+            )
+            return False
+        ROWS_WRITTEN.labels("StopAndSearchParquet").inc(len(stop_and_searches))
+        record_rows_written("StopAndSearchParquet", len(stop_and_searches))
+        return True
+
+
+def get_arrow_type(column_type: TypeEngine) -> "DataType":
+    """Returns the Arrow type a column is written as, raising a TypeError for a
+    column type that has no mapping rather than writing it as a string."""
+    import pyarrow as pa
+
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    # SmallInteger subclasses Integer so it is checked first
+    if isinstance(column_type, SmallInteger):
+        return pa.int16()
+    if isinstance(column_type, Integer):
+        return pa.int32()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column_type, String):
+        return pa.string()
+    raise TypeError(f"Cannot write a column of type '{column_type}' to Parquet.")
@@ -0,0 +1,248 @@
+from datetime import datetime
+from logging import Logger
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Engine,
+    MetaData,
+    Table,
+    delete,
+    inspect,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from police_api_ingester.metrics import COMMIT_LATENCY, ROWS_WRITTEN
+from police_api_ingester.models import StopAndSearch, StopAndSearchQuarantine
+from police_api_ingester.repositories.repository import unnest
+from police_api_ingester.run_stats import record_rows_written
+from police_api_ingester.sinks.replace import get_wal_bytes, get_wal_lsn, report_replace
+from police_api_ingester.sinks.sink import Sink
+from police_api_ingester.tracing import span
+
+if TYPE_CHECKING:
+    from police_api_ingester.sinks.silver_sink import SilverSink
+
+# Months replaced with at least this many stop and searches are loaded into a
+# staging table before the old rows are deleted, so the rows are only locked for as
+# long as it takes to copy them across. Binding each column as one array is also
+# about twice as fast as the ORM inserts from a thousand rows.
+STAGING_ROWS = 1_000
+# Maps the columns that are inserted to their model attributes, the Id and the
+# columns Postgres generates are left out.
+INSERTED_COLUMNS = {
+    attribute.columns[0].name: attribute.key
+    for attribute in inspect(StopAndSearch).column_attrs
+    if attribute.columns[0].name != "Id" and attribute.columns[0].computed is None
+}
+
+
+class PostgresSink(Sink):
+    """Writes the stop and searches to bronze.StopAndSearch. Given a SilverSink, they
+    are written to silver.StopAndSearch in the same transaction, so a month that
+    fails leaves neither table changed and can be written again without
+    duplicating either."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        logger: Logger | None = None,
+        staging_rows: int = STAGING_ROWS,
+        silver_sink: "SilverSink | None" = None,
+    ):
+        super().__init__(logger)
+        self.engine = engine
+        self.staging_rows = staging_rows
+        self.silver_sink = silver_sink
+
+    async def write(
+        self,
+        force_id: str,
+        year_month: str,
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None = None,
+    ) -> bool:
+        set_source_year_month(stop_and_searches, year_month)
+        # Other sinks read the same models after the commit so they are not expired
+        with Session(self.engine, expire_on_commit=False) as session:
+            try:
+                silver_columns = self.encode_silver(
+                    force_id, year_month, stop_and_searches
+                )
+                delete_quarantine(session, force_id, year_month)
+                session.add_all([*stop_and_searches, *(quarantine or [])])
+                if self.silver_sink is not None and silver_columns is not None:
+                    self.silver_sink.insert_columns(
+                        session.connection(), silver_columns
+                    )
+                with (
+                    COMMIT_LATENCY.labels("StopAndSearch").time(),
+                    span("commit", table="StopAndSearch"),
+                ):
+                    session.commit()
+            except SQLAlchemyError as error:
+                self.logger.warning(
+                    f"Cannot store StopAndSearches in the database for '{force_id}' on date '{year_month}'.",
+                    exc_info=error,
+                )
+                return False
+        self.record_rows_written(stop_and_searches, quarantine)
+        return True
+
+    async def replace(
+        self,
+        force_id: str,
+        year_month: str,
+        window: tuple[datetime, datetime],
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None = None,
+    ) -> bool:
+        """Deletes the stop and searches returned for the force and month in the
+        window, through the (ForceId, SourceYearMonth) index, and inserts the new
+        ones in the same transaction. The WAL it writes and how long the rows are
+        locked for, in silver as well when it is written, are logged."""
+        table = StopAndSearch.__table__  # type: ignore[attr-defined]
+        staged = len(stop_and_searches) >= self.staging_rows
+        set_source_year_month(stop_and_searches, year_month)
+        with Session(self.engine, expire_on_commit=False) as session:
+            try:
+                # The lookup keys are resolved before the old rows are locked
+                silver_columns = self.encode_silver(
+                    force_id, year_month, stop_and_searches
+                )
+                connection = session.connection()
+                start_lsn = get_wal_lsn(connection)
+                if staged:
+                    with span("stage", rows=len(stop_and_searches)):
+                        staging_table = create_staging_table(
+                            connection, stop_and_searches
+                        )
+                lock_start = perf_counter()
+                deleted = session.exec(
+                    delete(table).where(
+                        table.c.ForceId == force_id,
+                        table.c.SourceYearMonth == year_month,
+                        table.c.Datetime.between(*window),
+                    )
+                ).rowcount
+                delete_quarantine(session, force_id, year_month)
+                if staged:
+                    connection.execute(
+                        insert(table).from_select(
+                            list(INSERTED_COLUMNS), select(staging_table)
+                        )
+                    )
+                    session.add_all(quarantine or [])
+                else:
+                    session.add_all([*stop_and_searches, *(quarantine or [])])
+                if self.silver_sink is not None:
+                    self.silver_sink.delete_month(
+                        connection, force_id, year_month, window
+                    )
+                    if silver_columns is not None:
+                        self.silver_sink.insert_columns(connection, silver_columns)
+                with (
+                    COMMIT_LATENCY.labels("StopAndSearch").time(),
+                    span("commit", table="StopAndSearch"),
+                ):
+                    session.commit()
+                lock_seconds = perf_counter() - lock_start
+                wal_bytes = get_wal_bytes(session.connection(), start_lsn)
+            except SQLAlchemyError as error:
+                self.logger.warning(
+                    f"Cannot replace StopAndSearches in the database for '{force_id}' on date '{year_month}'.",
+                    exc_info=error,
+                )
+                return False
+        report_replace(
+            self.logger,
+            "StopAndSearch",
+            force_id,
+            year_month,
+            deleted,
+            len(stop_and_searches),
+            wal_bytes,
+            lock_seconds,
+        )
+        self.record_rows_written(stop_and_searches, quarantine)
+        return True
+
+    def encode_silver(
+        self, force_id: str, year_month: str, stop_and_searches: list[StopAndSearch]
+    ) -> dict[str, list] | None:
+        if self.silver_sink is None or not stop_and_searches:
+            return None
+        return self.silver_sink.encode(force_id, year_month, stop_and_searches)
+
+    def record_rows_written(
+        self,
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None,
+    ) -> None:
+        ROWS_WRITTEN.labels("StopAndSearch").inc(len(stop_and_searches))
+        record_rows_written("StopAndSearch", len(stop_and_searches))
+        if self.silver_sink is not None:
+            ROWS_WRITTEN.labels("SilverStopAndSearch").inc(len(stop_and_searches))
+            record_rows_written("SilverStopAndSearch", len(stop_and_searches))
+        if quarantine:
+            ROWS_WRITTEN.labels("StopAndSearchQuarantine").inc(len(quarantine))
+            record_rows_written("StopAndSearchQuarantine", len(quarantine))
+
+
+def set_source_year_month(
+    stop_and_searches: list[StopAndSearch], year_month: str
+) -> None:
+    """Records the month the stop and searches were returned for, which the Police
+    API does not always file under the UTC month of their Datetime."""
+    for stop_and_search in stop_and_searches:
+        stop_and_search.source_year_month = year_month
+
+
+def delete_quarantine(session: Session, force_id: str, year_month: str) -> None:
+    """The quarantine of a month is replaced by the records rejected by its latest
+    write, in the same transaction as the valid rows."""
+    session.exec(
+        delete(StopAndSearchQuarantine).where(
+            StopAndSearchQuarantine.force_id == force_id,
+            StopAndSearchQuarantine.year_month == year_month,
+        )
+    )
+
+
+def create_staging_table(
+    connection: Connection, stop_and_searches: list[StopAndSearch]
+) -> Table:
+    """Loads the stop and searches into a temporary table that is dropped when the
+    transaction commits, binding each column as a single array."""
+    table = StopAndSearch.__table__  # type: ignore[attr-defined]
+    staging_table = Table(
+        "StopAndSearchStaging",
+        MetaData(),
+        *[Column(column, table.c[column].type) for column in INSERTED_COLUMNS],
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+    staging_table.create(connection)
+    connection.execute(
+        insert(staging_table).from_select(
+            list(INSERTED_COLUMNS),
+            select(
+                *[
+                    unnest(
+                        [
+                            getattr(stop_and_search, attribute)
+                            for stop_and_search in stop_and_searches
+                        ],
+                        table.c[column].type,
+                    ).label(column)
+                    for column, attribute in INSERTED_COLUMNS.items()
+                ]
+            ),
+        )
+    )
+    return staging_table
@@ -0,0 +1,37 @@
+from logging import Logger
+
+from sqlalchemy import Connection, func, select
+
+from police_api_ingester.metrics import REPLACE_LOCK_DURATION, REPLACE_WAL_BYTES
+
+
+def get_wal_lsn(connection: Connection) -> str:
+    """Returns the location the server will insert its next WAL record at."""
+    return connection.execute(select(func.pg_current_wal_insert_lsn())).scalar_one()
+
+
+def get_wal_bytes(connection: Connection, start_lsn: str) -> int:
+    """Returns the WAL the server has inserted since the location. It counts the
+    WAL of every session, so it includes any writes made alongside the replace."""
+    return int(
+        connection.execute(
+            select(func.pg_wal_lsn_diff(func.pg_current_wal_insert_lsn(), start_lsn))
+        ).scalar_one()
+    )
+
+
+def report_replace(
+    logger: Logger,
+    table: str,
+    force_id: str,
+    year_month: str,
+    deleted: int,
+    inserted: int,
+    wal_bytes: int,
+    lock_seconds: float,
+) -> None:
+    REPLACE_WAL_BYTES.labels(table).observe(wal_bytes)
+    REPLACE_LOCK_DURATION.labels(table).observe(lock_seconds)
+    logger.info(
+        f"Replaced {deleted} rows of {table} with {inserted} for '{force_id}' on date '{year_month}', writing {wal_bytes} bytes of WAL with the rows locked for {lock_seconds * 1000:.1f} ms."
+    )
@@ -0,0 +1,233 @@
+from datetime import datetime
+from logging import Logger
+from time import perf_counter
+
+from sqlalchemy import Connection, Engine, delete, inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import SQLModel
+
+from police_api_ingester.metrics import COMMIT_LATENCY, ROWS_WRITTEN
+from police_api_ingester.models import (
+    AgeRange,
+    Ethnicity,
+    Gender,
+    Legislation,
+    ObjectOfSearch,
+    Outcome,
+    SearchType,
+    SilverStopAndSearch,
+    StopAndSearch,
+    StopAndSearchQuarantine,
+)
+from police_api_ingester.repositories.repository import unnest
+from police_api_ingester.run_stats import record_rows_written
+from police_api_ingester.sinks.lookup_cache import LookupCache
+from police_api_ingester.sinks.replace import get_wal_bytes, get_wal_lsn, report_replace
+from police_api_ingester.sinks.sink import Sink
+from police_api_ingester.tracing import span
+
+# Maps the encoded columns to their lookup and the StopAndSearch attributes that
+# make up the value, in the order of the lookup's columns.
+ENCODED_COLUMNS: dict[str, tuple[type[SQLModel], tuple[str, ...]]] = {
+    "TypeId": (SearchType, ("type",)),
+    "GenderId": (Gender, ("gender",)),
+    "AgeRangeId": (AgeRange, ("age_range",)),
+    "SelfDefinedEthnicityId": (Ethnicity, ("self_defined_ethnicity",)),
+    "OfficerDefinedEthnicityId": (Ethnicity, ("officer_defined_ethnicity",)),
+    "LegislationId": (Legislation, ("legislation",)),
+    "ObjectOfSearchId": (ObjectOfSearch, ("object_of_search",)),
+    "OutcomeId": (Outcome, ("outcome_id", "outcome_name")),
+}
+# The columns copied as they are, the ForceId and SourceYearMonth come from the force
+# and month being written
+COPIED_COLUMNS = {
+    attribute.columns[0].name: attribute.key
+    for attribute in inspect(StopAndSearch).column_attrs
+    if attribute.columns[0].name in SilverStopAndSearch.__table__.c  # type: ignore[attr-defined]
+    and attribute.columns[0].name
+    not in ("Id", "ForceId", "SourceYearMonth", *ENCODED_COLUMNS)
+}
+
+
+class SilverSink(Sink):
+    """Writes the stop and searches to silver.StopAndSearch, replacing the repeated
+    strings with SMALLINT keys of the lookup tables.
+
+    On its own it writes silver in a transaction of its own. Given to a
+    PostgresSink, the silver rows are written in the bronze transaction instead, so
+    a month is stored in both or neither, which is how the commands use it."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        lookup_cache: LookupCache | None = None,
+        logger: Logger | None = None,
+    ):
+        super().__init__(logger)
+        self.engine = engine
+        self.lookup_cache = lookup_cache or LookupCache(engine)
+
+    async def write(
+        self,
+        force_id: str,
+        year_month: str,
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None = None,
+    ) -> bool:
+        if not stop_and_searches:
+            return True
+
+        try:
+            columns = self.encode(force_id, year_month, stop_and_searches)
+            with (
+                COMMIT_LATENCY.labels("SilverStopAndSearch").time(),
+                span("commit", table="SilverStopAndSearch"),
+                self.engine.begin() as connection,
+            ):
+                self.insert_columns(connection, columns)
+        except SQLAlchemyError as error:
+            self.logger.warning(
+                f"Cannot store silver StopAndSearches in the database for '{force_id}' on date '{year_month}'.",
+                exc_info=error,
+            )
+            return False
+        ROWS_WRITTEN.labels("SilverStopAndSearch").inc(len(stop_and_searches))
+        record_rows_written("SilverStopAndSearch", len(stop_and_searches))
+        return True
+
+    async def replace(
+        self,
+        force_id: str,
+        year_month: str,
+        window: tuple[datetime, datetime],
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None = None,
+    ) -> bool:
+        """Deletes the silver stop and searches returned for the force and month in
+        the window and inserts the new ones in the same transaction, logging the WAL
+        it writes and how long the rows are locked for."""
+        try:
+            # The lookup keys are resolved before the old rows are locked
+            columns = self.encode(force_id, year_month, stop_and_searches)
+            with self.engine.connect() as connection:
+                start_lsn = get_wal_lsn(connection)
+                lock_start = perf_counter()
+                deleted = self.delete_month(connection, force_id, year_month, window)
+                if stop_and_searches:
+                    self.insert_columns(connection, columns)
+                with (
+                    COMMIT_LATENCY.labels("SilverStopAndSearch").time(),
+                    span("commit", table="SilverStopAndSearch"),
+                ):
+                    connection.commit()
+                lock_seconds = perf_counter() - lock_start
+                wal_bytes = get_wal_bytes(connection, start_lsn)
+        except SQLAlchemyError as error:
+            self.logger.warning(
+                f"Cannot replace silver StopAndSearches in the database for '{force_id}' on date '{year_month}'.",
+                exc_info=error,
+            )
+            return False
+        report_replace(
+            self.logger,
+            "SilverStopAndSearch",
+            force_id,
+            year_month,
+            deleted,
+            len(stop_and_searches),
+            wal_bytes,
+            lock_seconds,
+        )
+        ROWS_WRITTEN.labels("SilverStopAndSearch").inc(len(stop_and_searches))
+        record_rows_written("SilverStopAndSearch", len(stop_and_searches))
+        return True
+
+    def encode(
+        self, force_id: str, year_month: str, stop_and_searches: list[StopAndSearch]
+    ) -> dict[str, list]:
+        values = get_lookup_values(stop_and_searches)
+        ids = {
+            lookup: self.lookup_cache.resolve(lookup, lookup_values)
+            for lookup, lookup_values in values.items()
+        }
+        return encode(force_id, year_month, stop_and_searches, ids)
+
+    def delete_month(
+        self,
+        connection: Connection,
+        force_id: str,
+        year_month: str,
+        window: tuple[datetime, datetime],
+    ) -> int:
+        """Deletes the silver stop and searches returned for the force and month in
+        the inclusive window, returning how many were deleted."""
+        table = SilverStopAndSearch.__table__  # type: ignore[attr-defined]
+        return connection.execute(
+            delete(table).where(
+                table.c.ForceId == force_id,
+                table.c.SourceYearMonth == year_month,
+                table.c.Datetime.between(*window),
+            )
+        ).rowcount
+
+    def insert_columns(self, connection: Connection, columns: dict[str, list]) -> None:
+        table = SilverStopAndSearch.__table__  # type: ignore[attr-defined]
+        connection.execute(
+            insert(table).from_select(
+                list(columns),
+                select(
+                    *[
+                        unnest(column_values, table.c[column].type).label(column)
+                        for column, column_values in columns.items()
+                    ]
+                ),
+            )
+        )
+
+
+def get_lookup_values(
+    stop_and_searches: list[StopAndSearch],
+) -> dict[type[SQLModel], set[tuple]]:
+    values: dict[type[SQLModel], set[tuple]] = {}
+    for lookup, attributes in ENCODED_COLUMNS.values():
+        lookup_values = values.setdefault(lookup, set())
+        for stop_and_search in stop_and_searches:
+            value = get_value(stop_and_search, attributes)
+            if value is not None:
+                lookup_values.add(value)
+    return values
+
+
+def get_value(
+    stop_and_search: StopAndSearch, attributes: tuple[str, ...]
+) -> tuple | None:
+    value = tuple(getattr(stop_and_search, attribute) for attribute in attributes)
+    return None if value[0] is None else value
+
+
+def encode(
+    force_id: str,
+    year_month: str,
+    stop_and_searches: list[StopAndSearch],
+    ids: dict[type[SQLModel], dict[tuple, int]],
+) -> dict[str, list]:
+    """Returns the values of each silver column, so they can be bound as arrays."""
+    columns: dict[str, list] = {
+        "ForceId": [force_id] * len(stop_and_searches),
+        "SourceYearMonth": [year_month] * len(stop_and_searches),
+    }
+    for column, attribute in COPIED_COLUMNS.items():
+        columns[column] = [
+            getattr(stop_and_search, attribute) for stop_and_search in stop_and_searches
+        ]
+    for column, (lookup, attributes) in ENCODED_COLUMNS.items():
+        lookup_ids = ids[lookup]
+        columns[column] = [
+            None if value is None else lookup_ids[value]
+            for value in (
+                get_value(stop_and_search, attributes)
+                for stop_and_search in stop_and_searches
+            )
+        ]
+    return columns
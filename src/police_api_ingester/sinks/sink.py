@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from logging import Logger, getLogger
+
+from police_api_ingester.models import StopAndSearch, StopAndSearchQuarantine
+
+
+class Sink(ABC):
+    """Stores the stop and searches fetched for a force and month. A repository can
+    write to several sinks so the Police API is only called once per month. The
+    stop and searches that failed validation are passed as the quarantine, which
+    sinks that cannot store them ignore.
+
+    Writing appends the stop and searches, while replacing first removes the ones
+    stored for the force and month in the window, so a month that is ingested again
+    holds exactly what the Police API returned. Sinks that already replace a month when
+    it is written do not override replace."""
+
+    def __init__(self, logger: Logger | None = None):
+        self.logger = logger or getLogger(self.__class__.__name__)
+
+    @abstractmethod
+    async def write(
+        self,
+        force_id: str,
+        year_month: str,
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None = None,
+    ) -> bool:
+        """Stores the stop and searches of the force for the month, returning
+        whether they were stored."""
+
+    async def replace(
+        self,
+        force_id: str,
+        year_month: str,
+        window: tuple[datetime, datetime],
+        stop_and_searches: list[StopAndSearch],
+        quarantine: list[StopAndSearchQuarantine] | None = None,
+    ) -> bool:
+        """Replaces the stop and searches returned for the force and month whose
+        Datetime is between the inclusive start and end of the window."""
+        return await self.write(force_id, year_month, stop_and_searches, quarantine)
@@ -0,0 +1,93 @@
+import json
+import os
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from threading import Lock
+from time import perf_counter_ns, time_ns
+from typing import Any
+
+# Only the standard library is imported here, the CLI imports this module when it
+# is built.
+
+
+class JsonLinesExporter:
+    """Appends each finished span to a JSON lines file, one object per line. Spans
+    are written as they finish, so children are written before their parent."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.file = path.open("a", buffering=1)
+        self.lock = Lock()
+
+    def export(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, default=str)
+        with self.lock:
+            self.file.write(line + "\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+# The scheduler fires runs on its worker threads, which do not copy the context, so
+# the exporter is held here. Nothing is traced while it is None.
+_exporter: JsonLinesExporter | None = None
+# The (trace_id, span_id) of the span the code is running in, the tasks of a run
+# copy the context they are created in so their spans are children of it.
+_current_span: ContextVar[tuple[str, str] | None] = ContextVar(
+    "current_span", default=None
+)
+_disabled_span = nullcontext()
+
+
+def set_exporter(exporter: JsonLinesExporter | None) -> None:
+    global _exporter
+    _exporter = exporter
+
+
+def get_exporter() -> JsonLinesExporter | None:
+    return _exporter
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[None]:
+    """Times the block as a span nested in the current span. When tracing is
+    disabled the same no-op context manager is returned, so a span costs a function
+    call and nothing is allocated."""
+    if _exporter is None:
+        return _disabled_span
+    return _record_span(_exporter, name, attributes)
+
+
+@contextmanager
+def _record_span(
+    exporter: JsonLinesExporter, name: str, attributes: dict[str, Any]
+) -> Iterator[None]:
+    parent = _current_span.get()
+    trace_id = parent[0] if parent is not None else os.urandom(16).hex()
+    span_id = os.urandom(8).hex()
+    token = _current_span.set((trace_id, span_id))
+    start_time = time_ns()
+    start = perf_counter_ns()
+    error = None
+    try:
+        yield
+    except BaseException as exception:
+        error = type(exception).__name__
+        raise
+    finally:
+        duration = perf_counter_ns() - start
+        _current_span.reset(token)
+        exporter.export(
+            {
+                "trace_id": trace_id,
+                "span_id": span_id,
+                "parent_id": parent[1] if parent is not None else None,
+                "name": name,
+                "start_time_unix_nano": start_time,
+                "duration_ms": duration / 1_000_000,
+                "error": error,
+                "attributes": attributes,
+            }
+        )
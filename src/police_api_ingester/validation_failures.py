@@ -0,0 +1,62 @@
+from collections import Counter
+
+from pydantic import ValidationError
+
+MAX_EXAMPLES = 3
+MAX_INPUT_LENGTH = 100
+
+
+class ValidationFailures:
+    """Collects the records of a batch that failed validation, counted by field and
+    error type with the first few examples of each, so a systematic change to the
+    Police API is logged once per batch rather than with a traceback per record.
+    The rejected records are kept with their errors so they can be quarantined."""
+
+    def __init__(self, model_name: str, max_examples: int = MAX_EXAMPLES):
+        self.model_name = model_name
+        self.max_examples = max_examples
+        self.counts: Counter[tuple[str, str]] = Counter()
+        self.examples: dict[tuple[str, str], list[str]] = {}
+        self.records: list[tuple[dict, list[dict[str, str]]]] = []
+
+    @property
+    def rejected(self) -> int:
+        return len(self.records)
+
+    def add(self, index: int, record: dict, error: ValidationError) -> None:
+        self.records.append((record, get_errors(error)))
+        for detail in error.errors(include_url=False):
+            key = (".".join(map(str, detail["loc"])), detail["type"])
+            self.counts[key] += 1
+            examples = self.examples.setdefault(key, [])
+            if len(examples) < self.max_examples:
+                value = repr(detail["input"])
+                if len(value) > MAX_INPUT_LENGTH:
+                    value = f"{value[:MAX_INPUT_LENGTH]}..."
+                examples.append(f"index '{index}' {detail['msg']}, got {value}")
+
+    def get_summary(self, total: int, source: str) -> str:
+        """Returns one line per field and error type, most frequent first."""
+        lines = [
+            (
+                f"Failed to map {self.rejected} of {total} '{self.model_name}' "
+                f"returned from {source}."
+            )
+        ]
+        for (field, error_type), count in self.counts.most_common():
+            examples = "; ".join(self.examples[(field, error_type)])
+            lines.append(f"'{field}' {error_type} in {count} records: {examples}")
+        return "\n".join(lines)
+
+
+def get_errors(error: ValidationError) -> list[dict[str, str]]:
+    """Returns the field, error type and message of each error, without the input,
+    which is stored alongside them."""
+    return [
+        {
+            "field": ".".join(map(str, detail["loc"])),
+            "type": detail["type"],
+            "message": detail["msg"],
+        }
+        for detail in error.errors(include_url=False)
+    ]
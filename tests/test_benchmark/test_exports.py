@@ -0,0 +1,37 @@
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import Engine
+
+from police_api_ingester.exports import export_stop_and_searches
+
+pytestmark = pytest.mark.postgres_benchmark
+
+FROM_DATETIME = datetime(2010, 1, 1, tzinfo=UTC)
+TO_DATETIME = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".csv.gz"])
+def test_export_stop_and_searches(
+    benchmark: BenchmarkFixture,
+    record_throughput: Callable[[int], None],
+    reset_database: Callable[[], None],
+    load_stop_and_searches: Callable[[int], None],
+    engine: Engine,
+    tmp_path: Path,
+    suffix: str,
+):
+    rows = 100_000
+    reset_database()
+    load_stop_and_searches(rows)
+    path = tmp_path / f"stop_and_searches{suffix}"
+
+    exported_rows = benchmark(
+        lambda: export_stop_and_searches(engine, path, FROM_DATETIME, TO_DATETIME)
+    )
+
+    assert exported_rows == rows
+    record_throughput(exported_rows)
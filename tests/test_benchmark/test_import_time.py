@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+CLI_MODULE = "police_api_ingester.main"
+HEAVY_MODULES = [
+    "sqlmodel",
+    "sqlalchemy",
+    "pydantic",
+    "httpx",
+    "aiolimiter",
+    "apscheduler",
+    "croniter",
+    "prometheus_client",
+]
+IMPORT_TIME_BUDGET_MICROSECONDS = int(
+    os.getenv("IMPORT_TIME_BUDGET_MICROSECONDS", "250000")
+)
+
+
+@pytest.fixture(scope="module")
+def import_times() -> dict[str, int]:
+    return get_cumulative_import_times(CLI_MODULE)
+
+
+class TestCliImportTime:
+    @pytest.mark.parametrize("module", HEAVY_MODULES)
+    def test_heavy_dependency_is_not_imported(
+        self, module: str, import_times: dict[str, int]
+    ):
+        assert module not in import_times, (
+            f"'{module}' is imported when building the CLI, "
+            "import it inside the command that needs it instead."
+        )
+
+    def test_cli_imports_within_budget(self, import_times: dict[str, int]):
+        assert import_times[CLI_MODULE] <= IMPORT_TIME_BUDGET_MICROSECONDS, (
+            f"Importing '{CLI_MODULE}' took '{import_times[CLI_MODULE]}' microseconds, "
+            f"the budget is '{IMPORT_TIME_BUDGET_MICROSECONDS}' microseconds."
+        )
+
+
+def get_cumulative_import_times(module: str) -> dict[str, int]:
+    """Returns the cumulative import time in microseconds of each module imported
+    when importing the module in a fresh interpreter using `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
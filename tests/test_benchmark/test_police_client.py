@@ -0,0 +1,101 @@
+from collections.abc import Callable
+from logging import getLogger
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from police_api_ingester.models import (
+    AvailableDateWithForceIds,
+    Force,
+    StopAndSearch,
+)
+from police_api_ingester.police_client import PoliceClient
+
+
+class TestMapValidateModels:
+    def test_forces(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        force_records: list[dict[str, Any]],
+    ):
+        models = benchmark(PoliceClient()._map_vailidate_models, Force, force_records)
+
+        assert len(models) == len(force_records)
+        record_throughput(len(force_records))
+
+    def test_available_dates(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        available_date_records: list[dict[str, Any]],
+    ):
+        models = benchmark(
+            PoliceClient()._map_vailidate_models,
+            AvailableDateWithForceIds,
+            available_date_records,
+        )
+
+        assert len(models) == len(available_date_records)
+        record_throughput(len(available_date_records))
+
+    def test_stop_and_searches(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        stop_and_search_records: list[dict[str, Any]],
+    ):
+        models = benchmark(
+            PoliceClient()._map_vailidate_models, StopAndSearch, stop_and_search_records
+        )
+
+        assert len(models) == len(stop_and_search_records)
+        record_throughput(len(stop_and_search_records))
+
+    def test_rejected_stop_and_searches(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        stop_and_search_records: list[dict[str, Any]],
+    ):
+        # A change to the Police API's schema rejects every record of a month
+        rejected_records = [
+            {**record, "datetime": "31/07/2023 15:37"}
+            for record in stop_and_search_records
+        ]
+        police_client = PoliceClient(logger=getLogger("RejectedStopAndSearches"))
+
+        models = benchmark(
+            police_client._map_vailidate_models, StopAndSearch, rejected_records
+        )
+
+        assert models == []
+        record_throughput(len(rejected_records))
+
+
+class TestStopAndSearchFlatten:
+    @pytest.mark.parametrize(
+        "with_location", [True, False], ids=["with_location", "without_location"]
+    )
+    def test_flatten(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        stop_and_search_records: list[dict[str, Any]],
+        with_location: bool,
+    ):
+        stop_and_searches = [
+            stop_and_search
+            for stop_and_search in stop_and_search_records
+            if (stop_and_search["location"] is not None) == with_location
+        ]
+
+        benchmark(flatten_all, stop_and_searches)
+
+        record_throughput(len(stop_and_searches))
+
+
+def flatten_all(stop_and_searches: list[dict[str, Any]]) -> None:
+    for stop_and_search in stop_and_searches:
+        StopAndSearch.flatten(stop_and_search)
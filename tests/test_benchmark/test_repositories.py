@@ -0,0 +1,494 @@
+import json
+from asyncio import run, sleep
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from httpx import Request, Response
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import Engine
+from sqlmodel import Session, col, func, select
+
+from police_api_ingester.bloom_filter import BloomFilter
+from police_api_ingester.fake_api.generator import FORCE_IDS
+from police_api_ingester.models import (
+    AvailableDateForceMapping,
+    AvailableDateWithForceIds,
+    Force,
+    SilverStopAndSearch,
+    StopAndSearch,
+    StopAndSearchCountByOutcome,
+)
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories import (
+    AggregateRepository,
+    AvailableDateRepository,
+    ForceRepository,
+    StopAndSearchChecksumRepository,
+    StopAndSearchRepository,
+)
+from police_api_ingester.repositories.stop_and_search_repository import (
+    filter_ingested,
+    get_checksum,
+)
+from police_api_ingester.sinks import PostgresSink, SilverSink
+
+pytestmark = pytest.mark.postgres_benchmark
+
+ROUNDS = 5
+AVAILABLE_DATE_YEARS = range(2010, 2025)
+PLANNING_YEARS = range(1975, 2025)
+# A backfill where the force listed last has months fifty times the size of the
+# rest, the Police API takes longer to return the larger months
+SCHEDULING_MONTHS = [f"2024-{month:02}" for month in range(1, 7)]
+SCHEDULING_FORCE_IDS = [f"force-{index:02}" for index in range(20)]
+SCHEDULING_REQUESTS_PER_SECOND = 400
+SCHEDULING_SECONDS_PER_ROW = 0.0001
+
+
+class TestStoreForces:
+    def test_store_forces(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        engine: Engine,
+        force_records: list[dict[str, Any]],
+    ):
+        police_client = Mock(spec=PoliceClient)
+        police_client.get_forces.side_effect = lambda _: [
+            Force(id=f"force-{index}", name=force["name"])
+            for index, force in enumerate(force_records)
+        ]
+        repository = ForceRepository(engine, police_client)
+
+        forces = benchmark.pedantic(
+            lambda: run(repository.store_forces()),
+            setup=reset_database,
+            rounds=ROUNDS,
+        )
+
+        assert forces is not None
+        assert len(forces) == len(force_records)
+        record_throughput(len(forces))
+
+
+class TestStoreAvailableDates:
+    def test_store_available_dates(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        engine: Engine,
+        forces_json: list[dict[str, Any]],
+    ):
+        force_ids = [force["id"] for force in forces_json]
+        available_dates = [
+            AvailableDateWithForceIds(
+                **{"date": f"{year}-{month:02}", "stop-and-search": force_ids}
+            )
+            for year in AVAILABLE_DATE_YEARS
+            for month in range(1, 13)
+        ]
+        police_client = Mock(spec=PoliceClient)
+        police_client.get_forces.side_effect = lambda _: [
+            Force.model_validate(force) for force in forces_json
+        ]
+        police_client.get_available_dates.return_value = available_dates
+        repository = AvailableDateRepository(engine, police_client)
+        from_date = datetime(AVAILABLE_DATE_YEARS[0], 1, 1, tzinfo=UTC)
+        to_date = datetime(AVAILABLE_DATE_YEARS[-1], 12, 31, tzinfo=UTC)
+
+        success = benchmark.pedantic(
+            lambda: run(repository.store_available_dates(from_date, to_date)),
+            setup=reset_database,
+            rounds=ROUNDS,
+        )
+
+        assert success is True
+        with Session(engine) as session:
+            stored_mappings = session.exec(
+                select(func.count()).select_from(AvailableDateForceMapping)
+            ).one()
+        assert stored_mappings == len(available_dates) * len(force_ids)
+        record_throughput(stored_mappings)
+
+
+class TestGetAvailableDateForceIds:
+    def test_get_available_date_force_ids(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        engine: Engine,
+        forces_json: list[dict[str, Any]],
+    ):
+        force_ids = [force["id"] for force in forces_json]
+        police_client = Mock(spec=PoliceClient)
+        police_client.get_forces.return_value = [
+            Force.model_validate(force) for force in forces_json
+        ]
+        police_client.get_available_dates.return_value = [
+            AvailableDateWithForceIds(
+                **{"date": f"{year}-{month:02}", "stop-and-search": force_ids}
+            )
+            for year in PLANNING_YEARS
+            for month in range(1, 13)
+        ]
+        repository = AvailableDateRepository(engine, police_client)
+        from_date = datetime(PLANNING_YEARS[0], 1, 1, tzinfo=UTC)
+        to_date = datetime(PLANNING_YEARS[-1], 12, 31, tzinfo=UTC)
+        reset_database()
+        run(repository.store_available_dates(from_date, to_date))
+
+        available_date_force_ids = benchmark(
+            lambda: run(repository.get_available_date_force_ids(from_date, to_date))
+        )
+
+        assert available_date_force_ids is not None
+        assert len(available_date_force_ids) == len(PLANNING_YEARS) * 12 * len(
+            force_ids
+        )
+        record_throughput(len(available_date_force_ids))
+
+
+class TestStoreStopAndSearch:
+    @pytest.mark.parametrize("layer", ["bronze", "silver"])
+    def test_store_stop_and_search(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        engine: Engine,
+        stop_and_search_records: list[dict[str, Any]],
+        layer: str,
+    ):
+        police_client = Mock(spec=PoliceClient)
+        repository = StopAndSearchRepository(engine, police_client)
+        model = StopAndSearch if layer == "bronze" else SilverStopAndSearch
+
+        def setup() -> None:
+            reset_database()
+            # A new sink each round so the lookup cache starts empty like a new run
+            repository.sinks = [
+                PostgresSink(engine) if layer == "bronze" else SilverSink(engine)
+            ]
+            with Session(engine) as session:
+                session.add(Force(id=stop_and_search_records[0]["force_id"]))
+                session.commit()
+            police_client.get_stop_and_searches_and_quarantine.side_effect = [
+                (
+                    [
+                        StopAndSearch.model_validate(stop_and_search)
+                        for stop_and_search in stop_and_search_records
+                    ],
+                    [],
+                ),
+                ([], []),
+            ]
+
+        success = benchmark.pedantic(
+            lambda: run(
+                repository.store_stop_and_search(
+                    stop_and_search_records[0]["datetime"][:7],
+                    stop_and_search_records[0]["force_id"],
+                    datetime.min.replace(tzinfo=UTC),
+                    datetime.max.replace(tzinfo=UTC),
+                )
+            ),
+            setup=setup,
+            rounds=ROUNDS,
+        )
+
+        assert success is True
+        with Session(engine) as session:
+            stored_stop_and_searches = session.exec(
+                select(func.count()).select_from(model)
+            ).one()
+        assert stored_stop_and_searches == len(stop_and_search_records)
+        record_throughput(stored_stop_and_searches)
+
+
+class TestReplaceStopAndSearches:
+    @pytest.mark.parametrize("staged", [False, True], ids=["direct", "staged"])
+    def test_replace_stop_and_searches(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        engine: Engine,
+        stop_and_search_records: list[dict[str, Any]],
+        staged: bool,
+    ):
+        force_id = stop_and_search_records[0]["force_id"]
+        year_month = stop_and_search_records[0]["datetime"][:7]
+        window = (datetime.min.replace(tzinfo=UTC), datetime.max.replace(tzinfo=UTC))
+        sink = PostgresSink(
+            engine, staging_rows=0 if staged else len(stop_and_search_records) + 1
+        )
+        stop_and_searches: list[StopAndSearch] = []
+
+        def get_stop_and_searches() -> list[StopAndSearch]:
+            return [
+                StopAndSearch.model_validate(stop_and_search)
+                for stop_and_search in stop_and_search_records
+            ]
+
+        def setup() -> None:
+            reset_database()
+            with Session(engine) as session:
+                session.add(Force(id=force_id))
+                session.commit()
+            # The month is already stored, so every row is deleted and written again
+            run(sink.write(force_id, year_month, get_stop_and_searches()))
+            stop_and_searches[:] = get_stop_and_searches()
+
+        success = benchmark.pedantic(
+            lambda: run(sink.replace(force_id, year_month, window, stop_and_searches)),
+            setup=setup,
+            rounds=ROUNDS,
+        )
+
+        assert success is True
+        with Session(engine) as session:
+            stored_stop_and_searches = session.exec(
+                select(func.count()).select_from(StopAndSearch)
+            ).one()
+        assert stored_stop_and_searches == len(stop_and_search_records)
+        record_throughput(len(stop_and_search_records))
+
+
+class TestSkipUnchangedMonths:
+    @pytest.mark.parametrize("unchanged", [False, True], ids=["changed", "unchanged"])
+    def test_store_stop_and_search_with_checksums(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        engine: Engine,
+        stop_and_search_records: list[dict[str, Any]],
+        unchanged: bool,
+    ):
+        year_month = stop_and_search_records[0]["datetime"][:7]
+        force_id = stop_and_search_records[0]["force_id"]
+        contents = {
+            True: json.dumps(stop_and_search_records).encode(),
+            False: b"[]",
+        }
+
+        async def get(route: str) -> Response:
+            content = contents[route.startswith("stops-force")]
+            return Response(200, content=content, request=Request("GET", route))
+
+        checksum_repository = StopAndSearchChecksumRepository(
+            engine, Mock(spec=PoliceClient)
+        )
+        repository = StopAndSearchRepository(
+            engine,
+            Mock(spec=PoliceClient),
+            sinks=[PostgresSink(engine)],
+            checksum_repository=checksum_repository,
+        )
+
+        def setup() -> None:
+            reset_database()
+            with Session(engine) as session:
+                session.add(Force(id=force_id))
+                session.commit()
+            if unchanged:
+                run(
+                    checksum_repository.store_checksum(
+                        force_id, year_month, get_checksum(contents.values())
+                    )
+                )
+            # A new client each round as its rate limiter is bound to the event loop
+            repository.police_client = PoliceClient()
+            repository.police_client.get = get  # type: ignore[method-assign]
+
+        success = benchmark.pedantic(
+            lambda: run(
+                repository.store_stop_and_search(
+                    year_month,
+                    force_id,
+                    datetime.min.replace(tzinfo=UTC),
+                    datetime.max.replace(tzinfo=UTC),
+                )
+            ),
+            setup=setup,
+            rounds=ROUNDS,
+        )
+
+        assert success is True
+        with Session(engine) as session:
+            stored_stop_and_searches = session.exec(
+                select(func.count()).select_from(StopAndSearch)
+            ).one()
+        assert stored_stop_and_searches == (
+            0 if unchanged else len(stop_and_search_records)
+        )
+        record_throughput(len(stop_and_search_records))
+
+
+class TestStoreStopAndSearches:
+    @pytest.mark.parametrize("ordered", [False, True], ids=["listed", "largest_first"])
+    def test_store_stop_and_searches_makespan(
+        self, benchmark: BenchmarkFixture, ordered: bool
+    ):
+        slices = [
+            (year_month, force_id)
+            for year_month in SCHEDULING_MONTHS
+            for force_id in SCHEDULING_FORCE_IDS
+        ]
+        row_counts = {
+            (year_month, force_id): 5000
+            if force_id == SCHEDULING_FORCE_IDS[-1]
+            else 100
+            for year_month, force_id in slices
+        }
+
+        async def get(route: str) -> Response:
+            query = parse_qs(urlsplit(route).query)
+            slice = (query["date"][0], query["force"][0])
+            await sleep(row_counts[slice] * SCHEDULING_SECONDS_PER_ROW)
+            return Response(200, json=[], request=Request("GET", route))
+
+        repository = StopAndSearchRepository(
+            Mock(spec=Engine), Mock(spec=PoliceClient), sinks=[]
+        )
+        repository.available_date_repository = Mock()
+        repository.available_date_repository.get_available_date_force_ids = AsyncMock(
+            return_value=slices
+        )
+        repository.aggregate_repository = Mock()
+        repository.aggregate_repository.get_row_counts = AsyncMock(
+            return_value=row_counts if ordered else {}
+        )
+        repository.aggregate_repository.refresh_aggregates = AsyncMock(
+            return_value=True
+        )
+
+        def setup() -> None:
+            # A new client each round as its rate limiter is bound to the event loop
+            repository.police_client = PoliceClient(
+                max_requests_per_second=SCHEDULING_REQUESTS_PER_SECOND
+            )
+            repository.police_client.get = get  # type: ignore[method-assign]
+
+        success = benchmark.pedantic(
+            lambda: run(
+                repository.store_stop_and_searches(
+                    datetime(2024, 1, 1, tzinfo=UTC), datetime(2024, 6, 30, tzinfo=UTC)
+                )
+            ),
+            setup=setup,
+            rounds=ROUNDS,
+        )
+
+        assert success is True
+
+
+class TestFilterIngested:
+    @pytest.mark.parametrize("ingested", [False, True], ids=["new", "ingested"])
+    def test_filter_ingested(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        stop_and_search_records: list[dict[str, Any]],
+        tmp_path: Path,
+        ingested: bool,
+    ):
+        stop_and_searches = [
+            StopAndSearch.model_validate(stop_and_search)
+            for stop_and_search in stop_and_search_records
+        ]
+        bloom_filter = BloomFilter(tmp_path / "bloom_filter", 10_000_000)
+        if ingested:
+            _, content_hashes = filter_ingested(bloom_filter, stop_and_searches)
+            for content_hash in content_hashes:
+                bloom_filter.add(content_hash)
+
+        new_stop_and_searches, _ = benchmark(
+            filter_ingested, bloom_filter, stop_and_searches
+        )
+
+        bloom_filter.close()
+        assert len(new_stop_and_searches) == (0 if ingested else len(stop_and_searches))
+        record_throughput(len(stop_and_searches))
+
+
+class TestStreamStopAndSearches:
+    def test_stream_stop_and_searches(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        load_stop_and_searches: Callable[[int], None],
+        engine: Engine,
+    ):
+        rows = 100_000
+        reset_database()
+        load_stop_and_searches(rows)
+        repository = StopAndSearchRepository(engine, Mock(spec=PoliceClient))
+
+        async def count_rows() -> int:
+            count = 0
+            async for batch in repository.stream_stop_and_searches(
+                datetime.min.replace(tzinfo=UTC),
+                datetime.max.replace(tzinfo=UTC),
+            ):
+                count += len(batch)
+            return count
+
+        streamed_rows = benchmark(lambda: run(count_rows()))
+
+        assert streamed_rows == rows
+        record_throughput(streamed_rows)
+
+
+class TestRefreshAggregates:
+    @pytest.mark.parametrize("months", [1, 180], ids=["one_month", "all_months"])
+    def test_refresh_aggregates(
+        self,
+        benchmark: BenchmarkFixture,
+        record_throughput: Callable[[int], None],
+        reset_database: Callable[[], None],
+        load_stop_and_searches: Callable[[int], None],
+        engine: Engine,
+        months: int,
+    ):
+        rows = 100_000
+        reset_database()
+        load_stop_and_searches(rows)
+        # The loaded rows are spread over the 180 months from 2010 to 2024
+        year_months = [
+            f"{year}-{month:02}"
+            for year in AVAILABLE_DATE_YEARS
+            for month in range(1, 13)
+        ][:months]
+        slices = [
+            (year_month, force_id)
+            for year_month in year_months
+            for force_id in FORCE_IDS
+        ]
+        repository = AggregateRepository(engine, Mock(spec=PoliceClient))
+
+        success = benchmark.pedantic(
+            lambda: run(repository.refresh_aggregates(slices)), rounds=ROUNDS
+        )
+
+        assert success is True
+        with Session(engine) as session:
+            counted_rows = session.exec(
+                select(func.sum(StopAndSearchCountByOutcome.count))
+            ).one()
+            stored_rows = session.exec(
+                select(func.count()).where(
+                    col(StopAndSearch.source_year_month).in_(year_months)
+                )
+            ).one()
+        assert counted_rows == stored_rows
+        record_throughput(len(slices))
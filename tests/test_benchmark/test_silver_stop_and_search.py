@@ -0,0 +1,106 @@
+import os
+from collections.abc import Callable, Iterator
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import Engine
+from sqlmodel import text
+
+pytestmark = pytest.mark.postgres_benchmark
+
+SILVER_BENCHMARK_ROWS = int(os.getenv("INDEX_BENCHMARK_ROWS", "2000000"))
+LOOKUPS = {
+    "SearchType": ['"Type"'],
+    "Gender": ['"Gender"'],
+    "AgeRange": ['"AgeRange"'],
+    "Ethnicity": ['"SelfDefinedEthnicity"', '"OfficerDefinedEthnicity"'],
+    "Legislation": ['"Legislation"'],
+    "ObjectOfSearch": ['"ObjectOfSearch"'],
+}
+# Encodes the bronze rows with SQL, which is far faster than the SilverSink when
+# millions of rows are needed.
+LOAD_SILVER_STOP_AND_SEARCHES = """
+INSERT INTO silver."Outcome" ("Code", "Name")
+SELECT DISTINCT "OutcomeId", "OutcomeName" FROM bronze."StopAndSearch";
+INSERT INTO silver."StopAndSearch" (
+    "ForceId", "TypeId", "InvolvedPerson", "Datetime", "GenderId", "AgeRangeId",
+    "SelfDefinedEthnicityId", "OfficerDefinedEthnicityId", "LegislationId",
+    "ObjectOfSearchId", "OutcomeId", "SourceYearMonth"
+)
+SELECT
+    s."ForceId", t."Id", s."InvolvedPerson", s."Datetime", g."Id", a."Id",
+    se."Id", oe."Id", l."Id", os."Id", o."Id", s."SourceYearMonth"
+FROM bronze."StopAndSearch" AS s
+JOIN silver."SearchType" AS t ON t."Name" = s."Type"
+LEFT JOIN silver."Gender" AS g ON g."Name" = s."Gender"
+LEFT JOIN silver."AgeRange" AS a ON a."Name" = s."AgeRange"
+LEFT JOIN silver."Ethnicity" AS se ON se."Name" = s."SelfDefinedEthnicity"
+LEFT JOIN silver."Ethnicity" AS oe ON oe."Name" = s."OfficerDefinedEthnicity"
+LEFT JOIN silver."Legislation" AS l ON l."Name" = s."Legislation"
+LEFT JOIN silver."ObjectOfSearch" AS os ON os."Name" = s."ObjectOfSearch"
+JOIN silver."Outcome" AS o
+    ON o."Code" = s."OutcomeId" AND o."Name" = s."OutcomeName"
+ORDER BY s."Id";
+"""
+QUERIES = {
+    "bronze": """
+        SELECT "OutcomeName", "OfficerDefinedEthnicity", count(*)
+        FROM bronze."StopAndSearch"
+        WHERE "Datetime" >= '2018-01-01' AND "Datetime" < '2019-01-01'
+        GROUP BY "OutcomeName", "OfficerDefinedEthnicity"
+    """,
+    "silver": """
+        SELECT o."Name", e."Name", s.count
+        FROM (
+            SELECT "OutcomeId", "OfficerDefinedEthnicityId", count(*)
+            FROM silver."StopAndSearch"
+            WHERE "Datetime" >= '2018-01-01' AND "Datetime" < '2019-01-01'
+            GROUP BY "OutcomeId", "OfficerDefinedEthnicityId"
+        ) AS s
+        JOIN silver."Outcome" AS o ON o."Id" = s."OutcomeId"
+        LEFT JOIN silver."Ethnicity" AS e ON e."Id" = s."OfficerDefinedEthnicityId"
+    """,
+}
+
+
+@pytest.fixture(scope="module")
+def stop_and_search_tables(
+    reset_database: Callable[[], None],
+    load_stop_and_searches: Callable[[int], None],
+    engine: Engine,
+) -> Iterator[None]:
+    reset_database()
+    load_stop_and_searches(SILVER_BENCHMARK_ROWS)
+    with engine.begin() as connection:
+        for lookup, columns in LOOKUPS.items():
+            values = " UNION ".join(
+                f'SELECT DISTINCT {column} FROM bronze."StopAndSearch" WHERE {column} IS NOT NULL'
+                for column in columns
+            )
+            connection.execute(text(f'INSERT INTO silver."{lookup}" ("Name") {values}'))
+        connection.execute(text(LOAD_SILVER_STOP_AND_SEARCHES))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for layer in QUERIES:
+            connection.execute(text(f'VACUUM ANALYZE {layer}."StopAndSearch"'))
+    yield
+    reset_database()
+
+
+@pytest.mark.parametrize("layer", QUERIES.keys())
+def test_stop_and_search_size_and_scan(
+    benchmark: BenchmarkFixture,
+    engine: Engine,
+    stop_and_search_tables: None,
+    layer: str,
+):
+    with engine.connect() as connection:
+        benchmark.extra_info["rows"] = SILVER_BENCHMARK_ROWS
+        benchmark.extra_info["table_bytes"] = connection.execute(
+            text(f"SELECT pg_table_size('{layer}.\"StopAndSearch\"')")
+        ).scalar_one()
+        benchmark.extra_info["index_bytes"] = connection.execute(
+            text(f"SELECT pg_indexes_size('{layer}.\"StopAndSearch\"')")
+        ).scalar_one()
+        result = benchmark(lambda: connection.execute(text(QUERIES[layer])).all())
+
+    assert len(result) > 0
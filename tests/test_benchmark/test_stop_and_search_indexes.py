@@ -0,0 +1,85 @@
+import os
+from collections.abc import Callable, Iterator
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import Engine
+from sqlmodel import text
+
+from police_api_ingester.models import StopAndSearch
+
+pytestmark = pytest.mark.postgres_benchmark
+
+INDEX_BENCHMARK_ROWS = int(os.getenv("INDEX_BENCHMARK_ROWS", "2000000"))
+QUERIES = {
+    "force_month": """
+        SELECT count(*)
+        FROM bronze."StopAndSearch"
+        WHERE "ForceId" = 'metropolitan'
+        AND "Datetime" >= '2018-06-01' AND "Datetime" < '2018-07-01'
+    """,
+    "all_forces_week": """
+        SELECT "ForceId", count(*)
+        FROM bronze."StopAndSearch"
+        WHERE "Datetime" >= '2018-06-01' AND "Datetime" < '2018-06-08'
+        GROUP BY "ForceId"
+    """,
+    "weekday_hour_from_datetime": """
+        SELECT
+            extract(isodow FROM "Datetime" AT TIME ZONE 'UTC'),
+            extract(hour FROM "Datetime" AT TIME ZONE 'UTC'),
+            count(*)
+        FROM bronze."StopAndSearch"
+        WHERE "Datetime" >= '2018-01-01' AND "Datetime" < '2019-01-01'
+        GROUP BY 1, 2
+    """,
+    "weekday_hour_from_buckets": """
+        SELECT "Weekday", "Hour", count(*)
+        FROM bronze."StopAndSearch"
+        WHERE "YearMonth" BETWEEN '2018-01' AND '2018-12'
+        GROUP BY "Weekday", "Hour"
+    """,
+    "geohash_cells": """
+        SELECT left("Geohash", 5), count(*)
+        FROM bronze."StopAndSearch"
+        WHERE "Geohash" LIKE 'gcr%'
+        GROUP BY left("Geohash", 5)
+    """,
+}
+
+
+@pytest.fixture(scope="module")
+def stop_and_search_table(
+    reset_database: Callable[[], None], load_stop_and_searches: Callable[[int], None]
+) -> Iterator[None]:
+    reset_database()
+    load_stop_and_searches(INDEX_BENCHMARK_ROWS)
+    yield
+    reset_database()
+
+
+@pytest.fixture(params=[False, True], ids=["without_indexes", "with_indexes"])
+def with_indexes(
+    request: pytest.FixtureRequest, engine: Engine, stop_and_search_table: None
+) -> bool:
+    with engine.begin() as connection:
+        for index in StopAndSearch.__table__.indexes:
+            if request.param:
+                index.create(connection, checkfirst=True)
+            else:
+                index.drop(connection, checkfirst=True)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text('VACUUM ANALYZE bronze."StopAndSearch"'))
+    return request.param
+
+
+@pytest.mark.parametrize("query", QUERIES.keys())
+def test_stop_and_search_query(
+    benchmark: BenchmarkFixture, engine: Engine, with_indexes: bool, query: str
+):
+    benchmark.extra_info["rows"] = INDEX_BENCHMARK_ROWS
+    benchmark.extra_info["with_indexes"] = with_indexes
+    with engine.connect() as connection:
+        result = benchmark(lambda: connection.execute(text(QUERIES[query])).all())
+
+    assert len(result) > 0
@@ -0,0 +1,34 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from police_api_ingester.tracing import JsonLinesExporter, set_exporter, span
+
+SPANS = 10_000
+
+
+def open_spans() -> None:
+    for _ in range(SPANS):
+        with span("validate", model="StopAndSearch"):
+            pass
+
+
+@pytest.mark.parametrize("traced", [False, True], ids=["disabled", "enabled"])
+def test_span(
+    benchmark: BenchmarkFixture,
+    record_throughput: Callable[[int], None],
+    tmp_path: Path,
+    traced: bool,
+):
+    exporter = JsonLinesExporter(tmp_path / "trace.jsonl") if traced else None
+    set_exporter(exporter)
+    try:
+        benchmark(open_spans)
+    finally:
+        set_exporter(None)
+        if exporter is not None:
+            exporter.close()
+
+    record_throughput(SPANS)
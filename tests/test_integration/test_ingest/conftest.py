@@ -52,6 +52,15 @@ def expected_stop_and_searches_with_location(
     return set_force(stop_and_searches, "leicestershire")
 
 
+@pytest.fixture
+def stop_and_search_records_with_location(
+    test_data_directory: Path,
+) -> list[dict[str, Any]]:
+    return get_json_from_file(
+        test_data_directory, "stop_and_searches_with_location.json"
+    )
+
+
 @pytest.fixture
 def expected_stop_and_searches_without_location(
     test_data_directory: Path,
@@ -0,0 +1,84 @@
+from hashlib import blake2b
+from pathlib import Path
+
+import pytest
+
+from police_api_ingester.bloom_filter import BloomFilter, get_size
+
+
+def get_hashes(start: int, stop: int) -> list[bytes]:
+    return [
+        blake2b(str(index).encode(), digest_size=16).digest()
+        for index in range(start, stop)
+    ]
+
+
+class TestBloomFilter:
+    def test_contains_the_hashes_added(self, tmp_path: Path):
+        bloom_filter = BloomFilter(tmp_path / "bloom_filter", 1000)
+
+        for content_hash in get_hashes(0, 1000):
+            bloom_filter.add(content_hash)
+
+        assert all(content_hash in bloom_filter for content_hash in get_hashes(0, 1000))
+        assert not any(
+            content_hash in bloom_filter for content_hash in get_hashes(1000, 2000)
+        )
+        bloom_filter.close()
+
+    def test_keeps_the_hashes_when_opened_again(self, tmp_path: Path):
+        path = tmp_path / "bloom_filter"
+        bloom_filter = BloomFilter(path, 1000)
+        for content_hash in get_hashes(0, 10):
+            bloom_filter.add(content_hash)
+        bloom_filter.close()
+
+        bloom_filter = BloomFilter(path, 1)
+
+        assert all(content_hash in bloom_filter for content_hash in get_hashes(0, 10))
+        assert bloom_filter.row_count == 10
+        assert bloom_filter.capacity == 1000
+        bloom_filter.close()
+
+    def test_is_sized_from_the_expected_rows(self, tmp_path: Path):
+        path = tmp_path / "bloom_filter"
+
+        bloom_filter = BloomFilter(path, 1000, false_positive_rate=0.01)
+
+        assert (bloom_filter.bit_count, bloom_filter.hash_count) == (9592, 7)
+        assert path.stat().st_size == 40 + 9592 // 8
+        bloom_filter.close()
+
+    def test_is_full_once_it_holds_more_than_the_expected_rows(self, tmp_path: Path):
+        bloom_filter = BloomFilter(tmp_path / "bloom_filter", 10)
+
+        for content_hash in get_hashes(0, 10):
+            bloom_filter.add(content_hash)
+        assert bloom_filter.is_full is False
+        bloom_filter.add(get_hashes(10, 11)[0])
+
+        assert bloom_filter.is_full is True
+        bloom_filter.close()
+
+    def test_raises_value_error_when_the_file_is_not_a_bloom_filter(
+        self, tmp_path: Path
+    ):
+        path = tmp_path / "bloom_filter"
+        path.write_bytes(b"not a bloom filter")
+
+        with pytest.raises(ValueError, match="is not a Bloom filter."):
+            BloomFilter(path, 1000)
+
+
+class TestGetSize:
+    @pytest.mark.parametrize(
+        "expected_rows,false_positive_rate,size",
+        [
+            (1000, 0.01, (9592, 7)),
+            (10_000_000, 1e-6, (287_551_752, 20)),
+        ],
+    )
+    def test_returns_the_bits_and_hashes_for_the_false_positive_rate(
+        self, expected_rows: int, false_positive_rate: float, size: tuple[int, int]
+    ):
+        assert get_size(expected_rows, false_positive_rate) == size
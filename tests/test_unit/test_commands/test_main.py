@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from police_api_ingester.main import app
+from police_api_ingester.profiling import get_profiler
+from police_api_ingester.tracing import get_exporter
+
+
+class TestProfileCommand:
+    def test_profiles_the_command_when_profile_is_set(self, tmp_path: Path):
+        result = CliRunner().invoke(
+            app,
+            [
+                "--profile",
+                "--profile-directory",
+                str(tmp_path / "profiles"),
+                "fake-api",
+                "generate",
+                "--output-directory",
+                str(tmp_path / "data"),
+                "--forces",
+                "1",
+                "--months",
+                "1",
+                "--records-per-month",
+                "10",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert len(list(tmp_path.glob("profiles/fake-api-generate-*.pstats"))) == 1
+
+    def test_does_not_profile_the_command_by_default(self, tmp_path: Path):
+        result = CliRunner().invoke(
+            app,
+            [
+                "--profile-directory",
+                str(tmp_path / "profiles"),
+                "fake-api",
+                "generate",
+                "--output-directory",
+                str(tmp_path / "data"),
+                "--records-per-month",
+                "10",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert not (tmp_path / "profiles").exists()
+        assert get_profiler() is None
+
+
+class TestTraceCommand:
+    def test_traces_the_command_when_trace_file_is_set(self, tmp_path: Path):
+        trace_file = tmp_path / "trace.jsonl"
+
+        result = CliRunner().invoke(
+            app,
+            [
+                "--trace-file",
+                str(trace_file),
+                "fake-api",
+                "generate",
+                "--output-directory",
+                str(tmp_path / "data"),
+                "--records-per-month",
+                "10",
+            ],
+        )
+
+        assert result.exit_code == 0
+        spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        assert [(span["name"], span["parent_id"]) for span in spans] == [
+            ("fake-api-generate", None)
+        ]
+        assert get_exporter() is None
@@ -0,0 +1,52 @@
+import json
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from police_api_ingester.commands.schedule import timed_job
+from police_api_ingester.profiling import Profiler, set_profiler
+from police_api_ingester.tracing import JsonLinesExporter, set_exporter
+
+
+def ingest_forces(force_ids: str) -> str:
+    return force_ids
+
+
+@pytest.fixture
+def profiler(tmp_path: Path) -> Generator[Profiler, None, None]:
+    profiler = Profiler(tmp_path)
+    set_profiler(profiler)
+    yield profiler
+    set_profiler(None)
+
+
+class TestTimedJob:
+    def test_profiles_each_run_when_profiling(self, profiler: Profiler):
+        job = timed_job(ingest_forces)
+
+        assert job(force_ids="force-1") == "force-1"
+        assert job(force_ids="force-2") == "force-2"
+
+        assert len(list(profiler.directory.glob("ingest-forces-*.pstats"))) == 2
+
+    def test_does_not_profile_by_default(self, tmp_path: Path):
+        job = timed_job(ingest_forces)
+
+        assert job(force_ids="force-1") == "force-1"
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_traces_each_run_when_tracing(self, tmp_path: Path):
+        exporter = JsonLinesExporter(tmp_path / "trace.jsonl")
+        set_exporter(exporter)
+        job = timed_job(ingest_forces)
+
+        job(force_ids="force-1")
+        job(force_ids="force-2")
+        set_exporter(None)
+        exporter.close()
+
+        spans = [json.loads(line) for line in exporter.path.read_text().splitlines()]
+        assert [span["name"] for span in spans] == ["ingest-forces", "ingest-forces"]
+        assert spans[0]["trace_id"] != spans[1]["trace_id"]
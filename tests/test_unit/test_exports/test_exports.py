@@ -0,0 +1,118 @@
+import bz2
+import gzip
+import lzma
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from police_api_ingester.exports import (
+    export_stop_and_searches,
+    get_stop_and_searches_query,
+    open_export_file,
+)
+
+
+class TestGetStopAndSearchesQuery:
+    def test_filters_by_datetime_range(self):
+        query = get_stop_and_searches_query(
+            datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 2, 1, tzinfo=UTC)
+        )
+
+        compiled = query.compile(dialect=postgresql.dialect())
+        assert compiled.params == {
+            "Datetime_1": datetime(2023, 1, 1, tzinfo=UTC),
+            "Datetime_2": datetime(2023, 2, 1, tzinfo=UTC),
+        }
+        assert '"ForceId" IN' not in str(compiled)
+        assert str(compiled).endswith(
+            'ORDER BY bronze."StopAndSearch"."ForceId", bronze."StopAndSearch"."Datetime"'
+        )
+
+    def test_filters_by_force_ids(self):
+        query = get_stop_and_searches_query(
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 2, 1, tzinfo=UTC),
+            ["force-1", "force-2"],
+        )
+
+        compiled = query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}
+        )
+        assert compiled.params["ForceId_1_1"] == "force-1"
+        assert compiled.params["ForceId_1_2"] == "force-2"
+
+
+class TestOpenExportFile:
+    @pytest.mark.parametrize(
+        "suffix, decompress",
+        [
+            (".csv", lambda data: data),
+            (".csv.gz", gzip.decompress),
+            (".csv.bz2", bz2.decompress),
+            (".csv.xz", lzma.decompress),
+        ],
+    )
+    def test_compresses_by_suffix(self, tmp_path: Path, suffix: str, decompress):
+        path = tmp_path / f"export{suffix}"
+
+        with open_export_file(path) as file:
+            file.write(b"Id,ForceId\n1,force-1\n")
+
+        assert decompress(path.read_bytes()) == b"Id,ForceId\n1,force-1\n"
+
+
+class TestExportStopAndSearches:
+    def test_copies_the_bound_query_to_the_file_and_returns_the_row_count(
+        self, tmp_path: Path
+    ):
+        mock_engine = Mock()
+        mock_engine.dialect = postgresql.psycopg2.dialect()
+        mock_connection = mock_engine.raw_connection.return_value
+        mock_cursor = Mock()
+        mock_connection.cursor.return_value = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.mogrify.return_value = b"SELECT 1"
+        mock_cursor.rowcount = 10
+        path = tmp_path / "export.csv"
+
+        rows = export_stop_and_searches(
+            mock_engine,
+            path,
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 2, 1, tzinfo=UTC),
+            ["force-1"],
+        )
+
+        assert rows == 10
+        query, params = mock_cursor.mogrify.call_args.args
+        assert query.startswith("SELECT")
+        assert params["ForceId_1_1"] == "force-1"
+        copy, file = mock_cursor.copy_expert.call_args.args
+        assert copy == "COPY (SELECT 1) TO STDOUT WITH (FORMAT csv, HEADER)"
+        assert file.name == str(path)
+        mock_connection.close.assert_called_once()
+
+    def test_closes_the_file_when_the_copy_fails(self, tmp_path: Path):
+        mock_engine = Mock()
+        mock_engine.dialect = postgresql.psycopg2.dialect()
+        mock_connection = mock_engine.raw_connection.return_value
+        mock_cursor = Mock()
+        mock_connection.cursor.return_value = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.mogrify.return_value = b"SELECT 1"
+        mock_cursor.copy_expert.side_effect = OSError("COPY failed")
+
+        with pytest.raises(OSError, match="COPY failed"):
+            export_stop_and_searches(
+                mock_engine,
+                tmp_path / "export.csv.gz",
+                datetime(2023, 1, 1, tzinfo=UTC),
+                datetime(2023, 2, 1, tzinfo=UTC),
+            )
+
+        _, file = mock_cursor.copy_expert.call_args.args
+        assert file.closed
+        mock_connection.close.assert_called_once()
@@ -0,0 +1,36 @@
+from logging import getLogger
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import Engine
+
+from police_api_ingester.factories import get_sinks
+from police_api_ingester.sinks import ParquetSink, PostgresSink, SilverSink
+
+
+@pytest.fixture
+def mock_engine() -> Engine:
+    return Mock(spec=Engine)
+
+
+class TestGetSinks:
+    def test_writes_to_bronze_only_by_default(self, mock_engine: Engine):
+        [sink] = get_sinks(mock_engine, getLogger(), ingest_silver=False)
+
+        assert isinstance(sink, PostgresSink)
+        assert sink.silver_sink is None
+
+    def test_writes_silver_in_the_bronze_transaction(self, mock_engine: Engine):
+        [sink] = get_sinks(mock_engine, getLogger(), ingest_silver=True)
+
+        assert isinstance(sink, PostgresSink)
+        assert isinstance(sink.silver_sink, SilverSink)
+
+    def test_writes_parquet_after_postgres(self, mock_engine: Engine, tmp_path: Path):
+        postgres_sink, parquet_sink = get_sinks(
+            mock_engine, getLogger(), ingest_silver=False, parquet_directory=tmp_path
+        )
+
+        assert isinstance(postgres_sink, PostgresSink)
+        assert isinstance(parquet_sink, ParquetSink)
@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from police_api_ingester.fake_api.generator import (
+    FORCE_IDS,
+    SyntheticDataGenerator,
+    get_months,
+)
+from police_api_ingester.models import (
+    AvailableDateWithForceIds,
+    Force,
+    StopAndSearch,
+)
+
+
+@pytest.fixture
+def generator() -> SyntheticDataGenerator:
+    return SyntheticDataGenerator(
+        force_count=50, month_count=3, records_per_month=100, seed=1
+    )
+
+
+class TestForces:
+    def test_uses_real_force_ids_then_synthetic_ids(
+        self, generator: SyntheticDataGenerator
+    ):
+        forces = generator.forces()
+
+        assert [force["id"] for force in forces[: len(FORCE_IDS)]] == FORCE_IDS
+        assert forces[-1]["id"] == "synthetic-force-49"
+        assert len(forces) == 50
+
+    def test_forces_are_valid_models(self, generator: SyntheticDataGenerator):
+        forces = [Force.model_validate(force) for force in generator.forces()]
+
+        assert len(forces) == 50
+
+
+class TestAvailableDates:
+    def test_returns_every_force_for_each_month_in_descending_order(
+        self, generator: SyntheticDataGenerator
+    ):
+        available_dates = [
+            AvailableDateWithForceIds.model_validate(available_date)
+            for available_date in generator.available_dates()
+        ]
+
+        assert [available_date.year_month for available_date in available_dates] == [
+            "2024-12",
+            "2024-11",
+            "2024-10",
+        ]
+        assert all(
+            len(available_date.force_ids) == 50 for available_date in available_dates
+        )
+
+
+class TestStopAndSearches:
+    @pytest.mark.parametrize(
+        ["with_location", "expected_count"],
+        [(True, 84), (False, 16)],
+        ids=["with_location", "without_location"],
+    )
+    def test_generates_valid_records_within_the_month(
+        self,
+        generator: SyntheticDataGenerator,
+        with_location: bool,
+        expected_count: int,
+    ):
+        stop_and_searches = generator.stop_and_searches(
+            "leicestershire", "2024-11", with_location
+        )
+
+        models = [
+            StopAndSearch.model_validate(stop_and_search | {"force_id": "force"})
+            for stop_and_search in stop_and_searches
+        ]
+        assert len(models) == expected_count
+        assert all(model.datetime.strftime("%Y-%m") == "2024-11" for model in models)
+        assert all(
+            (model.latitude_microdegrees is not None) == with_location
+            for model in models
+        )
+        assert all((model.geohash is not None) == with_location for model in models)
+        assert all(
+            (stop_and_search["location"] is not None) == with_location
+            for stop_and_search in stop_and_searches
+        )
+
+    def test_is_deterministic(self, generator: SyntheticDataGenerator):
+        other_generator = SyntheticDataGenerator(
+            force_count=50, month_count=3, records_per_month=100, seed=1
+        )
+
+        assert generator.stop_and_searches(
+            "metropolitan", "2024-12", True
+        ) == other_generator.stop_and_searches("metropolitan", "2024-12", True)
+
+    def test_different_seeds_generate_different_data(
+        self, generator: SyntheticDataGenerator
+    ):
+        other_generator = SyntheticDataGenerator(
+            force_count=50, month_count=3, records_per_month=100, seed=2
+        )
+
+        assert generator.stop_and_searches(
+            "metropolitan", "2024-12", True
+        ) != other_generator.stop_and_searches("metropolitan", "2024-12", True)
+
+    def test_returns_nothing_for_unknown_force_or_month(
+        self, generator: SyntheticDataGenerator
+    ):
+        assert generator.stop_and_searches("unknown", "2024-12", True) == []
+        assert generator.stop_and_searches("metropolitan", "2020-01", True) == []
+
+
+class TestWrite:
+    def test_writes_payloads_in_police_api_route_layout(self, tmp_path: Path):
+        generator = SyntheticDataGenerator(
+            force_count=2, month_count=2, records_per_month=10
+        )
+
+        records = generator.write(tmp_path)
+
+        assert records == 2 * 2 * 10
+        assert json.loads((tmp_path / "forces.json").read_text()) == generator.forces()
+        assert (
+            json.loads((tmp_path / "crimes-street-dates.json").read_text())
+            == generator.available_dates()
+        )
+        assert json.loads(
+            (tmp_path / "stops-force" / "bedfordshire" / "2024-11.json").read_text()
+        ) == generator.stop_and_searches("bedfordshire", "2024-11", True)
+        assert json.loads(
+            (
+                tmp_path / "stops-no-location" / "bedfordshire" / "2024-11.json"
+            ).read_text()
+        ) == generator.stop_and_searches("bedfordshire", "2024-11", False)
+
+
+class TestGetMonths:
+    def test_returns_months_across_years_in_ascending_order(self):
+        assert get_months("2024-02", 4) == ["2023-11", "2023-12", "2024-01", "2024-02"]
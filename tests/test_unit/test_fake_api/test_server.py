@@ -0,0 +1,139 @@
+from collections.abc import Callable, Generator
+from http import HTTPStatus
+from threading import Thread
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from police_api_ingester.fake_api.generator import SyntheticDataGenerator
+from police_api_ingester.fake_api.server import FakeApiConfig, FakePoliceApi
+
+
+@pytest.fixture
+def generator() -> SyntheticDataGenerator:
+    return SyntheticDataGenerator(force_count=2, month_count=2, records_per_month=10)
+
+
+@pytest.fixture
+def start_server(
+    generator: SyntheticDataGenerator,
+) -> Generator[Callable[[FakeApiConfig], str], None, None]:
+    servers = []
+
+    def start(config: FakeApiConfig) -> str:
+        server = FakePoliceApi(("127.0.0.1", 0), generator, config)
+        Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/api/"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+NO_LATENCY = {"latency_median_seconds": 0, "latency_sigma": 0}
+
+
+class TestRoutes:
+    @pytest.mark.parametrize(
+        ["route", "expected"],
+        [
+            ("forces", lambda generator: generator.forces()),
+            ("crimes-street-dates", lambda generator: generator.available_dates()),
+            (
+                "stops-force?force=btp&date=2024-12",
+                lambda generator: generator.stop_and_searches("btp", "2024-12", True),
+            ),
+            (
+                "stops-no-location?force=btp&date=2024-12",
+                lambda generator: generator.stop_and_searches("btp", "2024-12", False),
+            ),
+        ],
+        ids=["forces", "crimes-street-dates", "stops-force", "stops-no-location"],
+    )
+    def test_serves_generated_data(
+        self,
+        start_server: Callable[[FakeApiConfig], str],
+        generator: SyntheticDataGenerator,
+        route: str,
+        expected: Callable[[SyntheticDataGenerator], list[dict]],
+    ):
+        base_url = start_server(FakeApiConfig(**NO_LATENCY))
+
+        response = httpx.get(base_url + route)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == expected(generator)
+
+    def test_returns_not_found_for_unknown_routes(
+        self, start_server: Callable[[FakeApiConfig], str]
+    ):
+        base_url = start_server(FakeApiConfig(**NO_LATENCY))
+
+        response = httpx.get(base_url + "crimes-street")
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestFaultInjection:
+    def test_returns_429_with_retry_after_when_rate_limit_exceeded(
+        self, start_server: Callable[[FakeApiConfig], str]
+    ):
+        base_url = start_server(
+            FakeApiConfig(
+                **NO_LATENCY,
+                max_requests_per_second=0.001,
+                burst=2,
+                retry_after_seconds=3,
+            )
+        )
+
+        responses = [httpx.get(base_url + "forces") for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [
+            HTTPStatus.OK,
+            HTTPStatus.OK,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        ]
+        assert responses[-1].headers["Retry-After"] == "3"
+
+    def test_stalls_requests_so_the_client_times_out(
+        self, start_server: Callable[[FakeApiConfig], str]
+    ):
+        base_url = start_server(
+            FakeApiConfig(**NO_LATENCY, timeout_probability=1, timeout_seconds=0.5)
+        )
+
+        with pytest.raises(httpx.ReadTimeout):
+            httpx.get(base_url + "forces", timeout=0.1)
+
+
+class TestResponseCache:
+    @pytest.mark.parametrize(
+        ["response_cache_size", "generated"], [(0, 2), (1, 1)], ids=["off", "on"]
+    )
+    def test_caches_stop_and_searches_only_when_configured(
+        self,
+        start_server: Callable[[FakeApiConfig], str],
+        generator: SyntheticDataGenerator,
+        response_cache_size: int,
+        generated: int,
+    ):
+        base_url = start_server(
+            FakeApiConfig(**NO_LATENCY, response_cache_size=response_cache_size)
+        )
+
+        with (
+            patch.object(generator, "forces", wraps=generator.forces) as mock_forces,
+            patch.object(
+                generator, "stop_and_searches", wraps=generator.stop_and_searches
+            ) as mock_stop_and_searches,
+        ):
+            for _ in range(2):
+                httpx.get(base_url + "forces")
+                httpx.get(base_url + "stops-force?force=btp&date=2024-12")
+
+        assert mock_forces.call_count == 1
+        assert mock_stop_and_searches.call_count == generated
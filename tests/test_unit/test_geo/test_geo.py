@@ -0,0 +1,44 @@
+import pytest
+
+from police_api_ingester.geo import encode_geohash, to_microdegrees
+
+
+class TestToMicrodegrees:
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("52.645734", 52_645_734),
+            ("-1.201507", -1_201_507),
+            ("-0.5", -500_000),
+            (52.645734, 52_645_734),
+            ("52.6457346", 52_645_735),
+            (None, None),
+        ],
+    )
+    def test_returns_whole_microdegrees(
+        self, value: str | float | None, expected: int | None
+    ):
+        assert to_microdegrees(value) == expected
+
+    def test_raises_value_error_when_not_a_number(self):
+        with pytest.raises(ValueError):
+            to_microdegrees("north")
+
+
+class TestEncodeGeohash:
+    def test_returns_the_geohash_of_the_point(self):
+        assert encode_geohash(57_649_110, 10_407_440, precision=11) == "u4pruydqqvj"
+
+    def test_returns_seven_characters_by_default(self):
+        assert encode_geohash(51_500_000, -127_000) == "gcpuvp7"
+
+    def test_keeps_points_on_the_edge_in_the_last_cell(self):
+        assert encode_geohash(90_000_000, 180_000_000) == "zzzzzzz"
+        assert encode_geohash(-90_000_000, -180_000_000) == "0000000"
+
+    def test_shares_a_prefix_with_points_in_the_same_cell(self):
+        first = encode_geohash(52_645_734, -1_201_507)
+        second = encode_geohash(52_732_829, -1_098_693)
+
+        assert first != second
+        assert first[:4] == second[:4]
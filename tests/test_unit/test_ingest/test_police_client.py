@@ -1,20 +1,26 @@
+import json
 from asyncio import gather
+from copy import deepcopy
 from datetime import UTC, datetime
-from decimal import Decimal
 from http import HTTPStatus
+from pathlib import Path
 from time import monotonic
 from unittest.mock import AsyncMock, Mock, call, patch
 
 import pytest
-from httpx import HTTPStatusError
+from httpx import HTTPStatusError, ReadTimeout
+from prometheus_client import REGISTRY
 from pytest import LogCaptureFixture
 
+from police_api_ingester.constants import BASE_URL
 from police_api_ingester.models import (
     AvailableDateWithForceIds,
     Force,
     StopAndSearch,
 )
-from police_api_ingester.police_client import BASE_URL, PoliceClient
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.run_stats import RUN_STATS, RunStats
+from police_api_ingester.tracing import JsonLinesExporter, set_exporter
 
 
 class TestInit:
@@ -106,11 +112,30 @@ class TestGetForces:
         assert forces == [Force(id="force2", name="Force Two")]
         record = caplog.records[-1]
         assert record.levelname == "ERROR"
-        assert (
-            "Failed to map 'Force' at index '0' returned from Police API"
-            in record.message
+        assert record.message == (
+            "Failed to map 1 of 2 'Force' returned from Police API.\n"
+            "'id' missing in 1 records: index '0' Field required, got "
+            "{'not_id': 'force1', 'not_name': 'Force One'}"
         )
 
+    @pytest.mark.asyncio
+    async def test_records_parsed_and_rejected_rows_in_the_run_stats(self):
+        police_client = PoliceClient()
+        mock_response = Mock()
+        mock_response.json.return_value = [
+            {"not_id": "force1", "not_name": "Force One"},
+            {"id": "force2", "name": "Force Two"},
+        ]
+        police_client.rate_limited_get = AsyncMock(return_value=mock_response)
+        run_stats = RunStats("ingest forces", {})
+        token = RUN_STATS.set(run_stats)
+
+        await police_client.get_forces()
+        RUN_STATS.reset(token)
+
+        assert (run_stats.rows_parsed, run_stats.rows_rejected) == (1, 1)
+        assert "validation" in run_stats.stage_seconds
+
 
 class TestGetAvailableDates:
     @pytest.mark.asyncio
@@ -208,9 +233,8 @@ class TestGetAvailableDates:
         ]
         record = caplog.records[-1]
         assert record.levelname == "ERROR"
-        assert (
-            "Failed to map 'AvailableDateWithForceIds' at index '0' returned from Police API"
-            in record.message
+        assert record.message.startswith(
+            "Failed to map 1 of 2 'AvailableDateWithForceIds' returned from Police API."
         )
 
 
@@ -303,10 +327,11 @@ class TestGetStopAndSearches:
                 removal_of_more_than_outer_clothing=False,
                 outcome_id="bu-no-further-action",
                 outcome_name="A no further action disposal",
-                latitude=None if not with_location else Decimal("52.645734"),
+                latitude_microdegrees=None if not with_location else 52645734,
                 street_id=None if not with_location else 1735297,
                 street_name=None if not with_location else "On or near Harrison Close",
-                longitude=None if not with_location else Decimal("-1.201507"),
+                longitude_microdegrees=None if not with_location else -1201507,
+                geohash=None if not with_location else "gcr5kxv",
                 operation=None,
                 officer_defined_ethnicity="White",
                 type="Person search",
@@ -326,12 +351,13 @@ class TestGetStopAndSearches:
                 removal_of_more_than_outer_clothing=False,
                 outcome_id="bu-arrest",
                 outcome_name="Arrest",
-                latitude=None if not with_location else Decimal("52.732829"),
+                latitude_microdegrees=None if not with_location else 52732829,
                 street_id=None if not with_location else 1740099,
                 street_name=None
                 if not with_location
                 else "On or near St Gregory'S Drive",
-                longitude=None if not with_location else Decimal("-1.098693"),
+                longitude_microdegrees=None if not with_location else -1098693,
+                geohash=None if not with_location else "gcr5yzx",
                 operation=None,
                 officer_defined_ethnicity="White",
                 type="Person search",
@@ -453,15 +479,73 @@ class TestGetStopAndSearches:
         )
 
         assert stop_and_searches == [
-            StopAndSearch.model_validate(stop_and_search)
+            StopAndSearch.model_validate({**stop_and_search, "force_id": force_id})
             for stop_and_search in returned_stop_and_searches[1:]
         ]
         record = caplog.records[-1]
         assert record.levelname == "ERROR"
-        assert (
-            "Failed to map 'StopAndSearch' at index '0' returned from Police API"
-            in record.message
+        assert record.message.startswith(
+            "Failed to map 1 of 2 'StopAndSearch' returned from Police API for force "
+            "with id 'leicestershire' on date '2023-07'."
         )
+        assert record.exc_info is None
+
+    @pytest.mark.asyncio
+    async def test_returns_the_rejected_stop_and_searches_to_quarantine(self):
+        police_client = PoliceClient()
+        rejected = {
+            "type": "Person search",
+            "datetime": "31/07/2023",
+            "location": {
+                "latitude": "52.634407",
+                "longitude": "-1.132301",
+                "street": {"id": 883498, "name": "On or near Shopping Area"},
+            },
+            "outcome_object": {"id": "bu-arrest", "name": "Arrest"},
+        }
+        mock_response = Mock()
+        mock_response.json.return_value = [deepcopy(rejected)]
+        police_client.rate_limited_get = AsyncMock(return_value=mock_response)
+
+        (
+            stop_and_searches,
+            quarantine,
+        ) = await police_client.get_stop_and_searches_and_quarantine(
+            "2023-07", "leicestershire", with_location=False
+        )
+
+        assert stop_and_searches == []
+        [quarantined] = quarantine
+        assert quarantined.force_id == "leicestershire"
+        assert quarantined.year_month == "2023-07"
+        assert quarantined.with_location is False
+        # Kept as the Police API returned it, without the fields the validators add
+        assert quarantined.payload == rejected
+        assert {
+            "field": "involved_person",
+            "type": "missing",
+            "message": "Field required",
+        } in quarantined.errors
+
+    @pytest.mark.asyncio
+    async def test_parses_the_response_fetched_without_decoding_it(self):
+        police_client = PoliceClient()
+        mock_response = Mock()
+        mock_response.json.return_value = []
+        police_client.rate_limited_get = AsyncMock(return_value=mock_response)
+
+        response = await police_client.get_stop_and_searches_response(
+            "2023-07", "leicestershire", with_location=True
+        )
+
+        assert response is mock_response
+        police_client.rate_limited_get.assert_awaited_once_with(
+            "stops-force?force=leicestershire&date=2023-07"
+        )
+        mock_response.json.assert_not_called()
+        assert police_client.parse_stop_and_searches(
+            response, "2023-07", "leicestershire", with_location=True
+        ) == ([], [])
 
 
 class TestRateLimitedGet:
@@ -504,6 +588,17 @@ class TestRateLimitedGet:
                 f"Too many calls in 1 second: {count_in_window}"
             )
 
+    @pytest.mark.asyncio
+    async def test_requests_are_sent_in_the_order_they_are_made(self):
+        police_client = PoliceClient(max_requests_per_second=1000)
+        mock_get = AsyncMock()
+        police_client.get = mock_get
+        routes = [f"test_route/{i}" for i in range(200)]
+
+        await gather(*[police_client.rate_limited_get(route) for route in routes])
+
+        assert [call.args[0] for call in mock_get.await_args_list] == routes
+
     @pytest.mark.asyncio
     async def test_requeues_requests_if_429_till_reach_max_requests_then_log_error(
         self, caplog: LogCaptureFixture
@@ -536,6 +631,59 @@ class TestRateLimitedGet:
             == "The rate limit on the API has been exceeded. The max limit of retires '3' has been exceeded, giving up."
         )
 
+    @pytest.mark.asyncio
+    async def test_records_requests_and_retries_in_the_run_stats(self):
+        police_client = PoliceClient(max_request_retries=3)
+        mock_too_many_request_response = Mock()
+        mock_too_many_request_response.status_code = HTTPStatus.TOO_MANY_REQUESTS
+        mock_success_response = Mock()
+        mock_success_response.status_code = HTTPStatus.OK
+        police_client.get = AsyncMock(
+            side_effect=[
+                ReadTimeout("API is slow"),
+                mock_too_many_request_response,
+                mock_success_response,
+            ]
+        )
+        run_stats = RunStats("ingest forces", {})
+        token = RUN_STATS.set(run_stats)
+
+        await police_client.rate_limited_get("test_route")
+        RUN_STATS.reset(token)
+
+        assert run_stats.requests_by_status == {"timeout": 1, "429": 1, "200": 1}
+        assert run_stats.retries == 2
+        assert "request" in run_stats.stage_seconds
+
+    @pytest.mark.asyncio
+    async def test_traces_the_limiter_wait_and_network_of_each_attempt(
+        self, tmp_path: Path
+    ):
+        police_client = PoliceClient(max_request_retries=3)
+        mock_success_response = Mock()
+        mock_success_response.status_code = HTTPStatus.OK
+        police_client.get = AsyncMock(
+            side_effect=[ReadTimeout("API is slow"), mock_success_response]
+        )
+        exporter = JsonLinesExporter(tmp_path / "trace.jsonl")
+        set_exporter(exporter)
+
+        await police_client.rate_limited_get("test_route")
+        set_exporter(None)
+        exporter.close()
+
+        spans = [json.loads(line) for line in exporter.path.read_text().splitlines()]
+        assert [(span["name"], span["error"]) for span in spans] == [
+            ("limiter_wait", None),
+            ("network", "ReadTimeout"),
+            ("limiter_wait", None),
+            ("network", None),
+        ]
+        assert [span["attributes"] for span in spans[1::2]] == [
+            {"attempt": 1},
+            {"attempt": 2},
+        ]
+
     @pytest.mark.asyncio
     async def test_logs_warning_if_retrying(self, caplog: LogCaptureFixture):
         police_client = PoliceClient(max_request_retries=3)
@@ -567,6 +715,63 @@ class TestRateLimitedGet:
             == "The rate limit on the API has been exceeded. Currently at attempt '1' of '3'. Retrying..."
         )
 
+    @pytest.mark.asyncio
+    async def test_records_rate_limited_responses_and_retries_metrics(self):
+        police_client = PoliceClient(max_request_retries=3)
+        mock_get = AsyncMock()
+        police_client.get = mock_get
+        mock_too_many_request_response = Mock()
+        mock_too_many_request_response.status_code = HTTPStatus.TOO_MANY_REQUESTS
+        mock_success_response = Mock()
+        mock_success_response.status_code = 200
+        mock_get.side_effect = [mock_too_many_request_response, mock_success_response]
+        labels = {"endpoint": "metrics_route"}
+        rate_limited_before = get_sample_value(
+            "police_api_rate_limited_responses_total", labels
+        )
+        retries_before = get_sample_value("police_api_request_retries_total", labels)
+        requests_before = get_sample_value(
+            "police_api_request_duration_seconds_count", labels
+        )
+
+        await police_client.rate_limited_get("metrics_route?force=force-one")
+
+        assert (
+            get_sample_value("police_api_rate_limited_responses_total", labels)
+            == rate_limited_before + 1
+        )
+        assert (
+            get_sample_value("police_api_request_retries_total", labels)
+            == retries_before + 1
+        )
+        assert (
+            get_sample_value("police_api_request_duration_seconds_count", labels)
+            == requests_before + 2
+        )
+
+    @pytest.mark.asyncio
+    async def test_records_timeout_metrics(self):
+        police_client = PoliceClient(max_request_retries=2)
+        mock_get = AsyncMock()
+        police_client.get = mock_get
+        mock_success_response = Mock()
+        mock_success_response.status_code = 200
+        mock_get.side_effect = [ReadTimeout("too slow"), mock_success_response]
+        labels = {"endpoint": "timeout_route"}
+        timeouts_before = get_sample_value("police_api_request_timeouts_total", labels)
+
+        response = await police_client.rate_limited_get("timeout_route")
+
+        assert response is mock_success_response
+        assert (
+            get_sample_value("police_api_request_timeouts_total", labels)
+            == timeouts_before + 1
+        )
+
+
+def get_sample_value(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
 
 def record_call_time(call_log: list[float]):
     call_log.append(monotonic())
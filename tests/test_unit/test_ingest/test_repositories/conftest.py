@@ -1,8 +1,11 @@
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
 from sqlalchemy import Engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import Insert
 from sqlmodel import Session
 
 from police_api_ingester.police_client import PoliceClient
@@ -26,3 +29,13 @@ def mock_session() -> Generator[Session, None, None]:
         mock_session = Mock()
         mock_session_enter.return_value = mock_session
         yield mock_session
+
+
+@pytest.fixture
+def get_parameters() -> Callable[[Insert], list[Any]]:
+    """Returns the values bound to an insert statement in the order they appear."""
+
+    def get(statement: Insert) -> list[Any]:
+        return list(statement.compile(dialect=postgresql.dialect()).params.values())
+
+    return get
@@ -0,0 +1,190 @@
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from pytest import LogCaptureFixture
+from sqlalchemy import Engine
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from police_api_ingester.models import (
+    StopAndSearchCountByEthnicity,
+    StopAndSearchCountByLegislation,
+    StopAndSearchCountByOutcome,
+)
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories import AggregateRepository
+
+
+@pytest.fixture
+def aggregate_repository(
+    mock_engine: Engine, mock_police_client: PoliceClient
+) -> AggregateRepository:
+    return AggregateRepository(mock_engine, mock_police_client)
+
+
+class TestRefreshAggregates:
+    @pytest.mark.asyncio
+    async def test_deletes_and_recounts_every_aggregate_table_in_one_commit(
+        self,
+        mock_session: Session,
+        aggregate_repository: AggregateRepository,
+    ):
+        mock_session.exec.return_value.rowcount = 2
+
+        success = await aggregate_repository.refresh_aggregates(
+            [("2023-01", "force-1"), ("2023-12", "force-2")]
+        )
+
+        assert success is True
+        statements = [call.args[0] for call in mock_session.exec.call_args_list]
+        assert [
+            (statement.__visit_name__, statement.table.name) for statement in statements
+        ] == [
+            ("delete", StopAndSearchCountByOutcome.__tablename__),
+            ("insert", StopAndSearchCountByOutcome.__tablename__),
+            ("delete", StopAndSearchCountByEthnicity.__tablename__),
+            ("insert", StopAndSearchCountByEthnicity.__tablename__),
+            ("delete", StopAndSearchCountByLegislation.__tablename__),
+            ("insert", StopAndSearchCountByLegislation.__tablename__),
+        ]
+        mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_recounts_the_source_month_of_each_slice(
+        self,
+        mock_session: Session,
+        aggregate_repository: AggregateRepository,
+        get_parameters: Callable[[Insert], list[Any]],
+    ):
+        mock_session.exec.return_value.rowcount = 2
+
+        await aggregate_repository.refresh_aggregates(
+            [("2023-01", "force-1"), ("2023-12", "force-2")]
+        )
+
+        insert = mock_session.exec.call_args_list[1].args[0]
+        assert get_parameters(insert) == [
+            ["force-1", "force-2"],
+            ["2023-01", "2023-12"],
+        ]
+        assert '"SourceYearMonth" = "Slice"."YearMonth"' in str(insert)
+
+    @pytest.mark.asyncio
+    async def test_does_not_open_a_session_when_there_are_no_slices(
+        self,
+        mock_session: Session,
+        aggregate_repository: AggregateRepository,
+    ):
+        success = await aggregate_repository.refresh_aggregates([])
+
+        assert success is True
+        mock_session.exec.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_when_cannot_refresh_aggregates(
+        self,
+        mock_session: Session,
+        aggregate_repository: AggregateRepository,
+        caplog: LogCaptureFixture,
+    ):
+        mock_session.exec.side_effect = SQLAlchemyError()
+
+        success = await aggregate_repository.refresh_aggregates(
+            [("2023-01", "force-1"), ("2023-02", "force-1")]
+        )
+
+        assert success is False
+        mock_session.commit.assert_not_called()
+        record = caplog.records[-1]
+        assert (
+            record.message
+            == "Cannot refresh the aggregates in the database for 2 force and month slices."
+        )
+        assert record.levelname == "WARNING"
+
+
+class TestGetRowCounts:
+    @pytest.mark.asyncio
+    async def test_returns_the_row_count_of_each_slice(
+        self, mock_engine: Mock, aggregate_repository: AggregateRepository
+    ):
+        mock_connection = Mock()
+        mock_engine.connect.return_value = MagicMock()
+        mock_engine.connect.return_value.__enter__.return_value = mock_connection
+        mock_connection.execute.return_value = [
+            ("2023-01", "force-1", 120),
+            ("2023-02", "force-1", 80),
+        ]
+
+        row_counts = await aggregate_repository.get_row_counts()
+
+        assert row_counts == {("2023-01", "force-1"): 120, ("2023-02", "force-1"): 80}
+        query = mock_connection.execute.call_args.args[0]
+        assert (
+            query.get_final_froms()[0].name == StopAndSearchCountByOutcome.__tablename__
+        )
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_when_cannot_get_row_counts(
+        self,
+        mock_engine: Mock,
+        aggregate_repository: AggregateRepository,
+        caplog: LogCaptureFixture,
+    ):
+        mock_engine.connect.side_effect = SQLAlchemyError("Database says no!")
+
+        row_counts = await aggregate_repository.get_row_counts()
+
+        assert row_counts is None
+        record = caplog.records[-1]
+        assert (
+            record.message
+            == "Cannot get the StopAndSearch row counts from the aggregates in the database."
+        )
+        assert record.levelname == "WARNING"
+
+
+class TestRefreshAggregatesBetween:
+    @pytest.mark.asyncio
+    async def test_refreshes_the_available_date_force_ids_between_the_dates(
+        self, aggregate_repository: AggregateRepository
+    ):
+        slices = [("2023-01", "force-1"), ("2023-02", "force-1")]
+        aggregate_repository.available_date_repository = Mock()
+        aggregate_repository.available_date_repository.get_available_date_force_ids = (
+            AsyncMock(return_value=slices)
+        )
+        aggregate_repository.refresh_aggregates = AsyncMock(return_value=True)
+        from_datetime = datetime(2023, 1, 1)
+        to_datetime = datetime(2023, 2, 28)
+
+        success = await aggregate_repository.refresh_aggregates_between(
+            from_datetime, to_datetime
+        )
+
+        assert success is True
+        aggregate_repository.available_date_repository.get_available_date_force_ids.assert_awaited_once_with(
+            from_datetime, to_datetime
+        )
+        aggregate_repository.refresh_aggregates.assert_awaited_once_with(slices)
+
+    @pytest.mark.asyncio
+    async def test_returns_false_when_cannot_get_available_date_force_ids(
+        self, aggregate_repository: AggregateRepository
+    ):
+        aggregate_repository.available_date_repository = Mock()
+        aggregate_repository.available_date_repository.get_available_date_force_ids = (
+            AsyncMock(return_value=None)
+        )
+        aggregate_repository.refresh_aggregates = AsyncMock()
+
+        success = await aggregate_repository.refresh_aggregates_between(
+            datetime(2023, 1, 1), datetime(2023, 2, 28)
+        )
+
+        assert success is False
+        aggregate_repository.refresh_aggregates.assert_not_awaited()
@@ -1,10 +1,13 @@
+from collections.abc import Callable
 from datetime import datetime
-from unittest.mock import AsyncMock, Mock, call, patch
+from typing import Any
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from httpx import HTTPStatusError
 from pytest import LogCaptureFixture
 from sqlalchemy import Engine
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql.operators import ge, le
 from sqlmodel import Session
@@ -38,12 +41,13 @@ def available_date_repository(
 
 class TestStoreAvailableDates:
     @pytest.mark.asyncio
-    async def test_calls_store_available_date_on_dates_returned_from_the_api(
+    async def test_upserts_available_dates_and_mappings_returned_from_the_api(
         self,
         mock_session: Session,
         available_date_repository: AvailableDateRepository,
         mock_force_repository: ForceRepository,
         mock_police_client: PoliceClient,
+        get_parameters: Callable[[Insert], list[Any]],
     ):
         forces = [
             Force(id="force-1", name="Force One"),
@@ -63,10 +67,11 @@ class TestStoreAvailableDates:
         ]
         mock_force_repository.store_forces.return_value = forces
         mock_police_client.get_available_dates.return_value = available_dates
-        available_date_repository.store_available_date = AsyncMock()
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = []
-        available_date_repository.store_available_date.return_value = True
+        mock_session.exec.return_value.all.return_value = [
+            ("2023-02", 1),
+            ("2023-03", 2),
+            ("2023-04", 3),
+        ]
         from_date = datetime(2023, 1, 1)
         to_date = datetime(2023, 5, 1)
 
@@ -75,30 +80,18 @@ class TestStoreAvailableDates:
         )
 
         assert success is True
-        available_date_repository.store_available_date.assert_has_awaits(
-            [
-                call(
-                    AvailableDateWithForceIds(
-                        **{"date": "2023-02", "stop-and-search": ["force-1"]}
-                    ),
-                    [],
-                ),
-                call(
-                    AvailableDateWithForceIds(
-                        **{"date": "2023-03", "stop-and-search": ["force-2"]}
-                    ),
-                    [],
-                ),
-                call(
-                    AvailableDateWithForceIds(
-                        **{"date": "2023-04", "stop-and-search": ["force-3"]}
-                    ),
-                    [],
-                ),
-            ],
-            any_order=True,
-        )
-        mock_session.commit.assert_not_called()
+        assert mock_session.exec.call_count == 2
+        dates_statement, mappings_statement = [
+            call.args[0] for call in mock_session.exec.call_args_list
+        ]
+        assert dates_statement.table == AvailableDate.__table__
+        assert get_parameters(dates_statement) == [["2023-02", "2023-03", "2023-04"]]
+        assert mappings_statement.table == AvailableDateForceMapping.__table__
+        assert get_parameters(mappings_statement) == [
+            [1, 2, 3],
+            ["force-1", "force-2", "force-3"],
+        ]
+        mock_session.commit.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_calls_force_repository_is_called_with_correct_force_ids(
@@ -117,19 +110,10 @@ class TestStoreAvailableDates:
             AvailableDateWithForceIds(
                 **{"date": "2023-02", "stop-and-search": ["force-1"]}
             ),
-            AvailableDateWithForceIds(
-                **{"date": "2023-03", "stop-and-search": ["force-2"]}
-            ),
-            AvailableDateWithForceIds(
-                **{"date": "2023-04", "stop-and-search": ["force-3"]}
-            ),
         ]
         mock_force_repository.store_forces.return_value = forces
         mock_police_client.get_available_dates.return_value = available_dates
-        available_date_repository.store_available_date = AsyncMock()
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = []
-        available_date_repository.store_available_date.return_value = True
+        mock_session.exec.return_value.all.return_value = [("2023-02", 1)]
         from_date = datetime(2023, 1, 1)
         to_date = datetime(2023, 5, 1)
 
@@ -150,6 +134,7 @@ class TestStoreAvailableDates:
         available_date_repository: AvailableDateRepository,
         mock_force_repository: ForceRepository,
         mock_police_client: PoliceClient,
+        get_parameters: Callable[[Insert], list[Any]],
     ):
         forces = [
             Force(id="force-1", name="Force One"),
@@ -169,9 +154,11 @@ class TestStoreAvailableDates:
         ]
         mock_force_repository.store_forces.return_value = forces
         mock_police_client.get_available_dates.return_value = available_dates
-        available_date_repository.store_available_date = AsyncMock()
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = []
+        mock_session.exec.return_value.all.return_value = [
+            ("2023-02", 1),
+            ("2023-03", 2),
+            ("2023-04", 3),
+        ]
         from_date = datetime(2023, 1, 1)
         to_date = datetime(2023, 5, 1)
 
@@ -180,8 +167,34 @@ class TestStoreAvailableDates:
         )
 
         assert success is True
+        assert mock_session.exec.call_count == 3
+        forces_statement = mock_session.exec.call_args_list[0].args[0]
+        assert forces_statement.table == Force.__table__
+        assert get_parameters(forces_statement) == [["force-4"]]
         mock_session.commit.assert_called_once()
-        mock_session.add_all.assert_called_once_with({Force(id="force-4")})
+
+    @pytest.mark.asyncio
+    async def test_does_not_write_to_the_database_if_the_api_returns_no_dates(
+        self,
+        mock_session: Session,
+        available_date_repository: AvailableDateRepository,
+        mock_force_repository: ForceRepository,
+        mock_police_client: PoliceClient,
+    ):
+        mock_force_repository.store_forces.return_value = [
+            Force(id="force-1", name="Force One")
+        ]
+        mock_police_client.get_available_dates.return_value = []
+        from_date = datetime(2023, 1, 1)
+        to_date = datetime(2023, 5, 1)
+
+        success = await available_date_repository.store_available_dates(
+            from_date, to_date
+        )
+
+        assert success is True
+        mock_session.exec.assert_not_called()
+        mock_session.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_returns_false_if_no_forces_are_stored(
@@ -205,9 +218,6 @@ class TestStoreAvailableDates:
         ]
         mock_force_repository.store_forces.return_value = forces
         mock_police_client.get_available_dates.return_value = available_dates
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = []
-        available_date_repository.store_available_date = AsyncMock()
         from_date = datetime(2023, 1, 1)
         to_date = datetime(2023, 5, 1)
 
@@ -216,6 +226,7 @@ class TestStoreAvailableDates:
         )
 
         assert success is False
+        mock_session.exec.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_returns_false_if_cannot_get_available_dates_from_api(
@@ -234,36 +245,6 @@ class TestStoreAvailableDates:
         mock_police_client.get_available_dates.side_effect = HTTPStatusError(
             "cannot get available dates", request=Mock(), response=Mock()
         )
-        available_date_repository.store_available_date = AsyncMock()
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = []
-        from_date = datetime(2023, 1, 1)
-        to_date = datetime(2023, 5, 1)
-
-        success = await available_date_repository.store_available_dates(
-            from_date, to_date
-        )
-
-        assert success is False
-
-    @pytest.mark.asyncio
-    async def test_returns_false_if_cannot_get_available_dates_from_the_database(
-        self,
-        mock_session: Session,
-        available_date_repository: AvailableDateRepository,
-        mock_force_repository: ForceRepository,
-        mock_police_client: PoliceClient,
-    ):
-        forces = [
-            Force(id="force-1", name="Force One"),
-            Force(id="force-2", name="Force Two"),
-            Force(id="force-3", name="Force Three"),
-        ]
-        mock_force_repository.store_forces.return_value = forces
-        mock_police_client.get_available_dates.return_value = []
-        available_date_repository.store_available_date = AsyncMock()
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = None
         from_date = datetime(2023, 1, 1)
         to_date = datetime(2023, 5, 1)
 
@@ -300,31 +281,28 @@ class TestStoreAvailableDates:
         ]
         mock_force_repository.store_forces.return_value = forces
         mock_police_client.get_available_dates.return_value = available_dates
-        available_date_repository.store_available_date = AsyncMock()
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = []
         from_date = datetime(2023, 1, 1)
         to_date = datetime(2023, 5, 1)
-        mock_session.commit.side_effect = SQLAlchemyError(
-            "database not storing available dates"
-        )
+        mock_session.exec.side_effect = SQLAlchemyError("database not storing forces")
 
         success = await available_date_repository.store_available_dates(
             from_date, to_date
         )
 
         assert success is False
+        mock_session.commit.assert_not_called()
         record = caplog.records[-1]
         assert record.message == "Cannot store missing Forces in the database."
         assert record.levelname == "ERROR"
 
     @pytest.mark.asyncio
-    async def test_returns_false_if_a_single_store_available_date_fails(
+    async def test_logs_warning_when_cannot_store_available_dates_and_mappings(
         self,
         mock_session: Session,
         available_date_repository: AvailableDateRepository,
         mock_force_repository: ForceRepository,
         mock_police_client: PoliceClient,
+        caplog: LogCaptureFixture,
     ):
         forces = [
             Force(id="force-1", name="Force One"),
@@ -335,19 +313,11 @@ class TestStoreAvailableDates:
             AvailableDateWithForceIds(
                 **{"date": "2023-02", "stop-and-search": ["force-1"]}
             ),
-            AvailableDateWithForceIds(
-                **{"date": "2023-03", "stop-and-search": ["force-2"]}
-            ),
-            AvailableDateWithForceIds(
-                **{"date": "2023-04", "stop-and-search": ["force-3"]}
-            ),
         ]
         mock_force_repository.store_forces.return_value = forces
         mock_police_client.get_available_dates.return_value = available_dates
-        available_date_repository.store_available_date = AsyncMock()
-        available_date_repository.get_available_dates = AsyncMock()
-        available_date_repository.get_available_dates.return_value = []
-        available_date_repository.store_available_date.side_effect = [True, False, True]
+        mock_session.exec.return_value.all.return_value = [("2023-02", 1)]
+        mock_session.commit.side_effect = SQLAlchemyError("Oh No!")
         from_date = datetime(2023, 1, 1)
         to_date = datetime(2023, 5, 1)
 
@@ -356,129 +326,14 @@ class TestStoreAvailableDates:
         )
 
         assert success is False
-
-
-class TestStoreAvailableDate:
-    @pytest.mark.asyncio
-    async def test_stores_available_date_and_mappings(
-        self, mock_session: Session, available_date_repository: AvailableDateRepository
-    ):
-        year_month = "2023-01"
-        force_ids = ["force-1", "force-2", "force-3"]
-        available_date_with_force_ids = AvailableDateWithForceIds(
-            **{"date": year_month, "stop-and-search": force_ids}
-        )
-        mock_session.add.side_effect = set_id
-
-        success = await available_date_repository.store_available_date(
-            available_date_with_force_ids, []
-        )
-
-        assert success is True
-        mock_session.add.assert_called_once_with(
-            AvailableDate(year_month=year_month, id=1)
-        )
-        mock_session.add_all.assert_called_once_with(
-            [
-                AvailableDateForceMapping(available_date_id=1, force_id="force-1"),
-                AvailableDateForceMapping(available_date_id=1, force_id="force-2"),
-                AvailableDateForceMapping(available_date_id=1, force_id="force-3"),
-            ],
-        )
-        mock_session.commit.assert_called_once()
-        mock_session.flush.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_stores_available_date_and_mappings_that_dont_exist(
-        self, mock_session: Session, available_date_repository: AvailableDateRepository
-    ):
-        year_month = "2023-01"
-        force_ids = ["force-1", "force-2", "force-3"]
-        available_date_with_force_ids = AvailableDateWithForceIds(
-            **{"date": year_month, "stop-and-search": force_ids}
-        )
-        mock_session.add.side_effect = set_id
-
-        success = await available_date_repository.store_available_date(
-            available_date_with_force_ids,
-            [
-                AvailableDate(
-                    id=1,
-                    year_month=year_month,
-                    forces=[Force(id="force-1", name="Force One")],
-                )
-            ],
-        )
-
-        assert success is True
-        mock_session.add_all.assert_called_once_with(
-            [
-                AvailableDateForceMapping(available_date_id=1, force_id="force-2"),
-                AvailableDateForceMapping(available_date_id=1, force_id="force-3"),
-            ],
-        )
-        mock_session.commit.assert_called_once()
-        mock_session.flush.assert_not_called()
-        mock_session.add.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_logs_warning_when_cannot_flush_available_date(
-        self,
-        mock_session: Session,
-        available_date_repository: AvailableDateRepository,
-        caplog: LogCaptureFixture,
-    ):
-        year_month = "2023-01"
-        force_ids = ["force-1", "force-2", "force-3"]
-        available_date_with_force_ids = AvailableDateWithForceIds(
-            **{"date": year_month, "stop-and-search": force_ids}
-        )
-        mock_session.flush.side_effect = SQLAlchemyError("Oh No!")
-
-        success = await available_date_repository.store_available_date(
-            available_date_with_force_ids, []
-        )
-
-        assert success is False
-        record = caplog.records[-1]
-        assert record.levelname == "WARNING"
-        assert (
-            record.message
-            == "Cannot flush AvailableDate to the database for date '2023-01'."
-        )
-
-    @pytest.mark.asyncio
-    async def test_logs_warning_when_cannot_commit_available_date_and_mappings(
-        self,
-        mock_session: Session,
-        available_date_repository: AvailableDateRepository,
-        caplog: LogCaptureFixture,
-    ):
-        year_month = "2023-01"
-        force_ids = ["force-1", "force-2", "force-3"]
-        available_date_with_force_ids = AvailableDateWithForceIds(
-            **{"date": year_month, "stop-and-search": force_ids}
-        )
-        mock_session.commit.side_effect = SQLAlchemyError("Oh No!")
-
-        success = await available_date_repository.store_available_date(
-            available_date_with_force_ids, []
-        )
-
-        assert success is False
         record = caplog.records[-1]
         assert record.levelname == "WARNING"
         assert (
             record.message
-            == "Cannot store AvailableDate and AvailableDateForceMappings in the database for date '2023-01'."
+            == "Cannot store AvailableDates and AvailableDateForceMappings in the database between '2023-01' and '2023-05'."
         )
 
 
-def set_id(date: AvailableDate):
-    if isinstance(date, AvailableDate):
-        date.id = 1
-
-
 class TestGetAvailableDates:
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
@@ -551,3 +406,66 @@ class TestGetAvailableDates:
             record.message == "Could not retrieve AvailableDates from the "
             "database between '2023-01' to '2023-04'."
         )
+
+
+class TestGetAvailableDateForceIds:
+    @pytest.mark.asyncio
+    async def test_returns_year_month_and_force_id_pairs_from_a_connection(
+        self,
+        mock_engine: Mock,
+        available_date_repository: AvailableDateRepository,
+    ):
+        mock_connection = Mock()
+        mock_engine.connect.return_value = MagicMock()
+        mock_engine.connect.return_value.__enter__.return_value = mock_connection
+        mock_connection.execute.return_value.tuples.return_value.all.return_value = [
+            ("2023-01", "force-1"),
+            ("2023-02", "force-1"),
+        ]
+        from_date = datetime(2023, 1, 1)
+        to_date = datetime(2023, 4, 1)
+
+        available_date_force_ids = (
+            await available_date_repository.get_available_date_force_ids(
+                from_date, to_date
+            )
+        )
+
+        assert available_date_force_ids == [
+            ("2023-01", "force-1"),
+            ("2023-02", "force-1"),
+        ]
+        query = mock_connection.execute.call_args.args[0]
+        assert [column.name for column in query.selected_columns] == [
+            "YearMonth",
+            "ForceId",
+        ]
+        assert query.compile().params == {
+            "YearMonth_1": "2023-01",
+            "YearMonth_2": "2023-04",
+        }
+
+    @pytest.mark.asyncio
+    async def test_logs_error_when_cannot_get_available_date_force_ids(
+        self,
+        mock_engine: Mock,
+        available_date_repository: AvailableDateRepository,
+        caplog: LogCaptureFixture,
+    ):
+        mock_engine.connect.side_effect = SQLAlchemyError("Database says no!")
+        from_date = datetime(2023, 1, 1)
+        to_date = datetime(2023, 4, 1)
+
+        available_date_force_ids = (
+            await available_date_repository.get_available_date_force_ids(
+                from_date, to_date
+            )
+        )
+
+        assert available_date_force_ids is None
+        record = caplog.records[-1]
+        assert record.levelname == "ERROR"
+        assert (
+            record.message == "Could not retrieve AvailableDateForceMappings from the "
+            "database between '2023-01' to '2023-04'."
+        )
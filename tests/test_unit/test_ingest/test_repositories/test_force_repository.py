@@ -1,9 +1,12 @@
-from unittest.mock import AsyncMock, Mock, call, patch
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from httpx import HTTPStatusError
 from pytest import LogCaptureFixture, Session
 from sqlalchemy import Engine
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.exc import SQLAlchemyError
 
 from police_api_ingester.models import Force
@@ -25,6 +28,7 @@ class TestStoreForces:
         mock_session: Mock,
         force_repository: ForceRepository,
         mock_police_client: PoliceClient,
+        get_parameters: Callable[[Insert], list[Any]],
     ):
         forces = [
             Force(id="force-1", name="Force One"),
@@ -33,27 +37,31 @@ class TestStoreForces:
         ]
         mock_police_client.get_forces.return_value = forces
         mock_session.exec.return_value.all.return_value = []
+        mock_session.exec.return_value.scalars.return_value.all.return_value = [
+            "force-1",
+            "force-2",
+            "force-3",
+        ]
 
         stored_forces = await force_repository.store_forces(["force-1"])
 
         assert stored_forces == forces
         mock_police_client.get_forces.assert_called_once_with(["force-1"])
-        mock_session.add_all.assert_called_once_with(forces)
+        statement = mock_session.exec.call_args_list[-1].args[0]
+        assert statement.table == Force.__table__
+        assert get_parameters(statement) == [
+            ["force-1", "force-2", "force-3"],
+            ["Force One", "Force Two", "Force Three"],
+        ]
         mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_has_calls(
-            [
-                call(Force(id="force-1", name="Force One")),
-                call(Force(id="force-2", name="Force Two")),
-                call(Force(id="force-3", name="Force Three")),
-            ]
-        )
 
     @pytest.mark.asyncio
-    async def test_stores_only_force_not_in_database(
+    async def test_stores_only_forces_that_are_new_or_renamed(
         self,
         mock_session: Mock,
         force_repository: ForceRepository,
         mock_police_client: PoliceClient,
+        get_parameters: Callable[[Insert], list[Any]],
     ):
         forces = [
             Force(id="force-1", name="Force One"),
@@ -63,20 +71,48 @@ class TestStoreForces:
         mock_police_client.get_forces.return_value = forces
         force_repository.get_all_forces = AsyncMock()
         force_repository.get_all_forces.return_value = [
-            Force(id="force-1", name="Force One")
+            Force(id="force-1", name="Force One"),
+            Force(id="force-2", name="Old Force Two"),
+        ]
+        mock_session.exec.return_value.scalars.return_value.all.return_value = [
+            "force-2",
+            "force-3",
         ]
 
         stored_forces = await force_repository.store_forces()
 
         assert stored_forces == forces
-        mock_session.add_all.assert_called_once_with(forces[1:])
+        mock_session.exec.assert_called_once()
+        assert get_parameters(mock_session.exec.call_args.args[0]) == [
+            ["force-2", "force-3"],
+            ["Force Two", "Force Three"],
+        ]
         mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_has_calls(
-            [
-                call(Force(id="force-2", name="Force Two")),
-                call(Force(id="force-3", name="Force Three")),
-            ]
-        )
+
+    @pytest.mark.asyncio
+    async def test_does_not_write_to_the_database_when_forces_are_unchanged(
+        self,
+        mock_session: Mock,
+        force_repository: ForceRepository,
+        mock_police_client: PoliceClient,
+    ):
+        forces = [
+            Force(id="force-1", name="Force One"),
+            Force(id="force-2", name="Force Two"),
+        ]
+        mock_police_client.get_forces.return_value = forces
+        force_repository.get_all_forces = AsyncMock()
+        force_repository.get_all_forces.return_value = [
+            Force(id="force-1", name="Force One"),
+            Force(id="force-2", name="Force Two"),
+            Force(id="force-3", name="Force Three"),
+        ]
+
+        stored_forces = await force_repository.store_forces()
+
+        assert stored_forces == force_repository.get_all_forces.return_value
+        mock_session.exec.assert_not_called()
+        mock_session.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_return_none_when_get_forces_throw_http_status_error(
@@ -141,32 +177,6 @@ class TestStoreForces:
         assert record.levelname == "ERROR"
         assert record.message == "Could not store Forces in the database."
 
-    @pytest.mark.asyncio
-    async def test_logs_error_when_cannot_refresh_forces_in_database(
-        self,
-        mock_session: Mock,
-        force_repository: ForceRepository,
-        mock_police_client: PoliceClient,
-        caplog: LogCaptureFixture,
-    ):
-        forces = [
-            Force(id="force-1", name="Force One"),
-            Force(id="force-2", name="Force Two"),
-            Force(id="force-3", name="Force Three"),
-        ]
-        mock_police_client.get_forces.return_value = forces
-        mock_session.exec.return_value.all.return_value = []
-        mock_session.refresh.side_effect = SQLAlchemyError(
-            "database not accepting forces"
-        )
-
-        stored_forces = await force_repository.store_forces()
-
-        assert stored_forces is None
-        record = caplog.records[-1]
-        assert record.levelname == "ERROR"
-        assert record.message == "Could not refresh Forces in the database."
-
 
 class TestGetAllForces:
     @pytest.mark.asyncio
@@ -0,0 +1,82 @@
+from datetime import UTC, datetime
+
+import pytest
+from pytest import LogCaptureFixture
+from sqlalchemy import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from police_api_ingester.models import RunReport
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories import RunReportRepository
+from police_api_ingester.run_stats import RunStats
+
+
+@pytest.fixture
+def run_report_repository(
+    mock_engine: Engine, mock_police_client: PoliceClient
+) -> RunReportRepository:
+    return RunReportRepository(mock_engine, mock_police_client)
+
+
+@pytest.fixture
+def run_stats() -> RunStats:
+    run_stats = RunStats(
+        "ingest forces",
+        {"force_ids": "avon-and-somerset"},
+        started_at=datetime(2024, 1, 1, 1, tzinfo=UTC),
+        ended_at=datetime(2024, 1, 1, 2, tzinfo=UTC),
+    )
+    run_stats.requests_by_status["200"] += 1
+    run_stats.rows_written["Force"] += 1
+    run_stats.stage_seconds["request"] += 0.5
+    return run_stats
+
+
+class TestStoreRunReport:
+    @pytest.mark.asyncio
+    async def test_stores_the_run_stats(
+        self,
+        mock_session: Session,
+        run_report_repository: RunReportRepository,
+        run_stats: RunStats,
+    ):
+        success = await run_report_repository.store_run_report(run_stats)
+
+        assert success is True
+        run_report = mock_session.add.call_args.args[0]
+        assert run_report == RunReport(
+            command="ingest forces",
+            arguments={"force_ids": "avon-and-somerset"},
+            started_at=datetime(2024, 1, 1, 1, tzinfo=UTC),
+            ended_at=datetime(2024, 1, 1, 2, tzinfo=UTC),
+            error=None,
+            requests_by_status={"200": 1},
+            retries=0,
+            limiter_wait_seconds=0.0,
+            rows_parsed=0,
+            rows_rejected=0,
+            rows_written={"Force": 1},
+            stage_seconds={"request": 0.5},
+        )
+        mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_when_cannot_store_run_report(
+        self,
+        mock_session: Session,
+        run_report_repository: RunReportRepository,
+        run_stats: RunStats,
+        caplog: LogCaptureFixture,
+    ):
+        mock_session.commit.side_effect = SQLAlchemyError()
+
+        success = await run_report_repository.store_run_report(run_stats)
+
+        assert success is False
+        record = caplog.records[-1]
+        assert (
+            record.message
+            == "Cannot store the RunReport of 'ingest forces' in the database."
+        )
+        assert record.levelname == "WARNING"
@@ -0,0 +1,102 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from pytest import LogCaptureFixture
+from sqlalchemy import Engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+
+from police_api_ingester.police_client import PoliceClient
+from police_api_ingester.repositories import StopAndSearchChecksumRepository
+
+
+@pytest.fixture
+def mock_connection(mock_engine: Engine) -> Mock:
+    mock_connection = Mock()
+    for method in [mock_engine.connect, mock_engine.begin]:
+        method.return_value = MagicMock()
+        method.return_value.__enter__.return_value = mock_connection
+    return mock_connection
+
+
+@pytest.fixture
+def checksum_repository(
+    mock_engine: Engine, mock_police_client: PoliceClient
+) -> StopAndSearchChecksumRepository:
+    return StopAndSearchChecksumRepository(mock_engine, mock_police_client)
+
+
+class TestGetChecksum:
+    @pytest.mark.asyncio
+    async def test_returns_the_stored_checksum(
+        self,
+        mock_connection: Mock,
+        checksum_repository: StopAndSearchChecksumRepository,
+    ):
+        mock_connection.execute.return_value.scalar_one_or_none.return_value = b"1"
+
+        checksum = await checksum_repository.get_checksum("force-one", "2023-01")
+
+        assert checksum == b"1"
+        query = mock_connection.execute.call_args.args[0]
+        assert list(query.compile(dialect=postgresql.dialect()).params.values()) == [
+            "force-one",
+            "2023-01",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_and_returns_none_when_cannot_get_checksum(
+        self,
+        mock_connection: Mock,
+        checksum_repository: StopAndSearchChecksumRepository,
+        caplog: LogCaptureFixture,
+    ):
+        mock_connection.execute.side_effect = SQLAlchemyError()
+
+        checksum = await checksum_repository.get_checksum("force-one", "2023-01")
+
+        assert checksum is None
+        record = caplog.records[-1]
+        assert record.levelname == "WARNING"
+        assert record.message == (
+            "Cannot get the StopAndSearchChecksum for 'force-one' on date '2023-01' "
+            "from the database."
+        )
+
+
+class TestStoreChecksum:
+    @pytest.mark.asyncio
+    async def test_replaces_the_stored_checksum(
+        self,
+        mock_connection: Mock,
+        checksum_repository: StopAndSearchChecksumRepository,
+    ):
+        success = await checksum_repository.store_checksum(
+            "force-one", "2023-01", b"checksum"
+        )
+
+        assert success is True
+        statement = mock_connection.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert 'ON CONFLICT ("ForceId", "YearMonth") DO UPDATE' in sql
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_when_cannot_store_checksum(
+        self,
+        mock_connection: Mock,
+        checksum_repository: StopAndSearchChecksumRepository,
+        caplog: LogCaptureFixture,
+    ):
+        mock_connection.execute.side_effect = SQLAlchemyError()
+
+        success = await checksum_repository.store_checksum(
+            "force-one", "2023-01", b"checksum"
+        )
+
+        assert success is False
+        record = caplog.records[-1]
+        assert record.levelname == "WARNING"
+        assert record.message == (
+            "Cannot store the StopAndSearchChecksum for 'force-one' on date "
+            "'2023-01' in the database."
+        )
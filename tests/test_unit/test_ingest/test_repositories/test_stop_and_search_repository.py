@@ -1,19 +1,33 @@
+from collections import namedtuple
 from collections.abc import Generator
-from datetime import datetime
-from unittest.mock import AsyncMock, Mock, call, patch
+from contextlib import aclosing
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
 
 import pytest
 from httpx import HTTPStatusError
 from pytest import LogCaptureFixture
 from sqlalchemy import Engine
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
-from police_api_ingester.models import AvailableDate, Force, StopAndSearch
+from police_api_ingester.bloom_filter import BloomFilter
+from police_api_ingester.models import StopAndSearch, StopAndSearchQuarantine
 from police_api_ingester.police_client import PoliceClient
 from police_api_ingester.repositories import (
+    AggregateRepository,
+    StopAndSearchChecksumRepository,
     StopAndSearchRepository,
 )
+from police_api_ingester.repositories.stop_and_search_repository import (
+    CONTENT_COLUMNS,
+    get_checksum,
+    get_content_hash,
+    order_by_expected_rows,
+)
+from police_api_ingester.sinks import PostgresSink, SilverSink, Sink
 
 
 @pytest.fixture
@@ -26,11 +40,23 @@ def mock_session() -> Generator[Session, None, None]:
         yield mock_session
 
 
+@pytest.fixture
+def mock_aggregate_repository() -> AggregateRepository:
+    mock_aggregate_repository = Mock(spec=AggregateRepository)
+    mock_aggregate_repository.refresh_aggregates = AsyncMock(return_value=True)
+    mock_aggregate_repository.get_row_counts = AsyncMock(return_value={})
+    return mock_aggregate_repository
+
+
 @pytest.fixture
 def stop_and_search_repository(
-    mock_police_client: PoliceClient, mock_engine: Engine
+    mock_police_client: PoliceClient,
+    mock_engine: Engine,
+    mock_aggregate_repository: AggregateRepository,
 ) -> StopAndSearchRepository:
-    return StopAndSearchRepository(mock_engine, mock_police_client)
+    repository = StopAndSearchRepository(mock_engine, mock_police_client)
+    repository.aggregate_repository = mock_aggregate_repository
+    return repository
 
 
 class TestStoreStopAndSearches:
@@ -39,30 +65,24 @@ class TestStoreStopAndSearches:
         self,
         stop_and_search_repository: StopAndSearchRepository,
     ):
-        available_dates = [
-            AvailableDate(
-                year_month="2023-01",
-                forces=[
-                    Force(id="force-one", name="Force One"),
-                    Force(id="force-two", name="Force Two"),
-                    Force(id="force-three", name="Force Three"),
-                ],
-            ),
-            AvailableDate(
-                year_month="2023-02",
-                forces=[
-                    Force(id="force-one", name="Force One"),
-                    Force(id="force-two", name="Force Two"),
-                    Force(id="force-three", name="Force Three"),
-                ],
-            ),
+        available_date_force_ids = [
+            ("2023-01", "force-one"),
+            ("2023-01", "force-two"),
+            ("2023-01", "force-three"),
+            ("2023-02", "force-one"),
+            ("2023-02", "force-two"),
+            ("2023-02", "force-three"),
         ]
         mock_available_date_repository = Mock()
         stop_and_search_repository.available_date_repository = (
             mock_available_date_repository
         )
-        mock_get_available_dates = AsyncMock(return_value=available_dates)
-        mock_available_date_repository.get_available_dates = mock_get_available_dates
+        mock_get_available_date_force_ids = AsyncMock(
+            return_value=available_date_force_ids
+        )
+        mock_available_date_repository.get_available_date_force_ids = (
+            mock_get_available_date_force_ids
+        )
         stop_and_search_repository.store_stop_and_search = AsyncMock()
         stop_and_search_repository.store_stop_and_search.side_effect = [
             True,
@@ -80,8 +100,8 @@ class TestStoreStopAndSearches:
         )
 
         assert success is True
-        mock_get_available_dates.assert_called_once_with(
-            from_datetime, to_datetime, with_forces=True
+        mock_get_available_date_force_ids.assert_called_once_with(
+            from_datetime, to_datetime
         )
         stop_and_search_repository.store_stop_and_search.assert_has_awaits(
             [
@@ -95,35 +115,77 @@ class TestStoreStopAndSearches:
             any_order=True,
         )
 
+    @pytest.mark.asyncio
+    async def test_stores_the_largest_slices_first(
+        self,
+        stop_and_search_repository: StopAndSearchRepository,
+        mock_aggregate_repository: AggregateRepository,
+    ):
+        stop_and_search_repository.available_date_repository = Mock()
+        stop_and_search_repository.available_date_repository.get_available_date_force_ids = AsyncMock(
+            return_value=[("2023-01", "small-force"), ("2023-01", "large-force")]
+        )
+        mock_aggregate_repository.get_row_counts.return_value = {
+            ("2022-12", "small-force"): 10,
+            ("2022-12", "large-force"): 1000,
+        }
+        stop_and_search_repository.store_stop_and_search = AsyncMock(return_value=True)
+        from_datetime = datetime(2023, 1, 1)
+        to_datetime = datetime(2023, 1, 31)
+
+        success = await stop_and_search_repository.store_stop_and_searches(
+            from_datetime, to_datetime
+        )
+
+        assert success is True
+        assert stop_and_search_repository.store_stop_and_search.await_args_list == [
+            call("2023-01", "large-force", from_datetime, to_datetime),
+            call("2023-01", "small-force", from_datetime, to_datetime),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stores_the_slices_when_cannot_get_row_counts(
+        self,
+        stop_and_search_repository: StopAndSearchRepository,
+        mock_aggregate_repository: AggregateRepository,
+    ):
+        stop_and_search_repository.available_date_repository = Mock()
+        stop_and_search_repository.available_date_repository.get_available_date_force_ids = AsyncMock(
+            return_value=[("2023-01", "force-one"), ("2023-01", "force-two")]
+        )
+        mock_aggregate_repository.get_row_counts.return_value = None
+        stop_and_search_repository.store_stop_and_search = AsyncMock(return_value=True)
+
+        success = await stop_and_search_repository.store_stop_and_searches(
+            datetime(2023, 1, 1), datetime(2023, 1, 31)
+        )
+
+        assert success is True
+        assert stop_and_search_repository.store_stop_and_search.await_count == 2
+
     @pytest.mark.asyncio
     async def test_calls_store_available_dates_with_correct_parameters(
         self,
         stop_and_search_repository: StopAndSearchRepository,
     ):
-        available_dates = [
-            AvailableDate(
-                year_month="2023-01",
-                forces=[
-                    Force(id="force-one", name="Force One"),
-                    Force(id="force-two", name="Force Two"),
-                    Force(id="force-three", name="Force Three"),
-                ],
-            ),
-            AvailableDate(
-                year_month="2023-02",
-                forces=[
-                    Force(id="force-one", name="Force One"),
-                    Force(id="force-two", name="Force Two"),
-                    Force(id="force-three", name="Force Three"),
-                ],
-            ),
+        available_date_force_ids = [
+            ("2023-01", "force-one"),
+            ("2023-01", "force-two"),
+            ("2023-01", "force-three"),
+            ("2023-02", "force-one"),
+            ("2023-02", "force-two"),
+            ("2023-02", "force-three"),
         ]
         mock_available_date_repository = AsyncMock()
         stop_and_search_repository.available_date_repository = (
             mock_available_date_repository
         )
-        mock_get_available_dates = AsyncMock(return_value=available_dates)
-        mock_available_date_repository.get_available_dates = mock_get_available_dates
+        mock_get_available_date_force_ids = AsyncMock(
+            return_value=available_date_force_ids
+        )
+        mock_available_date_repository.get_available_date_force_ids = (
+            mock_get_available_date_force_ids
+        )
         stop_and_search_repository.store_stop_and_search = AsyncMock()
         stop_and_search_repository.store_stop_and_search.side_effect = [
             True,
@@ -175,30 +237,24 @@ class TestStoreStopAndSearches:
         self,
         stop_and_search_repository: StopAndSearchRepository,
     ):
-        available_dates = [
-            AvailableDate(
-                year_month="2023-01",
-                forces=[
-                    Force(id="force-one", name="Force One"),
-                    Force(id="force-two", name="Force Two"),
-                    Force(id="force-three", name="Force Three"),
-                ],
-            ),
-            AvailableDate(
-                year_month="2023-02",
-                forces=[
-                    Force(id="force-one", name="Force One"),
-                    Force(id="force-two", name="Force Two"),
-                    Force(id="force-three", name="Force Three"),
-                ],
-            ),
+        available_date_force_ids = [
+            ("2023-01", "force-one"),
+            ("2023-01", "force-two"),
+            ("2023-01", "force-three"),
+            ("2023-02", "force-one"),
+            ("2023-02", "force-two"),
+            ("2023-02", "force-three"),
         ]
         mock_available_date_repository = Mock()
         stop_and_search_repository.available_date_repository = (
             mock_available_date_repository
         )
-        mock_get_available_dates = AsyncMock(return_value=available_dates)
-        mock_available_date_repository.get_available_dates = mock_get_available_dates
+        mock_get_available_date_force_ids = AsyncMock(
+            return_value=available_date_force_ids
+        )
+        mock_available_date_repository.get_available_date_force_ids = (
+            mock_get_available_date_force_ids
+        )
         stop_and_search_repository.store_stop_and_search = AsyncMock()
         stop_and_search_repository.store_stop_and_search.side_effect = [
             True,
@@ -218,7 +274,54 @@ class TestStoreStopAndSearches:
         assert success is False
 
     @pytest.mark.asyncio
-    async def test_returns_false_when_cannot_retrieve_available_dates(
+    async def test_refreshes_the_aggregates_of_the_stored_slices(
+        self,
+        stop_and_search_repository: StopAndSearchRepository,
+        mock_aggregate_repository: AggregateRepository,
+    ):
+        available_date_force_ids = [
+            ("2023-01", "force-one"),
+            ("2023-01", "force-two"),
+            ("2023-02", "force-one"),
+        ]
+        stop_and_search_repository.available_date_repository = Mock()
+        stop_and_search_repository.available_date_repository.get_available_date_force_ids = AsyncMock(
+            return_value=available_date_force_ids
+        )
+        stop_and_search_repository.store_stop_and_search = AsyncMock(
+            side_effect=[True, False, True]
+        )
+
+        success = await stop_and_search_repository.store_stop_and_searches(
+            datetime(2023, 1, 1), datetime(2023, 2, 28)
+        )
+
+        assert success is False
+        mock_aggregate_repository.refresh_aggregates.assert_awaited_once_with(
+            [("2023-01", "force-one"), ("2023-02", "force-one")]
+        )
+
+    @pytest.mark.asyncio
+    async def test_returns_false_if_the_aggregates_are_not_refreshed(
+        self,
+        stop_and_search_repository: StopAndSearchRepository,
+        mock_aggregate_repository: AggregateRepository,
+    ):
+        stop_and_search_repository.available_date_repository = Mock()
+        stop_and_search_repository.available_date_repository.get_available_date_force_ids = AsyncMock(
+            return_value=[("2023-01", "force-one")]
+        )
+        stop_and_search_repository.store_stop_and_search = AsyncMock(return_value=True)
+        mock_aggregate_repository.refresh_aggregates.return_value = False
+
+        success = await stop_and_search_repository.store_stop_and_searches(
+            datetime(2023, 1, 1), datetime(2023, 1, 31)
+        )
+
+        assert success is False
+
+    @pytest.mark.asyncio
+    async def test_returns_false_when_cannot_retrieve_available_date_force_ids(
         self,
         stop_and_search_repository: StopAndSearchRepository,
     ):
@@ -226,8 +329,9 @@ class TestStoreStopAndSearches:
         stop_and_search_repository.available_date_repository = (
             mock_available_date_repository
         )
-        mock_get_available_dates = AsyncMock(return_value=None)
-        mock_available_date_repository.get_available_dates = mock_get_available_dates
+        mock_available_date_repository.get_available_date_force_ids = AsyncMock(
+            return_value=None
+        )
         from_datetime = datetime(2023, 1, 1, 1, 0, 0)
         to_datetime = datetime(2023, 2, 1, 3, 45, 0)
 
@@ -256,9 +360,9 @@ class TestStopAndSearch:
             get_mock_stop_and_search(datetime(2023, 1, 5)),
             get_mock_stop_and_search(datetime(2023, 1, 6)),
         ]
-        mock_police_client.get_stop_and_searches.side_effect = [
-            stop_and_searches_with_location,
-            stop_and_searches_without_location,
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            (stop_and_searches_with_location, []),
+            (stop_and_searches_without_location, []),
         ]
         year_month = "2023-01"
         force_id = "force-one"
@@ -273,6 +377,10 @@ class TestStopAndSearch:
         assert success is True
         mock_session.add_all.assert_called_once_with(all_stop_and_searches[1:-1])
         mock_session.commit.assert_called_once()
+        assert all(
+            stop_and_search.source_year_month == year_month
+            for stop_and_search in all_stop_and_searches[1:-1]
+        )
 
     @pytest.mark.asyncio
     async def test_police_client_stop_and_searches_called_correctly(
@@ -291,9 +399,9 @@ class TestStopAndSearch:
             get_mock_stop_and_search(datetime(2023, 1, 5)),
             get_mock_stop_and_search(datetime(2023, 1, 6)),
         ]
-        mock_police_client.get_stop_and_searches.side_effect = [
-            stop_and_searches_with_location,
-            stop_and_searches_without_location,
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            (stop_and_searches_with_location, []),
+            (stop_and_searches_without_location, []),
         ]
         year_month = "2023-01"
         force_id = "force-one"
@@ -303,7 +411,7 @@ class TestStopAndSearch:
         )
 
         assert success is True
-        mock_police_client.get_stop_and_searches.assert_has_awaits(
+        mock_police_client.get_stop_and_searches_and_quarantine.assert_has_awaits(
             [
                 call(year_month, force_id, with_location=True),
                 call(year_month, force_id, with_location=False),
@@ -318,8 +426,10 @@ class TestStopAndSearch:
         stop_and_search_repository: StopAndSearchRepository,
         mock_police_client: PoliceClient,
     ):
-        mock_police_client.get_stop_and_searches.side_effect = HTTPStatusError(
-            "cannot contact the police", request=Mock(), response=Mock()
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = (
+            HTTPStatusError(
+                "cannot contact the police", request=Mock(), response=Mock()
+            )
         )
         year_month = "2023-01"
         force_id = "force-one"
@@ -348,9 +458,9 @@ class TestStopAndSearch:
             get_mock_stop_and_search(datetime(2023, 1, 5)),
             get_mock_stop_and_search(datetime(2023, 1, 6)),
         ]
-        mock_police_client.get_stop_and_searches.side_effect = [
-            stop_and_searches_with_location,
-            stop_and_searches_without_location,
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            (stop_and_searches_with_location, []),
+            (stop_and_searches_without_location, []),
         ]
         year_month = "2023-01"
         force_id = "force-one"
@@ -368,8 +478,1058 @@ class TestStopAndSearch:
         )
         assert record.levelname == "WARNING"
 
+    @pytest.mark.asyncio
+    async def test_writes_the_same_stop_and_searches_to_every_sink(
+        self,
+        mock_engine: Engine,
+        mock_police_client: PoliceClient,
+    ):
+        stop_and_searches_with_location = [
+            get_mock_stop_and_search(datetime(2023, 1, 2)),
+        ]
+        stop_and_searches_without_location = [
+            get_mock_stop_and_search(datetime(2023, 1, 3)),
+        ]
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            (stop_and_searches_with_location, []),
+            (stop_and_searches_without_location, []),
+        ]
+        sinks = [Mock(spec=Sink), Mock(spec=Sink)]
+        for sink in sinks:
+            sink.write = AsyncMock(return_value=True)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=sinks
+        )
+
+        success = await stop_and_search_repository.store_stop_and_search(
+            "2023-01", "force-one", datetime(2023, 1, 1), datetime(2023, 1, 5)
+        )
+
+        assert success is True
+        assert mock_police_client.get_stop_and_searches_and_quarantine.call_count == 2
+        for sink in sinks:
+            sink.write.assert_awaited_once_with(
+                "force-one",
+                "2023-01",
+                stop_and_searches_with_location + stop_and_searches_without_location,
+                [],
+            )
+
+    @pytest.mark.asyncio
+    async def test_returns_false_if_a_sink_fails(
+        self,
+        mock_engine: Engine,
+        mock_police_client: PoliceClient,
+    ):
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            ([get_mock_stop_and_search(datetime(2023, 1, 2))], []),
+            ([], []),
+        ]
+        sinks = [Mock(spec=Sink), Mock(spec=Sink)]
+        sinks[0].write = AsyncMock(return_value=True)
+        sinks[1].write = AsyncMock(return_value=False)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=sinks
+        )
+
+        success = await stop_and_search_repository.store_stop_and_search(
+            "2023-01", "force-one", datetime(2023, 1, 1), datetime(2023, 1, 5)
+        )
+
+        assert success is False
+        sinks[0].write.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_writes_the_rejected_stop_and_searches_to_the_quarantine(
+        self,
+        mock_engine: Engine,
+        mock_police_client: PoliceClient,
+    ):
+        stop_and_search = get_mock_stop_and_search(datetime(2023, 1, 2))
+        with_location_quarantine = [get_quarantined({"datetime": "2023-01-32"})]
+        without_location_quarantine = [get_quarantined({"type": None})]
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            ([stop_and_search], with_location_quarantine),
+            ([], without_location_quarantine),
+        ]
+        sink = Mock(spec=Sink)
+        sink.write = AsyncMock(return_value=True)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=[sink]
+        )
+
+        success = await stop_and_search_repository.store_stop_and_search(
+            "2023-01", "force-one", datetime(2023, 1, 1), datetime(2023, 1, 5)
+        )
+
+        assert success is True
+        sink.write.assert_awaited_once_with(
+            "force-one",
+            "2023-01",
+            [stop_and_search],
+            with_location_quarantine + without_location_quarantine,
+        )
+
+    @pytest.mark.asyncio
+    async def test_replaces_the_quarantine_of_the_month_in_the_same_transaction(
+        self,
+        mock_session: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+        mock_police_client: PoliceClient,
+    ):
+        stop_and_search = get_mock_stop_and_search(datetime(2023, 1, 2))
+        quarantine = [get_quarantined({"datetime": "2023-01-32"})]
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            ([stop_and_search], quarantine),
+            ([], []),
+        ]
+
+        success = await stop_and_search_repository.store_stop_and_search(
+            "2023-01", "force-one", datetime(2023, 1, 1), datetime(2023, 1, 5)
+        )
+
+        assert success is True
+        [delete_call] = mock_session.exec.call_args_list
+        statement = delete_call.args[0].compile(dialect=postgresql.dialect())
+        assert str(statement).startswith('DELETE FROM bronze."StopAndSearchQuarantine"')
+        assert list(statement.params.values()) == ["force-one", "2023-01"]
+        mock_session.add_all.assert_called_once_with([stop_and_search, *quarantine])
+        mock_session.commit.assert_called_once()
+
+
+class TestReprocessQuarantine:
+    @pytest.mark.asyncio
+    async def test_writes_the_stop_and_searches_that_are_now_valid(
+        self,
+        mock_session: Mock,
+        mock_engine: Engine,
+        mock_police_client: PoliceClient,
+        mock_aggregate_repository: AggregateRepository,
+    ):
+        valid = get_quarantined(
+            {
+                "type": "Person search",
+                "involved_person": True,
+                "datetime": "2023-01-02T10:50:00+00:00",
+                "outcome_object": {"id": "bu-arrest", "name": "Arrest"},
+            }
+        )
+        invalid = get_quarantined({"type": None})
+        mock_session.exec.return_value.scalars.return_value.all.return_value = [
+            valid,
+            invalid,
+        ]
+        sink = Mock(spec=Sink)
+        sink.write = AsyncMock(return_value=True)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=[sink]
+        )
+        stop_and_search_repository.aggregate_repository = mock_aggregate_repository
+
+        success = await stop_and_search_repository.reprocess_quarantine()
+
+        assert success is True
+        [(force_id, year_month, stop_and_searches, quarantine)] = [
+            write_call.args for write_call in sink.write.await_args_list
+        ]
+        assert (force_id, year_month) == ("force-one", "2023-01")
+        assert stop_and_searches == [
+            StopAndSearch.model_validate({**valid.payload, "force_id": "force-one"})
+        ]
+        assert [record.payload for record in quarantine] == [{"type": None}]
+        assert {"field": "type", "type": "string_type"}.items() <= (
+            quarantine[0].errors[0].items()
+        )
+        assert quarantine[0].quarantined_at == invalid.quarantined_at
+        mock_aggregate_repository.refresh_aggregates.assert_awaited_once_with(
+            [("2023-01", "force-one")]
+        )
+        mock_police_client.get_stop_and_searches_and_quarantine.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_if_cannot_get_the_quarantine(
+        self,
+        mock_session: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+        caplog: LogCaptureFixture,
+    ):
+        mock_session.exec.side_effect = SQLAlchemyError("database is down")
+
+        success = await stop_and_search_repository.reprocess_quarantine(["force-one"])
+
+        assert success is False
+        record = caplog.records[-1]
+        assert record.levelname == "WARNING"
+        assert (
+            record.message
+            == "Cannot get the quarantined StopAndSearches from the database."
+        )
+
+
+class TestBloomFilter:
+    @pytest.mark.asyncio
+    async def test_skips_the_stop_and_searches_already_ingested(
+        self, mock_engine: Engine, mock_police_client: PoliceClient, tmp_path: Path
+    ):
+        ingested = get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))
+        new = get_stop_and_search(datetime(2023, 1, 3, tzinfo=UTC))
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            ([ingested, new], []),
+            ([], []),
+        ]
+        bloom_filter = BloomFilter(tmp_path / "bloom_filter", 100)
+        bloom_filter.add(get_model_content_hash(ingested))
+        sink = Mock(spec=Sink)
+        sink.write = AsyncMock(return_value=True)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=[sink], bloom_filter=bloom_filter
+        )
+
+        success = await stop_and_search_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 5, tzinfo=UTC),
+        )
+
+        assert success is True
+        sink.write.assert_awaited_once_with("force-one", "2023-01", [new], [])
+        assert get_model_content_hash(new) in bloom_filter
+        assert bloom_filter.row_count == 2
+        bloom_filter.close()
+
+    @pytest.mark.asyncio
+    async def test_keeps_identical_stop_and_searches_in_the_same_month(
+        self, mock_engine: Engine, mock_police_client: PoliceClient, tmp_path: Path
+    ):
+        stop_and_searches = [
+            get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC)) for _ in range(2)
+        ]
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            (stop_and_searches, []),
+            ([], []),
+        ]
+        bloom_filter = BloomFilter(tmp_path / "bloom_filter", 100)
+        sink = Mock(spec=Sink)
+        sink.write = AsyncMock(return_value=True)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=[sink], bloom_filter=bloom_filter
+        )
+
+        await stop_and_search_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 5, tzinfo=UTC),
+        )
+
+        sink.write.assert_awaited_once_with(
+            "force-one", "2023-01", stop_and_searches, []
+        )
+        bloom_filter.close()
+
+    @pytest.mark.asyncio
+    async def test_does_not_add_the_stop_and_searches_when_a_sink_fails(
+        self, mock_engine: Engine, mock_police_client: PoliceClient, tmp_path: Path
+    ):
+        stop_and_search = get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            ([stop_and_search], []),
+            ([], []),
+        ]
+        bloom_filter = BloomFilter(tmp_path / "bloom_filter", 100)
+        sink = Mock(spec=Sink)
+        sink.write = AsyncMock(return_value=False)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=[sink], bloom_filter=bloom_filter
+        )
+
+        success = await stop_and_search_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 5, tzinfo=UTC),
+        )
+
+        assert success is False
+        assert get_model_content_hash(stop_and_search) not in bloom_filter
+        bloom_filter.close()
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_the_bloom_filter_from_the_database(
+        self,
+        mock_connection: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+        tmp_path: Path,
+    ):
+        path = tmp_path / "bloom_filter"
+        BloomFilter(path, 100).close()
+        rows = [
+            tuple(getattr(stop_and_search, key) for key in CONTENT_COLUMNS.values())
+            for stop_and_search in [
+                get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC)),
+                get_stop_and_search(datetime(2023, 1, 3, tzinfo=UTC)),
+            ]
+        ]
+        mock_connection.execute.return_value.partitions.return_value = iter([rows])
+
+        success = await stop_and_search_repository.rebuild_bloom_filter(path, 1000)
+
+        assert success is True
+        bloom_filter = stop_and_search_repository.bloom_filter
+        assert bloom_filter is not None
+        assert all(get_content_hash(row) in bloom_filter for row in rows)
+        assert (bloom_filter.row_count, bloom_filter.capacity) == (2, 1000)
+        assert [file.name for file in tmp_path.iterdir()] == ["bloom_filter"]
+        bloom_filter.close()
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_and_keeps_the_bloom_filter_when_cannot_rebuild(
+        self,
+        mock_connection: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+        tmp_path: Path,
+        caplog: LogCaptureFixture,
+    ):
+        path = tmp_path / "bloom_filter"
+        BloomFilter(path, 100).close()
+        mock_connection.execute.side_effect = SQLAlchemyError("Database says no!")
+
+        success = await stop_and_search_repository.rebuild_bloom_filter(path, 1000)
+
+        assert success is False
+        assert [file.name for file in tmp_path.iterdir()] == ["bloom_filter"]
+        bloom_filter = BloomFilter(path, 1000)
+        assert bloom_filter.capacity == 100
+        bloom_filter.close()
+        record = caplog.records[-1]
+        assert (
+            record.message
+            == f"Cannot rebuild the Bloom filter '{path}' from the database."
+        )
+        assert record.levelname == "WARNING"
+
+
+class TestReplaceMonths:
+    @pytest.fixture
+    def mock_connection(self, mock_session: Mock) -> Mock:
+        mock_connection = mock_session.connection.return_value
+        mock_connection.execute.return_value.scalar_one.side_effect = [
+            "0/1000",
+            8192,
+        ]
+        mock_session.exec.return_value.rowcount = 2
+        return mock_connection
+
+    @pytest.mark.asyncio
+    async def test_replaces_the_month_between_the_datetimes_in_every_sink(
+        self, mock_engine: Engine, mock_police_client: PoliceClient
+    ):
+        stop_and_search = get_stop_and_search(datetime(2023, 1, 3, tzinfo=UTC))
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            ([stop_and_search], []),
+            ([], []),
+        ]
+        sink = Mock(spec=Sink)
+        sink.replace = AsyncMock(return_value=True)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine, mock_police_client, sinks=[sink], replace_months=True
+        )
+
+        success = await stop_and_search_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 2, tzinfo=UTC),
+            datetime(2023, 3, 1, tzinfo=UTC),
+        )
+
+        assert success is True
+        sink.replace.assert_awaited_once_with(
+            "force-one",
+            "2023-01",
+            (datetime(2023, 1, 2, tzinfo=UTC), datetime(2023, 3, 1, tzinfo=UTC)),
+            [stop_and_search],
+            [],
+        )
+        sink.write.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_writes_the_stop_and_searches_already_in_the_bloom_filter(
+        self, mock_engine: Engine, mock_police_client: PoliceClient, tmp_path: Path
+    ):
+        ingested = get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))
+        new = get_stop_and_search(datetime(2023, 1, 3, tzinfo=UTC))
+        mock_police_client.get_stop_and_searches_and_quarantine.side_effect = [
+            ([ingested, new], []),
+            ([], []),
+        ]
+        bloom_filter = BloomFilter(tmp_path / "bloom_filter", 100)
+        bloom_filter.add(get_model_content_hash(ingested))
+        sink = Mock(spec=Sink)
+        sink.replace = AsyncMock(return_value=True)
+        stop_and_search_repository = StopAndSearchRepository(
+            mock_engine,
+            mock_police_client,
+            sinks=[sink],
+            bloom_filter=bloom_filter,
+            replace_months=True,
+        )
+
+        await stop_and_search_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 31, tzinfo=UTC),
+        )
+
+        assert sink.replace.call_args.args[3] == [ingested, new]
+        assert get_model_content_hash(new) in bloom_filter
+        assert bloom_filter.row_count == 2
+        bloom_filter.close()
+
+    @pytest.mark.asyncio
+    async def test_postgres_sink_deletes_the_month_in_the_window_and_inserts_in_one_transaction(
+        self,
+        mock_session: Mock,
+        mock_connection: Mock,
+        mock_engine: Engine,
+        caplog: LogCaptureFixture,
+    ):
+        caplog.set_level("INFO")
+        stop_and_search = get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))
+        quarantine = [get_quarantined({"datetime": "2023-01-32"})]
+        window = (datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 1, 31, tzinfo=UTC))
+
+        success = await PostgresSink(mock_engine).replace(
+            "force-one", "2023-01", window, [stop_and_search], quarantine
+        )
+
+        assert success is True
+        delete_stop_and_searches, delete_quarantine = [
+            call.args[0].compile(dialect=postgresql.dialect())
+            for call in mock_session.exec.call_args_list
+        ]
+        assert str(delete_stop_and_searches).startswith(
+            'DELETE FROM bronze."StopAndSearch" WHERE bronze."StopAndSearch"."ForceId"'
+        )
+        assert list(delete_stop_and_searches.params.values()) == [
+            "force-one",
+            "2023-01",
+            *window,
+        ]
+        assert str(delete_quarantine).startswith(
+            'DELETE FROM bronze."StopAndSearchQuarantine"'
+        )
+        mock_session.add_all.assert_called_once_with([stop_and_search, *quarantine])
+        mock_session.commit.assert_called_once()
+        assert caplog.records[-1].message.startswith(
+            "Replaced 2 rows of StopAndSearch with 1 for 'force-one' on date "
+            "'2023-01', writing 8192 bytes of WAL with the rows locked for "
+        )
+
+    @pytest.mark.asyncio
+    async def test_postgres_sink_copies_large_months_from_a_staging_table(
+        self, mock_session: Mock, mock_connection: Mock, mock_engine: Engine
+    ):
+        stop_and_searches = [
+            get_stop_and_search(datetime(2023, 1, day, tzinfo=UTC)) for day in (2, 3)
+        ]
+        quarantine = [get_quarantined({"datetime": "2023-01-32"})]
+
+        success = await PostgresSink(mock_engine, staging_rows=2).replace(
+            "force-one",
+            "2023-01",
+            (datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 2, 1, tzinfo=UTC)),
+            stop_and_searches,
+            quarantine,
+        )
+
+        assert success is True
+        statements = [
+            str(call.args[0].compile(dialect=postgresql.dialect()))
+            for call in mock_connection.execute.call_args_list
+        ]
+        assert statements[1].startswith('INSERT INTO "StopAndSearchStaging"')
+        assert statements[2].startswith('INSERT INTO bronze."StopAndSearch"')
+        assert 'FROM "StopAndSearchStaging"' in statements[2]
+        staged = mock_connection.execute.call_args_list[1].args[0]
+        staged_columns = dict(
+            zip(
+                staged.select.selected_columns.keys(),
+                staged.compile(dialect=postgresql.dialect()).params.values(),
+            )
+        )
+        assert staged_columns["Datetime"] == [
+            stop_and_search.datetime for stop_and_search in stop_and_searches
+        ]
+        mock_session.add_all.assert_called_once_with(quarantine)
+        mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_postgres_sink_logs_warning_when_cannot_replace(
+        self,
+        mock_session: Mock,
+        mock_connection: Mock,
+        mock_engine: Engine,
+        caplog: LogCaptureFixture,
+    ):
+        mock_session.commit.side_effect = SQLAlchemyError()
+
+        success = await PostgresSink(mock_engine).replace(
+            "force-one",
+            "2023-01",
+            (datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 2, 1, tzinfo=UTC)),
+            [get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))],
+        )
+
+        assert success is False
+        record = caplog.records[-1]
+        assert record.levelname == "WARNING"
+        assert record.message == (
+            "Cannot replace StopAndSearches in the database for 'force-one' on "
+            "date '2023-01'."
+        )
+
+    @pytest.mark.asyncio
+    async def test_postgres_sink_replaces_silver_in_the_bronze_transaction(
+        self, mock_session: Mock, mock_connection: Mock, mock_engine: Engine
+    ):
+        stop_and_search = get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))
+        window = (datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 1, 31, tzinfo=UTC))
+        silver_sink = Mock(spec=SilverSink)
+        silver_sink.encode.return_value = {"ForceId": ["force-one"]}
+
+        success = await PostgresSink(mock_engine, silver_sink=silver_sink).replace(
+            "force-one", "2023-01", window, [stop_and_search]
+        )
+
+        assert success is True
+        silver_sink.delete_month.assert_called_once_with(
+            mock_connection, "force-one", "2023-01", window
+        )
+        silver_sink.insert_columns.assert_called_once_with(
+            mock_connection, {"ForceId": ["force-one"]}
+        )
+        mock_session.commit.assert_called_once()
+
+
+class TestSilverInTheBronzeTransaction:
+    @pytest.mark.asyncio
+    async def test_postgres_sink_writes_silver_before_the_commit(
+        self, mock_session: Mock, mock_engine: Engine
+    ):
+        stop_and_search = get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))
+        silver_sink = Mock(spec=SilverSink)
+        silver_sink.encode.return_value = {"ForceId": ["force-one"]}
+        mock_session.commit.side_effect = lambda: (
+            silver_sink.insert_columns.assert_called_once()
+        )
+
+        success = await PostgresSink(mock_engine, silver_sink=silver_sink).write(
+            "force-one", "2023-01", [stop_and_search]
+        )
+
+        assert success is True
+        silver_sink.encode.assert_called_once_with(
+            "force-one", "2023-01", [stop_and_search]
+        )
+        silver_sink.insert_columns.assert_called_once_with(
+            mock_session.connection.return_value, {"ForceId": ["force-one"]}
+        )
+        mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_postgres_sink_stores_neither_table_when_silver_fails(
+        self, mock_session: Mock, mock_engine: Engine, caplog: LogCaptureFixture
+    ):
+        silver_sink = Mock(spec=SilverSink)
+        silver_sink.insert_columns.side_effect = SQLAlchemyError()
+
+        success = await PostgresSink(mock_engine, silver_sink=silver_sink).write(
+            "force-one",
+            "2023-01",
+            [get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))],
+        )
+
+        assert success is False
+        mock_session.commit.assert_not_called()
+        assert caplog.records[-1].message == (
+            "Cannot store StopAndSearches in the database for 'force-one' on date "
+            "'2023-01'."
+        )
+
+    @pytest.mark.asyncio
+    async def test_postgres_sink_does_not_encode_an_empty_month(
+        self, mock_session: Mock, mock_engine: Engine
+    ):
+        silver_sink = Mock(spec=SilverSink)
+
+        success = await PostgresSink(mock_engine, silver_sink=silver_sink).write(
+            "force-one", "2023-01", []
+        )
+
+        assert success is True
+        silver_sink.encode.assert_not_called()
+        silver_sink.insert_columns.assert_not_called()
+
+
+class TestSkipUnchangedMonths:
+    @pytest.fixture
+    def mock_checksum_repository(self) -> StopAndSearchChecksumRepository:
+        mock_checksum_repository = Mock(spec=StopAndSearchChecksumRepository)
+        mock_checksum_repository.get_checksum = AsyncMock(return_value=None)
+        mock_checksum_repository.store_checksum = AsyncMock(return_value=True)
+        return mock_checksum_repository
+
+    @pytest.fixture
+    def sink(self) -> Sink:
+        sink = Mock(spec=Sink)
+        sink.write = AsyncMock(return_value=True)
+        return sink
+
+    @pytest.fixture
+    def checksum_repository(
+        self,
+        mock_engine: Engine,
+        mock_police_client: PoliceClient,
+        mock_aggregate_repository: AggregateRepository,
+        mock_checksum_repository: StopAndSearchChecksumRepository,
+        sink: Sink,
+    ) -> StopAndSearchRepository:
+        mock_police_client.get_stop_and_searches_response.side_effect = [
+            Mock(content=b"[with location]"),
+            Mock(content=b"[without location]"),
+        ]
+        repository = StopAndSearchRepository(
+            mock_engine,
+            mock_police_client,
+            sinks=[sink],
+            checksum_repository=mock_checksum_repository,
+        )
+        repository.aggregate_repository = mock_aggregate_repository
+        return repository
+
+    @pytest.mark.asyncio
+    async def test_skips_parsing_and_writing_an_unchanged_month(
+        self,
+        checksum_repository: StopAndSearchRepository,
+        mock_police_client: PoliceClient,
+        mock_checksum_repository: StopAndSearchChecksumRepository,
+        sink: Sink,
+    ):
+        mock_checksum_repository.get_checksum.return_value = get_checksum(
+            [b"[with location]", b"[without location]"]
+        )
+
+        success = await checksum_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 31, tzinfo=UTC),
+        )
+
+        assert success is True
+        mock_checksum_repository.get_checksum.assert_awaited_once_with(
+            "force-one", "2023-01"
+        )
+        mock_police_client.parse_stop_and_searches.assert_not_called()
+        sink.write.assert_not_awaited()
+        mock_checksum_repository.store_checksum.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_writes_a_changed_month_and_keeps_its_checksum(
+        self,
+        checksum_repository: StopAndSearchRepository,
+        mock_police_client: PoliceClient,
+        mock_checksum_repository: StopAndSearchChecksumRepository,
+        sink: Sink,
+    ):
+        stop_and_search = get_stop_and_search(datetime(2023, 1, 2, tzinfo=UTC))
+        mock_police_client.parse_stop_and_searches.side_effect = [
+            ([stop_and_search], []),
+            ([], []),
+        ]
+        mock_checksum_repository.get_checksum.return_value = b"previous"
+
+        success = await checksum_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 31, tzinfo=UTC),
+        )
+
+        assert success is True
+        sink.write.assert_awaited_once_with(
+            "force-one", "2023-01", [stop_and_search], []
+        )
+        assert checksum_repository.written_checksums == {
+            ("2023-01", "force-one"): get_checksum(
+                [b"[with location]", b"[without location]"]
+            )
+        }
+        mock_checksum_repository.store_checksum.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("refreshed", [True, False])
+    async def test_stores_the_checksums_once_the_aggregates_are_refreshed(
+        self,
+        checksum_repository: StopAndSearchRepository,
+        mock_police_client: PoliceClient,
+        mock_checksum_repository: StopAndSearchChecksumRepository,
+        mock_aggregate_repository: AggregateRepository,
+        refreshed: bool,
+    ):
+        checksum_repository.available_date_repository = Mock()
+        checksum_repository.available_date_repository.get_available_date_force_ids = (
+            AsyncMock(return_value=[("2023-01", "force-one")])
+        )
+        mock_police_client.parse_stop_and_searches.return_value = ([], [])
+        mock_aggregate_repository.refresh_aggregates.return_value = refreshed
+
+        success = await checksum_repository.store_stop_and_searches(
+            datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 1, 31, tzinfo=UTC)
+        )
+
+        assert success is refreshed
+        if refreshed:
+            mock_checksum_repository.store_checksum.assert_awaited_once_with(
+                "force-one",
+                "2023-01",
+                get_checksum([b"[with location]", b"[without location]"]),
+            )
+        else:
+            mock_checksum_repository.store_checksum.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_does_not_store_the_checksum_when_a_sink_fails(
+        self,
+        checksum_repository: StopAndSearchRepository,
+        mock_police_client: PoliceClient,
+        mock_checksum_repository: StopAndSearchChecksumRepository,
+        sink: Sink,
+    ):
+        mock_police_client.parse_stop_and_searches.return_value = ([], [])
+        sink.write.return_value = False
+
+        success = await checksum_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 31, tzinfo=UTC),
+        )
+
+        assert success is False
+        assert checksum_repository.written_checksums == {}
+
+    @pytest.mark.asyncio
+    async def test_does_not_store_the_checksum_of_a_month_cut_short(
+        self,
+        checksum_repository: StopAndSearchRepository,
+        mock_police_client: PoliceClient,
+        mock_checksum_repository: StopAndSearchChecksumRepository,
+    ):
+        mock_police_client.parse_stop_and_searches.side_effect = [
+            ([get_stop_and_search(datetime(2023, 1, 20, tzinfo=UTC))], []),
+            ([], []),
+        ]
+
+        success = await checksum_repository.store_stop_and_search(
+            "2023-01",
+            "force-one",
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 1, 15, tzinfo=UTC),
+        )
+
+        assert success is True
+        assert checksum_repository.written_checksums == {}
+
+    @pytest.mark.asyncio
+    async def test_does_not_refresh_the_aggregates_of_unchanged_months(
+        self,
+        checksum_repository: StopAndSearchRepository,
+        mock_police_client: PoliceClient,
+        mock_checksum_repository: StopAndSearchChecksumRepository,
+        mock_aggregate_repository: AggregateRepository,
+    ):
+        checksum_repository.available_date_repository = Mock()
+        checksum_repository.available_date_repository.get_available_date_force_ids = (
+            AsyncMock(return_value=[("2023-01", "force-one"), ("2023-01", "force-two")])
+        )
+        mock_police_client.get_stop_and_searches_response.side_effect = [
+            Mock(content=b"[]") for _ in range(4)
+        ]
+        mock_police_client.parse_stop_and_searches.return_value = ([], [])
+        mock_checksum_repository.get_checksum.side_effect = lambda force_id, _: (
+            get_checksum([b"[]", b"[]"]) if force_id == "force-one" else None
+        )
+
+        success = await checksum_repository.store_stop_and_searches(
+            datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 1, 31, tzinfo=UTC)
+        )
+
+        assert success is True
+        mock_aggregate_repository.refresh_aggregates.assert_awaited_once_with(
+            [("2023-01", "force-two")]
+        )
+
+
+class TestGetChecksum:
+    def test_tells_apart_bytes_moved_between_the_responses(self):
+        assert get_checksum([b"[1]", b"[]"]) != get_checksum([b"[", b"1][]"])
+
+    def test_is_32_bytes(self):
+        assert len(get_checksum([b"[]", b"[]"])) == 32
+
+
+class TestOrderByExpectedRows:
+    def test_orders_slices_by_their_row_counts(self):
+        row_counts = {
+            ("2023-01", "force-one"): 10,
+            ("2023-02", "force-one"): 300,
+            ("2023-01", "force-two"): 200,
+        }
+
+        assert order_by_expected_rows(
+            [
+                ("2023-01", "force-one"),
+                ("2023-02", "force-one"),
+                ("2023-01", "force-two"),
+            ],
+            row_counts,
+        ) == [
+            ("2023-02", "force-one"),
+            ("2023-01", "force-two"),
+            ("2023-01", "force-one"),
+        ]
+
+    def test_expects_the_average_month_of_the_force_for_new_months(self):
+        row_counts = {
+            ("2022-11", "force-one"): 100,
+            ("2022-12", "force-one"): 300,
+            ("2022-12", "force-two"): 150,
+        }
+
+        assert order_by_expected_rows(
+            [("2023-01", "force-two"), ("2023-01", "force-one")], row_counts
+        ) == [("2023-01", "force-one"), ("2023-01", "force-two")]
+
+    def test_puts_forces_without_row_counts_first(self):
+        row_counts = {("2022-12", "force-one"): 1000}
+
+        assert order_by_expected_rows(
+            [("2023-01", "force-one"), ("2023-01", "new-force")], row_counts
+        ) == [("2023-01", "new-force"), ("2023-01", "force-one")]
+
+    def test_interleaves_slices_of_the_same_size_across_forces(self):
+        slices = [
+            ("2023-01", "force-one"),
+            ("2023-02", "force-one"),
+            ("2023-03", "force-one"),
+            ("2023-01", "force-two"),
+            ("2023-02", "force-two"),
+        ]
+
+        assert order_by_expected_rows(slices, {}) == [
+            ("2023-01", "force-one"),
+            ("2023-01", "force-two"),
+            ("2023-02", "force-one"),
+            ("2023-02", "force-two"),
+            ("2023-03", "force-one"),
+        ]
+
+
+class TestGetContentHash:
+    def test_hashes_datetimes_in_utc(self):
+        utc = get_content_hash(["force-one", datetime(2023, 1, 1, 12, tzinfo=UTC)])
+        london = get_content_hash(
+            [
+                "force-one",
+                datetime(2023, 1, 1, 13, tzinfo=timezone(timedelta(hours=1))),
+            ]
+        )
+
+        assert utc == london
+
+    def test_tells_none_apart_from_an_empty_string(self):
+        assert get_content_hash([None]) != get_content_hash([""])
+
+
+StopAndSearchRow = namedtuple("StopAndSearchRow", ["Id", "Datetime"])
+
+
+@pytest.fixture
+def mock_connection(mock_engine: Mock) -> Mock:
+    mock_connection = Mock()
+    mock_engine.connect.return_value = MagicMock()
+    mock_engine.connect.return_value.__enter__.return_value = mock_connection
+    mock_engine.connect.return_value.execution_options.return_value = MagicMock()
+    mock_engine.connect.return_value.execution_options.return_value.__enter__.return_value = mock_connection
+    return mock_connection
+
+
+class TestStreamStopAndSearches:
+    @pytest.mark.asyncio
+    async def test_yields_batches_until_a_batch_is_not_full(
+        self,
+        mock_connection: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+    ):
+        first_batch = [
+            StopAndSearchRow(1, datetime(2023, 1, 1, tzinfo=UTC)),
+            StopAndSearchRow(2, datetime(2023, 1, 1, tzinfo=UTC)),
+        ]
+        second_batch = [StopAndSearchRow(3, datetime(2023, 1, 2, tzinfo=UTC))]
+        mock_connection.execute.return_value.all.side_effect = [
+            first_batch,
+            second_batch,
+        ]
+
+        batches = [
+            batch
+            async for batch in stop_and_search_repository.stream_stop_and_searches(
+                datetime(2023, 1, 1, tzinfo=UTC),
+                datetime(2023, 2, 1, tzinfo=UTC),
+                batch_size=2,
+            )
+        ]
+
+        assert batches == [first_batch, second_batch]
+        first_query, second_query = [
+            call.args[0].compile(dialect=postgresql.dialect())
+            for call in mock_connection.execute.call_args_list
+        ]
+        assert '"Id") >' not in str(first_query)
+        assert '"Id") >' in str(second_query)
+        assert list(second_query.params.values()) == [
+            datetime(2023, 1, 1, tzinfo=UTC),
+            datetime(2023, 2, 1, tzinfo=UTC),
+            datetime(2023, 1, 1, tzinfo=UTC),
+            2,
+            2,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stops_when_a_full_batch_is_followed_by_an_empty_one(
+        self,
+        mock_connection: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+    ):
+        batch = [StopAndSearchRow(1, datetime(2023, 1, 1, tzinfo=UTC))]
+        mock_connection.execute.return_value.all.side_effect = [batch, []]
+
+        batches = [
+            batch
+            async for batch in stop_and_search_repository.stream_stop_and_searches(
+                datetime(2023, 1, 1, tzinfo=UTC),
+                datetime(2023, 2, 1, tzinfo=UTC),
+                batch_size=1,
+            )
+        ]
+
+        assert batches == [batch]
+        assert mock_connection.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_selects_the_id_datetime_and_given_columns(
+        self,
+        mock_connection: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+    ):
+        mock_connection.execute.return_value.all.return_value = []
+
+        async with aclosing(
+            stop_and_search_repository.stream_stop_and_searches(
+                datetime(2023, 1, 1, tzinfo=UTC),
+                datetime(2023, 2, 1, tzinfo=UTC),
+                columns=["ForceId", "Datetime"],
+            )
+        ) as stream:
+            batches = [batch async for batch in stream]
+
+        assert batches == []
+        query = mock_connection.execute.call_args.args[0]
+        assert [column.name for column in query.selected_columns] == [
+            "Id",
+            "Datetime",
+            "ForceId",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_filters_by_force_ids(
+        self,
+        mock_connection: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+    ):
+        mock_connection.execute.return_value.all.return_value = []
+
+        batches = [
+            batch
+            async for batch in stop_and_search_repository.stream_stop_and_searches(
+                datetime(2023, 1, 1, tzinfo=UTC),
+                datetime(2023, 2, 1, tzinfo=UTC),
+                force_ids=["force-one"],
+            )
+        ]
+
+        assert batches == []
+        mock_connection.execute.assert_called_once()
+        query = mock_connection.execute.call_args.args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}
+        )
+        assert query.params["ForceId_1_1"] == "force-one"
+
+    @pytest.mark.asyncio
+    async def test_logs_error_and_raises_when_cannot_read(
+        self,
+        mock_connection: Mock,
+        stop_and_search_repository: StopAndSearchRepository,
+        caplog: LogCaptureFixture,
+    ):
+        mock_connection.execute.side_effect = SQLAlchemyError("Database says no!")
+
+        with pytest.raises(SQLAlchemyError):
+            async for _ in stop_and_search_repository.stream_stop_and_searches(
+                datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 2, 1, tzinfo=UTC)
+            ):
+                pass
+
+        record = caplog.records[-1]
+        assert record.levelname == "ERROR"
+        assert (
+            record.message == "Could not read StopAndSearches from the database "
+            "between '2023-01-01 00:00:00+00:00' and '2023-02-01 00:00:00+00:00'."
+        )
+
 
 def get_mock_stop_and_search(datetime: datetime) -> StopAndSearch:
     mock = Mock(spec=StopAndSearch)
     mock.datetime = datetime
     return mock
+
+
+def get_stop_and_search(datetime: datetime) -> StopAndSearch:
+    return StopAndSearch(
+        force_id="force-one",
+        type="Person search",
+        involved_person=True,
+        datetime=datetime,
+        outcome_id="bu-arrest",
+        outcome_name="Arrest",
+    )
+
+
+def get_quarantined(payload: dict) -> StopAndSearchQuarantine:
+    return StopAndSearchQuarantine(
+        force_id="force-one",
+        year_month="2023-01",
+        with_location=False,
+        payload=payload,
+        errors=[],
+        quarantined_at=datetime(2023, 2, 1, tzinfo=UTC),
+    )
+
+
+def get_model_content_hash(stop_and_search: StopAndSearch) -> bytes:
+    return get_content_hash(
+        getattr(stop_and_search, key) for key in CONTENT_COLUMNS.values()
+    )
@@ -0,0 +1,46 @@
+import pstats
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from police_api_ingester.profiling import Profiler
+
+
+def allocate() -> list[bytes]:
+    return [bytes(1000) for _ in range(100)]
+
+
+class TestProfiler:
+    def test_writes_a_pstats_file_named_by_the_command(self, tmp_path: Path):
+        profiler = Profiler(tmp_path / "profiles")
+
+        with profiler.profile("ingest-forces"):
+            allocate()
+
+        [path] = (tmp_path / "profiles").iterdir()
+        assert path.name.startswith("ingest-forces-")
+        assert path.suffix == ".pstats"
+        functions = [function for _, _, function in pstats.Stats(str(path)).stats]
+        assert "allocate" in functions
+
+    def test_writes_the_top_allocations_when_memory_is_profiled(self, tmp_path: Path):
+        profiler = Profiler(tmp_path, memory=True)
+
+        with profiler.profile("ingest-forces"):
+            allocated = allocate()
+
+        [allocations] = tmp_path.glob("ingest-forces-*.allocations.txt")
+        lines = allocations.read_text().splitlines()
+        assert lines[0].startswith("Peak traced memory: ")
+        assert "test_profiling.py" in lines[2]
+        assert tracemalloc.is_tracing() is False
+        assert len(allocated) == 100
+
+    def test_writes_the_profile_when_the_command_fails(self, tmp_path: Path):
+        profiler = Profiler(tmp_path)
+
+        with pytest.raises(ValueError), profiler.profile("ingest-forces"):
+            raise ValueError("Police API says no!")
+
+        assert len(list(tmp_path.glob("ingest-forces-*.pstats"))) == 1
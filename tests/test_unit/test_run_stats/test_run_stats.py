@@ -0,0 +1,51 @@
+from asyncio import gather, run
+
+from police_api_ingester.run_stats import (
+    RUN_STATS,
+    RunStats,
+    record_request,
+    record_rows_written,
+    record_validation,
+    stage,
+)
+
+
+class TestRunStats:
+    def test_records_into_the_run_stats_of_the_context(self):
+        run_stats = RunStats("ingest forces", {})
+        token = RUN_STATS.set(run_stats)
+
+        record_request("200", 0.5)
+        record_request("429", 0.25)
+        record_validation(9, 1, 0.125)
+        record_rows_written("Force", 9)
+        RUN_STATS.reset(token)
+
+        assert run_stats.requests_by_status == {"200": 1, "429": 1}
+        assert run_stats.rows_parsed == 9
+        assert run_stats.rows_rejected == 1
+        assert run_stats.rows_written == {"Force": 9}
+        assert run_stats.stage_seconds == {"request": 0.75, "validation": 0.125}
+
+    def test_records_from_every_task_of_the_run(self):
+        run_stats = RunStats("ingest stop-and-searches", {})
+        token = RUN_STATS.set(run_stats)
+
+        async def write(rows: int) -> None:
+            with stage("write"):
+                record_rows_written("StopAndSearch", rows)
+
+        async def write_all() -> None:
+            await gather(write(10), write(20))
+
+        run(write_all())
+        RUN_STATS.reset(token)
+
+        assert run_stats.rows_written == {"StopAndSearch": 30}
+        assert run_stats.stage_seconds["write"] > 0
+
+    def test_records_nothing_outside_of_a_run(self):
+        with stage("write"):
+            record_rows_written("Force", 1)
+
+        assert RUN_STATS.get() is None
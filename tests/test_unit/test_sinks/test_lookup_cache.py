@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from sqlalchemy import Engine
+
+from police_api_ingester.models import Outcome, SearchType
+from police_api_ingester.sinks import LookupCache
+
+
+@pytest.fixture
+def mock_connection() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def mock_engine(mock_connection: Mock) -> Engine:
+    mock_engine = Mock(spec=Engine)
+    mock_engine.begin.return_value = MagicMock()
+    mock_engine.begin.return_value.__enter__.return_value = mock_connection
+    return mock_engine
+
+
+class TestResolve:
+    def test_inserts_the_values_that_do_not_exist(
+        self, mock_engine: Engine, mock_connection: Mock
+    ):
+        mock_connection.execute.side_effect = [
+            [(1, "Person search")],
+            [(2, "Vehicle search")],
+        ]
+        lookup_cache = LookupCache(mock_engine)
+
+        ids = lookup_cache.resolve(
+            SearchType, {("Person search",), ("Vehicle search",)}
+        )
+
+        assert ids == {("Person search",): 1, ("Vehicle search",): 2}
+        select, insert = [
+            call.args[0] for call in mock_connection.execute.call_args_list
+        ]
+        assert select.__visit_name__ == "select"
+        assert insert.__visit_name__ == "insert"
+        assert insert.select is not None
+
+    def test_does_not_query_the_values_already_resolved(
+        self, mock_engine: Engine, mock_connection: Mock
+    ):
+        mock_connection.execute.side_effect = [[(1, "Person search")]]
+        lookup_cache = LookupCache(mock_engine)
+        lookup_cache.resolve(SearchType, {("Person search",)})
+
+        ids = lookup_cache.resolve(SearchType, {("Person search",)})
+
+        assert ids == {("Person search",): 1}
+        mock_engine.begin.assert_called_once()
+
+    def test_selects_the_values_another_ingester_inserted_first(
+        self, mock_engine: Engine, mock_connection: Mock
+    ):
+        mock_connection.execute.side_effect = [
+            [],
+            [],
+            [(3, "bu-arrest", "Arrest")],
+        ]
+        lookup_cache = LookupCache(mock_engine)
+
+        ids = lookup_cache.resolve(Outcome, {("bu-arrest", "Arrest")})
+
+        assert ids == {("bu-arrest", "Arrest"): 3}
+        assert mock_connection.execute.call_count == 3
+
+    def test_keeps_the_ids_of_each_lookup_apart(
+        self, mock_engine: Engine, mock_connection: Mock
+    ):
+        mock_connection.execute.side_effect = [
+            [(1, "Person search")],
+            [(1, "bu-arrest", "Arrest")],
+        ]
+        lookup_cache = LookupCache(mock_engine)
+
+        search_types = lookup_cache.resolve(SearchType, {("Person search",)})
+        outcomes = lookup_cache.resolve(Outcome, {("bu-arrest", "Arrest")})
+
+        assert search_types == {("Person search",): 1}
+        assert outcomes == {("bu-arrest", "Arrest"): 1}
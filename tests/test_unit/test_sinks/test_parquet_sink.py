@@ -0,0 +1,141 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from pytest import LogCaptureFixture
+from sqlalchemy import BOOLEAN, DECIMAL, INTEGER, SMALLINT, DateTime, String
+
+from police_api_ingester.fake_api.generator import SyntheticDataGenerator
+from police_api_ingester.models import StopAndSearch
+from police_api_ingester.sinks import ParquetSink
+from police_api_ingester.sinks.parquet_sink import get_arrow_type
+
+pa = pytest.importorskip("pyarrow")
+dataset = pytest.importorskip("pyarrow.dataset")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def stop_and_searches() -> list[StopAndSearch]:
+    generator = SyntheticDataGenerator(
+        force_count=1, month_count=1, records_per_month=20
+    )
+    force_id, month = generator.force_ids[0], generator.months[0]
+    return [
+        StopAndSearch.model_validate({**stop_and_search, "force_id": force_id})
+        for with_location in (True, False)
+        for stop_and_search in generator.stop_and_searches(
+            force_id, month, with_location=with_location
+        )
+    ]
+
+
+class TestWrite:
+    @pytest.mark.asyncio
+    async def test_writes_a_file_partitioned_by_force_and_month(
+        self, tmp_path: Path, stop_and_searches: list[StopAndSearch]
+    ):
+        sink = ParquetSink(tmp_path)
+
+        success = await sink.write("force-one", "2023-01", stop_and_searches)
+
+        assert success is True
+        path = tmp_path / "ForceId=force-one" / "YearMonth=2023-01" / "part-0.parquet"
+        assert [file.name for file in path.parent.iterdir()] == ["part-0.parquet"]
+        assert pq.ParquetFile(path).metadata.row_group(0).column(0).compression == (
+            "ZSTD"
+        )
+        table = dataset.dataset(tmp_path, partitioning="hive").to_table()
+        assert table.num_rows == len(stop_and_searches)
+        assert table.column("ForceId").unique().to_pylist() == ["force-one"]
+        assert table.column("YearMonth").unique().to_pylist() == ["2023-01"]
+        assert "Id" not in table.column_names
+        assert "Hour" not in table.column_names
+
+    @pytest.mark.asyncio
+    async def test_writes_the_values_of_each_stop_and_search(
+        self, tmp_path: Path, stop_and_searches: list[StopAndSearch]
+    ):
+        sink = ParquetSink(tmp_path)
+
+        await sink.write("force-one", "2023-01", stop_and_searches)
+
+        rows = pq.read_table(
+            tmp_path / "ForceId=force-one" / "YearMonth=2023-01" / "part-0.parquet"
+        ).to_pylist()
+        for row, stop_and_search in zip(rows, stop_and_searches, strict=True):
+            assert row["Datetime"] == stop_and_search.datetime
+            assert row["OutcomeId"] == stop_and_search.outcome_id
+            assert row["InvolvedPerson"] == stop_and_search.involved_person
+            assert row["LatitudeMicrodegrees"] == stop_and_search.latitude_microdegrees
+            assert row["Geohash"] == stop_and_search.geohash
+
+    @pytest.mark.asyncio
+    async def test_replaces_the_file_when_a_month_is_written_again(
+        self, tmp_path: Path, stop_and_searches: list[StopAndSearch]
+    ):
+        sink = ParquetSink(tmp_path)
+
+        await sink.write("force-one", "2023-01", stop_and_searches)
+        await sink.write("force-one", "2023-01", stop_and_searches[:5])
+
+        table = dataset.dataset(tmp_path, partitioning="hive").to_table()
+        assert table.num_rows == 5
+
+    @pytest.mark.asyncio
+    async def test_replacing_a_month_writes_its_file(
+        self, tmp_path: Path, stop_and_searches: list[StopAndSearch]
+    ):
+        sink = ParquetSink(tmp_path)
+        await sink.write("force-one", "2023-01", stop_and_searches)
+
+        success = await sink.replace(
+            "force-one",
+            "2023-01",
+            (datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 2, 1, tzinfo=UTC)),
+            stop_and_searches[:5],
+        )
+
+        assert success is True
+        table = dataset.dataset(tmp_path, partitioning="hive").to_table()
+        assert table.num_rows == 5
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_when_the_file_cannot_be_written(
+        self,
+        tmp_path: Path,
+        stop_and_searches: list[StopAndSearch],
+        caplog: LogCaptureFixture,
+    ):
+        (tmp_path / "ForceId=force-one").write_text("not a directory")
+        sink = ParquetSink(tmp_path)
+
+        success = await sink.write("force-one", "2023-01", stop_and_searches)
+
+        assert success is False
+        record = caplog.records[-1]
+        assert record.levelname == "WARNING"
+        assert record.message == (
+            f"Cannot write StopAndSearches to '{tmp_path}/ForceId=force-one/"
+            "YearMonth=2023-01/part-0.parquet' for 'force-one' on date '2023-01'."
+        )
+
+
+class TestGetArrowType:
+    @pytest.mark.parametrize(
+        ["column_type", "expected"],
+        [
+            (BOOLEAN(), pa.bool_()),
+            (SMALLINT(), pa.int16()),
+            (INTEGER(), pa.int32()),
+            (DateTime(timezone=True), pa.timestamp("us", tz="UTC")),
+            (String(7), pa.string()),
+        ],
+        ids=["boolean", "smallint", "integer", "datetime", "string"],
+    )
+    def test_maps_the_column_types_of_the_model(self, column_type, expected):
+        assert get_arrow_type(column_type) == expected
+
+    def test_raises_for_a_column_type_it_does_not_expect(self):
+        with pytest.raises(TypeError, match="Cannot write a column of type"):
+            get_arrow_type(DECIMAL(9, 6))
@@ -0,0 +1,230 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from pytest import LogCaptureFixture
+from sqlalchemy import Engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import SQLModel
+
+from police_api_ingester.models import (
+    AgeRange,
+    Ethnicity,
+    Gender,
+    Legislation,
+    ObjectOfSearch,
+    Outcome,
+    SearchType,
+    StopAndSearch,
+)
+from police_api_ingester.sinks import LookupCache, SilverSink
+
+
+@pytest.fixture
+def stop_and_searches() -> list[StopAndSearch]:
+    return [
+        StopAndSearch(
+            type="Person search",
+            involved_person=True,
+            datetime=datetime(2023, 1, 1, 12, tzinfo=UTC),
+            gender="Male",
+            age_range="18-24",
+            self_defined_ethnicity="White - Any other White background",
+            officer_defined_ethnicity="White",
+            legislation="Misuse of Drugs Act 1971 (section 23)",
+            object_of_search="Controlled drugs",
+            outcome_id="bu-no-further-action",
+            outcome_name="A no further action disposal",
+        ),
+        StopAndSearch(
+            type="Vehicle search",
+            involved_person=False,
+            datetime=datetime(2023, 1, 2, 12, tzinfo=UTC),
+            officer_defined_ethnicity="White",
+            outcome_id="bu-arrest",
+            outcome_name="Arrest",
+        ),
+    ]
+
+
+@pytest.fixture
+def mock_lookup_cache() -> LookupCache:
+    mock_lookup_cache = Mock(spec=LookupCache)
+    # Numbers the values of each lookup in sorted order
+    mock_lookup_cache.resolve.side_effect = lambda _, values: {
+        value: index for index, value in enumerate(sorted(values), start=1)
+    }
+    return mock_lookup_cache
+
+
+@pytest.fixture
+def mock_engine() -> Engine:
+    mock_engine = Mock(spec=Engine)
+    mock_engine.begin.return_value = MagicMock()
+    return mock_engine
+
+
+class TestWrite:
+    @pytest.mark.asyncio
+    async def test_resolves_the_distinct_values_of_each_lookup(
+        self,
+        mock_engine: Engine,
+        mock_lookup_cache: LookupCache,
+        stop_and_searches: list[StopAndSearch],
+    ):
+        sink = SilverSink(mock_engine, mock_lookup_cache)
+
+        success = await sink.write("force-one", "2023-01", stop_and_searches)
+
+        assert success is True
+        resolved: dict[type[SQLModel], set[tuple]] = {
+            call.args[0]: call.args[1]
+            for call in mock_lookup_cache.resolve.call_args_list
+        }
+        assert resolved == {
+            SearchType: {("Person search",), ("Vehicle search",)},
+            Gender: {("Male",)},
+            AgeRange: {("18-24",)},
+            Ethnicity: {("White - Any other White background",), ("White",)},
+            Legislation: {("Misuse of Drugs Act 1971 (section 23)",)},
+            ObjectOfSearch: {("Controlled drugs",)},
+            Outcome: {
+                ("bu-no-further-action", "A no further action disposal"),
+                ("bu-arrest", "Arrest"),
+            },
+        }
+
+    @pytest.mark.asyncio
+    async def test_inserts_the_lookup_ids_in_place_of_the_strings(
+        self,
+        mock_engine: Engine,
+        mock_lookup_cache: LookupCache,
+        stop_and_searches: list[StopAndSearch],
+    ):
+        sink = SilverSink(mock_engine, mock_lookup_cache)
+
+        await sink.write("force-one", "2023-01", stop_and_searches)
+
+        connection = mock_engine.begin.return_value.__enter__.return_value
+        statement = connection.execute.call_args.args[0]
+        compiled = statement.compile(dialect=postgresql.dialect())
+        columns = dict(
+            zip(
+                statement.select.selected_columns.keys(),
+                compiled.params.values(),
+            )
+        )
+        assert columns["ForceId"] == ["force-one", "force-one"]
+        assert columns["SourceYearMonth"] == ["2023-01", "2023-01"]
+        assert columns["TypeId"] == [1, 2]
+        assert columns["GenderId"] == [1, None]
+        assert columns["SelfDefinedEthnicityId"] == [2, None]
+        assert columns["OfficerDefinedEthnicityId"] == [1, 1]
+        assert columns["OutcomeId"] == [2, 1]
+        assert columns["InvolvedPerson"] == [True, False]
+        assert columns["Datetime"] == [
+            datetime(2023, 1, 1, 12, tzinfo=UTC),
+            datetime(2023, 1, 2, 12, tzinfo=UTC),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_does_not_write_when_there_are_no_stop_and_searches(
+        self, mock_engine: Engine, mock_lookup_cache: LookupCache
+    ):
+        sink = SilverSink(mock_engine, mock_lookup_cache)
+
+        success = await sink.write("force-one", "2023-01", [])
+
+        assert success is True
+        mock_lookup_cache.resolve.assert_not_called()
+        mock_engine.begin.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_when_cannot_store_stop_and_searches(
+        self,
+        mock_engine: Engine,
+        mock_lookup_cache: LookupCache,
+        stop_and_searches: list[StopAndSearch],
+        caplog: LogCaptureFixture,
+    ):
+        mock_lookup_cache.resolve.side_effect = SQLAlchemyError()
+        sink = SilverSink(mock_engine, mock_lookup_cache)
+
+        success = await sink.write("force-one", "2023-01", stop_and_searches)
+
+        assert success is False
+        mock_engine.begin.assert_not_called()
+        record = caplog.records[-1]
+        assert (
+            record.message
+            == "Cannot store silver StopAndSearches in the database for 'force-one' on date '2023-01'."
+        )
+        assert record.levelname == "WARNING"
+
+
+class TestReplace:
+    @pytest.mark.asyncio
+    async def test_deletes_the_month_in_the_window_and_inserts_in_one_transaction(
+        self,
+        mock_engine: Engine,
+        mock_lookup_cache: LookupCache,
+        stop_and_searches: list[StopAndSearch],
+        caplog: LogCaptureFixture,
+    ):
+        caplog.set_level("INFO")
+        mock_engine.connect.return_value = MagicMock()
+        connection = mock_engine.connect.return_value.__enter__.return_value
+        connection.execute.return_value.scalar_one.side_effect = ["0/1000", 4096]
+        connection.execute.return_value.rowcount = 3
+        sink = SilverSink(mock_engine, mock_lookup_cache)
+        window = (datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 1, 31, tzinfo=UTC))
+
+        success = await sink.replace("force-one", "2023-01", window, stop_and_searches)
+
+        assert success is True
+        statements = [
+            str(call.args[0].compile(dialect=postgresql.dialect()))
+            for call in connection.execute.call_args_list
+        ]
+        assert statements[1].startswith('DELETE FROM silver."StopAndSearch"')
+        assert statements[2].startswith('INSERT INTO silver."StopAndSearch"')
+        delete = connection.execute.call_args_list[1].args[0]
+        assert list(delete.compile(dialect=postgresql.dialect()).params.values()) == [
+            "force-one",
+            "2023-01",
+            *window,
+        ]
+        connection.commit.assert_called_once()
+        assert caplog.records[-1].message.startswith(
+            "Replaced 3 rows of SilverStopAndSearch with 2 for 'force-one' on date "
+            "'2023-01', writing 4096 bytes of WAL"
+        )
+
+    @pytest.mark.asyncio
+    async def test_logs_warning_when_cannot_replace(
+        self,
+        mock_engine: Engine,
+        mock_lookup_cache: LookupCache,
+        stop_and_searches: list[StopAndSearch],
+        caplog: LogCaptureFixture,
+    ):
+        mock_engine.connect.return_value = MagicMock()
+        connection = mock_engine.connect.return_value.__enter__.return_value
+        connection.execute.side_effect = SQLAlchemyError()
+        sink = SilverSink(mock_engine, mock_lookup_cache)
+
+        success = await sink.replace(
+            "force-one",
+            "2023-01",
+            (datetime(2023, 1, 1, tzinfo=UTC), datetime(2023, 2, 1, tzinfo=UTC)),
+            stop_and_searches,
+        )
+
+        assert success is False
+        record = caplog.records[-1]
+        assert record.levelname == "WARNING"
+        assert record.message == (
+            "Cannot replace silver StopAndSearches in the database for 'force-one' "
+            "on date '2023-01'."
+        )
@@ -0,0 +1,87 @@
+import json
+from asyncio import gather, run
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from police_api_ingester.tracing import JsonLinesExporter, set_exporter, span
+
+
+@pytest.fixture
+def exporter(tmp_path: Path) -> Generator[JsonLinesExporter, None, None]:
+    exporter = JsonLinesExporter(tmp_path / "traces" / "trace.jsonl")
+    set_exporter(exporter)
+    yield exporter
+    set_exporter(None)
+    exporter.close()
+
+
+def read_spans(exporter: JsonLinesExporter) -> dict[str, dict[str, Any]]:
+    return {
+        record["name"]: record
+        for record in map(json.loads, exporter.path.read_text().splitlines())
+    }
+
+
+class TestSpan:
+    def test_returns_the_same_no_op_when_tracing_is_disabled(self):
+        assert span("store_stop_and_search") is span("validate", rows=10)
+
+    def test_nests_spans_in_the_span_they_are_opened_in(
+        self, exporter: JsonLinesExporter
+    ):
+        with span("store_stop_and_search", force_id="force-1"), span("validate"):
+            pass
+        with span("store_stop_and_search-2"):
+            pass
+
+        spans = read_spans(exporter)
+        parent = spans["store_stop_and_search"]
+        child = spans["validate"]
+        assert parent["parent_id"] is None
+        assert parent["attributes"] == {"force_id": "force-1"}
+        assert child["parent_id"] == parent["span_id"]
+        assert child["trace_id"] == parent["trace_id"]
+        assert spans["store_stop_and_search-2"]["trace_id"] != parent["trace_id"]
+        assert parent["duration_ms"] >= child["duration_ms"]
+
+    def test_nests_the_spans_of_tasks_in_the_span_they_are_created_in(
+        self, exporter: JsonLinesExporter
+    ):
+        async def get_stop_and_searches(name: str) -> None:
+            with span(name):
+                pass
+
+        async def store_stop_and_search() -> None:
+            with span("store_stop_and_search"):
+                await gather(
+                    get_stop_and_searches("with_location"),
+                    get_stop_and_searches("without_location"),
+                )
+
+        run(store_stop_and_search())
+
+        spans = read_spans(exporter)
+        parent_id = spans["store_stop_and_search"]["span_id"]
+        assert spans["with_location"]["parent_id"] == parent_id
+        assert spans["without_location"]["parent_id"] == parent_id
+
+    def test_records_the_error_raised_in_the_span(self, exporter: JsonLinesExporter):
+        with pytest.raises(ValueError), span("validate"):
+            raise ValueError("Invalid StopAndSearch")
+
+        assert read_spans(exporter)["validate"]["error"] == "ValueError"
+
+
+class TestJsonLinesExporter:
+    def test_appends_to_an_existing_file(self, tmp_path: Path):
+        path = tmp_path / "trace.jsonl"
+        path.write_text('{"name": "previous"}\n')
+        exporter = JsonLinesExporter(path)
+
+        exporter.export({"name": "next"})
+        exporter.close()
+
+        assert path.read_text() == '{"name": "previous"}\n{"name": "next"}\n'
@@ -0,0 +1,88 @@
+from pydantic import ValidationError
+
+from police_api_ingester.models import Force
+from police_api_ingester.validation_failures import ValidationFailures, get_errors
+
+
+def get_error(record: dict) -> ValidationError:
+    try:
+        Force.model_validate(record)
+    except ValidationError as error:
+        return error
+    raise AssertionError(f"{record} is a valid Force")
+
+
+def add(failures: ValidationFailures, index: int, record: dict) -> None:
+    failures.add(index, record, get_error(record))
+
+
+class TestValidationFailures:
+    def test_counts_the_failures_by_field_and_error_type(self):
+        failures = ValidationFailures("Force")
+
+        add(failures, 0, {"name": "Force One"})
+        add(failures, 1, {"id": 1, "name": "Force Two"})
+        add(failures, 2, {"name": "Force Three"})
+
+        assert failures.rejected == 3
+        assert failures.counts == {("id", "missing"): 2, ("id", "string_type"): 1}
+
+    def test_keeps_the_rejected_records_with_their_errors(self):
+        failures = ValidationFailures("Force")
+
+        add(failures, 0, {"id": 1, "name": "Force One"})
+
+        assert failures.records == [
+            (
+                {"id": 1, "name": "Force One"},
+                [
+                    {
+                        "field": "id",
+                        "type": "string_type",
+                        "message": "Input should be a valid string",
+                    }
+                ],
+            )
+        ]
+
+    def test_keeps_the_first_examples_of_each_failure(self):
+        failures = ValidationFailures("Force", max_examples=2)
+
+        for index in range(5):
+            add(failures, index, {"id": index})
+
+        assert failures.examples == {
+            ("id", "string_type"): [
+                "index '0' Input should be a valid string, got 0",
+                "index '1' Input should be a valid string, got 1",
+            ]
+        }
+
+    def test_truncates_long_inputs_in_the_examples(self):
+        failures = ValidationFailures("Force")
+
+        add(failures, 0, {"id": ["force"] * 100})
+
+        [example] = failures.examples[("id", "string_type")]
+        assert example.endswith("...")
+        assert len(example) < 200
+
+    def test_summarises_the_most_frequent_failures_first(self):
+        failures = ValidationFailures("Force", max_examples=1)
+        add(failures, 0, {"id": 1})
+        add(failures, 3, {})
+        add(failures, 7, {})
+
+        assert failures.get_summary(10, "Police API") == (
+            "Failed to map 3 of 10 'Force' returned from Police API.\n"
+            "'id' missing in 2 records: index '3' Field required, got {}\n"
+            "'id' string_type in 1 records: index '0' Input should be a valid string, "
+            "got 1"
+        )
+
+
+class TestGetErrors:
+    def test_returns_the_field_type_and_message_of_each_error(self):
+        assert get_errors(get_error({})) == [
+            {"field": "id", "type": "missing", "message": "Field required"}
+        ]